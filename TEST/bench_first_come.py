@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""先着フローのステップ別ベンチマーク
+
+ローカルのモックサーバー（src.mock_site）に対して FirstComeFlow.execute() を N 回実行し、
+_step1〜_step5 の所要時間と、safe_wait・スクリーンショット・セレクタ探索・evaluate・
+読み取り・操作に費やした時間/回数を集計して JSON で出力する。コミット間で出力を diff して比較する。
+
+使用例:
+    python .\\TEST\\bench_first_come.py --runs 5 --output bench_first_come.json
+    python .\\TEST\\bench_first_come.py --runs 5 --replay-har hars/first_come.har   # 実サイトの記録を再生して計測
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# プロジェクトルートをパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from playwright.async_api import ElementHandle, Frame, Locator, Page
+
+from src.browser import BrowserHelper
+from src.config import Settings
+from src.flows.first_come import FirstComeFlow
+from src.mock_site import MockEplusServer
+
+STEPS = [
+    "_step1_navigate_to_event",
+    "_step2_wait_for_next_button",
+    "_step3_select_tickets",
+    "_step4_login",
+    "_step5_select_payment_delivery",
+]
+
+# 計測対象のPlaywright API（カテゴリ名 → メソッド名）。呼び出し回数がそのままIPC往復数になる
+PROBE_METHODS = {
+    "selector": ["query_selector", "query_selector_all", "wait_for_selector"],
+    "evaluate": ["evaluate", "evaluate_handle", "wait_for_function"],
+    "read": ["get_attribute", "inner_text", "is_visible"],
+    "action": ["click", "fill", "select_option"],
+}
+
+
+class Recorder:
+    """1回の実行分の計測値（カテゴリ別の所要時間と呼び出し回数）"""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    def add(self, category: str, seconds: float):
+        self.durations[category] += seconds
+        self.counts[category] += 1
+
+    @contextmanager
+    def measure(self, category: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, time.perf_counter() - started)
+
+
+class BenchHelper(BrowserHelper):
+    """safe_wait とスクリーンショットの時間を記録する BrowserHelper"""
+
+    recorder: Recorder
+
+    async def safe_wait(self, ms: int):
+        with self.recorder.measure("safe_wait"):
+            await super().safe_wait(ms)
+
+    async def save_screenshot(self, page: Page, filename: str, error: bool = False):
+        with self.recorder.measure("screenshot"):
+            return await super().save_screenshot(page, filename, error=error)
+
+
+@contextmanager
+def instrument_playwright(get_recorder):
+    """Page/Frame/ElementHandle/Locator のAPI呼び出しをクラス単位で計測する"""
+    originals = []
+    for category, names in PROBE_METHODS.items():
+        for cls in (Page, Frame, ElementHandle, Locator):
+            for name in names:
+                original = getattr(cls, name, None)
+                if original is None:
+                    continue
+
+                def make_wrapper(fn, cat):
+                    async def wrapper(*args, **kwargs):
+                        with get_recorder().measure(cat):
+                            return await fn(*args, **kwargs)
+                    return wrapper
+
+                originals.append((cls, name, original))
+                setattr(cls, name, make_wrapper(original, category))
+    try:
+        yield
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """線形補間によるパーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * pct / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p95_ms": round(percentile(values, 95) * 1000, 1),
+        "mean_ms": round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return ""
+
+
+async def run_once(helper: BenchHelper, config: Settings) -> dict:
+    """フローを1回実行してステップ別・カテゴリ別の計測値を返す"""
+    recorder = Recorder()
+    helper.recorder = recorder
+    await helper.context.clear_cookies()
+    page = await helper.create_page()
+
+    flow = FirstComeFlow(page, helper, config)
+    step_times = {}
+    for name in STEPS:
+        original = getattr(flow, name)
+
+        def make_timed(fn, step_name):
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    step_times[step_name] = time.perf_counter() - started
+            return timed
+
+        setattr(flow, name, make_timed(original, name))
+
+    started = time.perf_counter()
+    success = await flow.execute()
+    total = time.perf_counter() - started
+    await page.close()
+
+    return {
+        "success": success,
+        "total": total,
+        "steps": step_times,
+        "durations": dict(recorder.durations),
+        "counts": dict(recorder.counts),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="FirstComeFlow ステップ別ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    parser.add_argument("--release-delay-ms", type=int, default=0, help="モックの「受付中」出現遅延")
+    parser.add_argument("--latency-ms", type=int, default=0, help="モックの応答遅延")
+    parser.add_argument("--headed", action="store_true", help="ブラウザを表示して実行")
+    parser.add_argument(
+        "--screenshot-mode",
+        choices=["off", "errors-only", "viewport", "full"],
+        default="full",
+        help="スクリーンショットの撮影モード",
+    )
+    parser.add_argument(
+        "--replay-har",
+        type=str,
+        default="",
+        help="RECORD_HAR で記録した HAR を再生して計測（モックサーバーは使わず、EVENT_ID・ログイン情報は .env の値）",
+    )
+    args = parser.parse_args()
+
+    mock = nullcontext() if args.replay_har else MockEplusServer(
+        release_delay_ms=args.release_delay_ms, latency_ms=args.latency_ms
+    )
+    with mock as server, tempfile.TemporaryDirectory() as workdir:
+        if args.replay_har:
+            site = {"replay_har": args.replay_har}
+        else:
+            site = {
+                "base_url": server.base_url,
+                "event_id": "bench-event",
+                "eplus_email": "bench@example.com",
+                "eplus_password": "bench-password",
+            }
+        config = Settings(
+            **site,
+            headless=not args.headed,
+            video_enabled=False,
+            keep_open_minutes=0,
+            screenshot_dir=os.path.join(workdir, "screenshots"),
+            screenshot_mode=args.screenshot_mode,
+            selector_cache_path=os.path.join(workdir, "selectors.json"),
+            resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+            trace_dir=os.path.join(workdir, "traces"),
+            session_state_enabled=False,
+            checkpoint_enabled=False,
+            debug=False,
+        )
+
+        runs = []
+        cache_stats = {}
+        async with BenchHelper(config) as helper:
+            helper.recorder = Recorder()
+            with instrument_playwright(lambda: helper.recorder):
+                for i in range(args.runs):
+                    result = await run_once(helper, config)
+                    runs.append(result)
+                    print(
+                        f"run {i + 1}/{args.runs}: {'OK' if result['success'] else 'NG'} "
+                        f"{result['total'] * 1000:.0f}ms",
+                        file=sys.stderr,
+                    )
+            if helper.selector_cache:
+                cache_stats = helper.selector_cache.stats()
+
+    categories = sorted({c for r in runs for c in r["durations"]})
+    report = {
+        "revision": git_revision(),
+        "runs": args.runs,
+        "success": sum(1 for r in runs if r["success"]),
+        "total": summarize([r["total"] for r in runs]),
+        "steps": {
+            name: summarize([r["steps"][name] for r in runs if name in r["steps"]])
+            for name in STEPS
+        },
+        "categories": {
+            cat: {
+                **summarize([r["durations"].get(cat, 0.0) for r in runs]),
+                "calls_p50": percentile([r["counts"].get(cat, 0) for r in runs], 50),
+            }
+            for cat in categories
+        },
+        "selector_cache": cache_stats,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
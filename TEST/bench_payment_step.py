@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""支払・受取選択ステップ（_step5）のIPC往復数ベンチマーク
+
+モックサーバーの支払・受取ページで FirstComeFlow._step5_select_payment_delivery() を
+N 回実行し、Playwright API の呼び出し回数（≒ブラウザとの往復数）と所要時間を JSON で出力する。
+ラジオは受取・支払の群ごとに1回の evaluate でまとめて取得し（支払は受取のクリック後に取り直す）、evaluate / read の回数が減っていることを確認する。
+
+使用例:
+    python .\\TEST\\bench_payment_step.py --runs 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# プロジェクトルートと TEST/ をパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_first_come import BenchHelper, Recorder, git_revision, instrument_playwright, percentile, summarize
+
+from src.config import Settings
+from src.flows.first_come import FirstComeFlow
+from src.mock_site import MockEplusServer
+from src.mock_site.server import SESSION_COOKIE
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="_step5 IPC往復数ベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    args = parser.parse_args()
+
+    with MockEplusServer() as server, tempfile.TemporaryDirectory() as workdir:
+        config = Settings(
+            base_url=server.base_url,
+            event_id="bench-event",
+            headless=True,
+            video_enabled=False,
+            keep_open_minutes=0,
+            screenshot_dir=os.path.join(workdir, "screenshots"),
+            selector_cache_path=os.path.join(workdir, "selectors.json"),
+            resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+            session_state_enabled=False,
+            checkpoint_enabled=False,
+            debug=False,
+        )
+        payment_url = config.eplus_url(f"/sf/payment/{config.event_id}")
+
+        runs = []
+        async with BenchHelper(config) as helper:
+            await helper.context.add_cookies([{"name": SESSION_COOKIE, "value": "1", "url": server.base_url}])
+            page = await helper.create_page()
+            flow = FirstComeFlow(page, helper, config)
+            with instrument_playwright(lambda: helper.recorder):
+                for _ in range(args.runs):
+                    await page.goto(payment_url, wait_until="domcontentloaded")
+                    helper.recorder = Recorder()
+                    started = time.perf_counter()
+                    success = await flow._step5_select_payment_delivery()
+                    runs.append({
+                        "success": success,
+                        "total": time.perf_counter() - started,
+                        "counts": dict(helper.recorder.counts),
+                    })
+
+    categories = sorted({c for r in runs for c in r["counts"]})
+    report = {
+        "revision": git_revision(),
+        "runs": args.runs,
+        "success": sum(1 for r in runs if r["success"]),
+        "total": summarize([r["total"] for r in runs]),
+        "round_trips_p50": percentile(
+            [sum(v for k, v in r["counts"].items() if k not in ("screenshot", "safe_wait")) for r in runs], 50
+        ),
+        "calls_p50": {cat: percentile([r["counts"].get(cat, 0) for r in runs], 50) for cat in categories},
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""個人情報マスクの負荷ベンチマーク
+
+モックサーバーの /bench/churn（毎フレーム大量の要素を追加・削除し、iframe 内でも同じ処理をするページ）を
+MASK_PERSONAL_INFO のオン/オフで N 回ずつ開き、フレーム間隔（p50/p95）・ページ側の書き換え時間と、
+マスク側の集計（走査ノード数・伏字数・走査時間）、伏字漏れの有無を JSON で出力する。
+
+使用例:
+    python .\\TEST\\bench_privacy_mask.py --runs 5 --frames 300 --nodes 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from urllib.parse import quote
+
+# プロジェクトルートと TEST/ をパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_first_come import git_revision, percentile
+
+from src.browser import BrowserHelper
+from src.config import Settings
+from src.mock_site import MockEplusServer
+
+NEEDLE = "bench@example.com"
+
+
+async def run_once(helper: BrowserHelper, url: str) -> dict:
+    page = await helper.create_page()
+    try:
+        await helper.goto(page, url, wait_until="domcontentloaded")
+        # 本体と iframe の両方が終わるまで待つ
+        for frame in page.frames:
+            await frame.wait_for_function("() => window.__churn && window.__churn.done", timeout=120000)
+        churn = await page.evaluate("() => window.__churn")
+        leaked = False
+        for frame in page.frames:
+            # 伏字は次の描画前に行われるため、1フレーム待ってから確認する
+            await frame.evaluate("() => new Promise((r) => requestAnimationFrame(() => r()))")
+            leaked = leaked or await frame.evaluate("(s) => document.body.innerText.includes(s)", NEEDLE)
+        return {
+            "intervals": churn["intervals"],
+            "work_ms": churn["work_ms"],
+            "leaked": leaked,
+            "mask": await helper.mask_stats(page),
+        }
+    finally:
+        await page.close()
+
+
+async def bench_mode(server: MockEplusServer, workdir: str, masked: bool, args) -> dict:
+    config = Settings(
+        base_url=server.base_url,
+        eplus_email=NEEDLE,
+        headless=not args.headed,
+        video_enabled=False,
+        mask_personal_info=masked,
+        screenshot_dir=os.path.join(workdir, "screenshots"),
+        screenshot_mode="off",
+        selector_cache_path=os.path.join(workdir, "selectors.json"),
+        resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+        session_state_enabled=False,
+        checkpoint_enabled=False,
+        trace_log_enabled=False,
+        debug=False,
+    )
+    url = f"{server.base_url}/bench/churn?frames={args.frames}&nodes={args.nodes}&needle={quote(NEEDLE)}"
+    label = "on" if masked else "off"
+
+    results = []
+    async with BrowserHelper(config) as helper:
+        for i in range(args.runs):
+            result = await run_once(helper, url)
+            results.append(result)
+            print(
+                f"[mask {label}] run {i + 1}/{args.runs}: "
+                f"frame p95 {percentile(result['intervals'], 95):.1f}ms "
+                f"mask {result['mask'].get('time_ms', 0):.1f}ms",
+                file=sys.stderr,
+            )
+
+    intervals = [ms for r in results for ms in r["intervals"]]
+    mask_totals = [r["mask"] for r in results]
+
+    def mean(key: str) -> float:
+        return round(sum(m.get(key, 0) for m in mask_totals) / len(mask_totals), 1) if mask_totals else 0.0
+
+    return {
+        "frame_interval_p50_ms": round(percentile(intervals, 50), 2),
+        "frame_interval_p95_ms": round(percentile(intervals, 95), 2),
+        "page_work_ms_mean": round(sum(r["work_ms"] for r in results) / len(results), 1),
+        "leaked_runs": sum(1 for r in results if r["leaked"]),
+        "mask_per_run": {key: mean(key) for key in ("batches", "mutations", "scanned", "masked", "time_ms")},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="個人情報マスクの負荷ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="モードごとの計測回数")
+    parser.add_argument("--frames", type=int, default=300, help="1回あたりのフレーム数")
+    parser.add_argument("--nodes", type=int, default=50, help="1フレームで追加する要素数")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    parser.add_argument("--headed", action="store_true", help="ブラウザを表示して実行")
+    args = parser.parse_args()
+
+    report = {"revision": git_revision(), "runs": args.runs, "frames": args.frames, "nodes": args.nodes}
+    with MockEplusServer() as server, tempfile.TemporaryDirectory() as workdir:
+        report["off"] = await bench_mode(server, workdir, False, args)
+        report["on"] = await bench_mode(server, workdir, True, args)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
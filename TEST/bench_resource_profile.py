@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""リクエスト遮断プロファイル別のベンチマーク
+
+静的ファイル（CSS/JS/フォント/画像）と別ホストの解析タグを読み込むモックサーバーに対し、
+RESOURCE_PROFILE ごとに FirstComeFlow.execute() を N 回実行して、全体・ステップ1（イベント詳細）・
+ステップ3（チケット選択）の所要時間と、サーバーが返したバイト数/リクエスト数、遮断数を JSON で出力する。
+モックの解析タグは localhost 名義で配信されるため、BLOCK_HOSTS=localhost として広告ホスト扱いにする。
+--asset-cache を付けると静的ファイルキャッシュを有効にし（2回目以降はディスクから返る）、その統計も出力する。
+
+使用例:
+    python .\\TEST\\bench_resource_profile.py --runs 5 --profiles off,lean,strict
+    python .\\TEST\\bench_resource_profile.py --runs 5 --profiles off --asset-cache
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# プロジェクトルートと TEST/ をパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_first_come import BenchHelper, Recorder, git_revision, percentile, run_once, summarize
+
+from src.config import Settings
+from src.mock_site import MockEplusServer
+from src.mock_site.server import THIRD_PARTY_HOST
+
+
+async def bench_profile(
+    server: MockEplusServer, workdir: str, profile: str, runs: int, headed: bool, asset_cache: bool
+) -> dict:
+    config = Settings(
+        base_url=server.base_url,
+        event_id="bench-event",
+        eplus_email="bench@example.com",
+        eplus_password="bench-password",
+        headless=not headed,
+        video_enabled=False,
+        keep_open_minutes=0,
+        screenshot_dir=os.path.join(workdir, "screenshots"),
+        screenshot_mode="off",
+        selector_cache_path=os.path.join(workdir, f"selectors_{profile}.json"),
+        resource_profile=profile,
+        block_hosts=THIRD_PARTY_HOST,
+        resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+        session_state_enabled=False,
+        checkpoint_enabled=False,
+        asset_cache_enabled=asset_cache,
+        asset_cache_dir=os.path.join(workdir, f"assets_{profile}"),
+        trace_log_enabled=False,
+        debug=False,
+    )
+
+    results = []
+    async with BenchHelper(config) as helper:
+        helper.recorder = Recorder()
+        for i in range(runs):
+            bytes_before, requests_before = server.bytes_sent, server.request_count
+            result = await run_once(helper, config)
+            result["bytes"] = server.bytes_sent - bytes_before
+            result["requests"] = server.request_count - requests_before
+            results.append(result)
+            print(
+                f"[{profile}] run {i + 1}/{runs}: {'OK' if result['success'] else 'NG'} "
+                f"{result['total'] * 1000:.0f}ms {result['bytes'] / 1024:.0f}KiB",
+                file=sys.stderr,
+            )
+        filter_summary = helper.resource_filter.summary()
+        cache_stats = helper.asset_cache.stats() if helper.asset_cache else None
+
+    return {
+        "success": sum(1 for r in results if r["success"]),
+        "total": summarize([r["total"] for r in results]),
+        "step1_navigate": summarize([r["steps"].get("_step1_navigate_to_event", 0.0) for r in results]),
+        "step3_select": summarize([r["steps"].get("_step3_select_tickets", 0.0) for r in results]),
+        "server_kib_p50": round(percentile([r["bytes"] for r in results], 50) / 1024, 1),
+        "server_requests_p50": percentile([r["requests"] for r in results], 50),
+        "filter": filter_summary,
+        "asset_cache": cache_stats,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="リクエスト遮断プロファイル別ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="プロファイルごとの計測回数")
+    parser.add_argument("--profiles", type=str, default="off,lean,strict", help="比較するプロファイル（カンマ区切り）")
+    parser.add_argument("--latency-ms", type=int, default=0, help="モックの応答遅延")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    parser.add_argument("--asset-cache", action="store_true", help="静的ファイルキャッシュを有効にする")
+    parser.add_argument("--headed", action="store_true", help="ブラウザを表示して実行")
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    report = {"revision": git_revision(), "runs": args.runs, "profiles": {}}
+    with MockEplusServer(latency_ms=args.latency_ms, assets=True) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        for profile in profiles:
+            report["profiles"][profile] = await bench_profile(
+                server, workdir, profile, args.runs, args.headed, args.asset_cache
+            )
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
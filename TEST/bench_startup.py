@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""ブラウザ起動（コールド/ウォーム）のベンチマーク
+
+BrowserHelper の start()・create_page()・最初の goto()・stop() の所要時間を、
+毎回Chromiumを起動する場合（cold）と常駐ブラウザ（src.browser_daemon）に接続する場合（warm）で比較する。
+常駐ブラウザは空きポートでサブプロセスとして起動し、計測後に終了する。
+
+使用例:
+    python .\\TEST\\bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# プロジェクトルートと TEST/ をパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_first_come import git_revision, summarize
+
+from src.browser import BrowserHelper, is_port_open
+from src.config import Settings
+from src.mock_site import MockEplusServer
+
+PHASES = ["start", "create_page", "first_goto", "stop"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_once(config: Settings, url: str) -> dict:
+    """起動から終了までを1回計測（秒）"""
+    times = {}
+    helper = BrowserHelper(config)
+
+    started = time.perf_counter()
+    await helper.start()
+    times["start"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    page = await helper.create_page()
+    times["create_page"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await helper.goto(page, url, wait_until="domcontentloaded")
+    times["first_goto"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await helper.stop()
+    times["stop"] = time.perf_counter() - started
+
+    times["total"] = sum(times.values())
+    times["warm"] = helper.warm
+    return times
+
+
+async def bench(config: Settings, url: str, runs: int, label: str) -> dict:
+    results = []
+    for i in range(runs):
+        result = await run_once(config, url)
+        results.append(result)
+        print(f"[{label}] run {i + 1}/{runs}: {result['total'] * 1000:.0f}ms", file=sys.stderr)
+    return {
+        "connected_warm": sum(1 for r in results if r["warm"]),
+        "total": summarize([r["total"] for r in results]),
+        **{phase: summarize([r[phase] for r in results]) for phase in PHASES},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="ブラウザ起動（コールド/ウォーム）ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    args = parser.parse_args()
+
+    port = free_port()
+    with MockEplusServer() as server, tempfile.TemporaryDirectory() as workdir:
+        state_path = os.path.join(workdir, "warm_browser.json")
+
+        def make_config(warm: bool) -> Settings:
+            return Settings(
+                base_url=server.base_url,
+                headless=True,
+                video_enabled=False,
+                mask_personal_info=False,
+                screenshot_dir=os.path.join(workdir, "screenshots"),
+                selector_cache_path=os.path.join(workdir, "selectors.json"),
+                resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+                session_state_enabled=False,
+                trace_log_enabled=False,
+                warm_browser_enabled=warm,
+                warm_browser_port=port,
+                warm_browser_state_path=state_path,
+                debug=False,
+            )
+
+        url = server.base_url + "/"
+        report = {"revision": git_revision(), "runs": args.runs}
+        report["cold"] = await bench(make_config(False), url, args.runs, "cold")
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "src.browser_daemon", "--port", str(port), "--headless", "--state-path", state_path],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 30
+            while not (is_port_open("127.0.0.1", port) and os.path.exists(state_path)):
+                if daemon.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("常駐ブラウザの起動に失敗しました")
+                await asyncio.sleep(0.1)
+            report["warm"] = await bench(make_config(True), url, args.runs, "warm")
+        finally:
+            daemon.terminate()
+            try:
+                daemon.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""選択肢の照合（src.textmatch）のマイクロベンチマーク
+
+大量の <option>（公演日時×席種）とラジオのラベルに対して、FirstComeFlow の
+_choose_option / _choose_receive / _choose_payment を繰り返し呼び、1回あたりの所要時間（p50/p95, µs）を
+従来の実装（毎回 NFKC 正規化し直す部分一致）と比べて JSON で出力する。
+「cold」は正規化のメモを空にした1回目、「warm」は同じ一覧を再度調べた場合（ページの再取得・リトライ時）。
+
+使用例:
+    python .\\TEST\\bench_textmatch.py --options 5000 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import unicodedata
+
+# プロジェクトルートと TEST/ をパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_first_come import git_revision, percentile
+
+from src.flows.first_come import FirstComeFlow
+from src.textmatch import _label_dates, compile_keyword, normalize
+
+SEATS = ["ＳＳ席", "Ｓ席", "Ａ席", "Ｂ席", "立見", "車椅子席", "ファミリー席", "プレミアムシート"]
+TIMES = ["13:00", "18:00"]
+WEEKDAYS = "月火水木金土日"
+
+
+def _legacy_normalize(text: str) -> str:
+    t = unicodedata.normalize('NFKC', (text or "")).replace("\xa0", " ").replace("　", " ").strip()
+    return t.lower()
+
+
+def legacy_choose_option(options: list[dict], keyword: str) -> int | None:
+    """変更前の keyword 判定（正規化し直して部分一致の先頭）"""
+    texts = [_legacy_normalize(opt.get("text")) for opt in options]
+    kw = _legacy_normalize(keyword)
+    for i, text in enumerate(texts):
+        if kw in text and options[i].get("value") is not None:
+            return i
+    return None
+
+
+def legacy_choose_receive(candidates: list[dict], delivery_method: str) -> int:
+    dm_norm = _legacy_normalize(delivery_method)
+    preferred = ['セブン-イレブン', 'ファミリーマート'] if 'セブン' in dm_norm else ['ファミリーマート', 'セブン-イレブン']
+    for pref in preferred:
+        pref_n = _legacy_normalize(pref)
+        for i, cand in enumerate(candidates):
+            if pref_n in _legacy_normalize(cand["label"]):
+                return i
+    return 0
+
+
+def make_options(count: int) -> list[dict]:
+    """「選択して下さい」＋ 全角混じりの公演日時・席種ラベル（count 件）"""
+    options = [{"text": "選択して下さい", "value": ""}]
+    i = 0
+    while len(options) <= count:
+        day = i // (len(SEATS) * len(TIMES))
+        month, mday = 1 + (day // 28) % 12, 1 + day % 28
+        seat = SEATS[i % len(SEATS)]
+        hour = TIMES[(i // len(SEATS)) % len(TIMES)]
+        text = f"　２０２６/{month:02d}/{mday:02d}({WEEKDAYS[day % 7]})\xa0{hour}開演 {seat}（一般）"
+        options.append({"text": text, "value": f"{i}"})
+        i += 1
+    return options
+
+
+def make_radios(count: int) -> list[dict]:
+    labels = ["ローソン", "ミニストップ", "デイリーヤマザキ", "セイコーマート"]
+    radios = [{"label": f"{labels[i % len(labels)]}（店舗{i}）", "value": str(10 + i)} for i in range(count - 1)]
+    radios.append({"label": "ファミリーマート", "value": "2"})
+    return radios
+
+
+def measure(fn, repeat: int, cold: callable = None) -> dict:
+    """fn() を repeat 回計測（cold があれば毎回の前に呼ぶ）"""
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            cold()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return {"p50_us": round(percentile(samples, 50), 1), "p95_us": round(percentile(samples, 95), 1)}
+
+
+def clear_caches():
+    normalize.cache_clear()
+    _label_dates.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="選択肢の照合のマイクロベンチマーク")
+    parser.add_argument("--options", type=int, default=5000, help="<option> の件数")
+    parser.add_argument("--radios", type=int, default=200, help="ラジオの件数")
+    parser.add_argument("--repeat", type=int, default=200, help="計測回数")
+    parser.add_argument("--output", type=str, default="", help="JSON出力先（省略時は標準出力）")
+    args = parser.parse_args()
+
+    options = make_options(args.options)
+    radios = make_radios(args.radios)
+    # 末尾近くの候補に当たるキーワード（部分一致・語と日付の一致）
+    last = normalize(options[-1]["text"])
+    partial_kw = last[: last.index("開演")]
+    month, mday = last[5:7], last[8:10]
+    fuzzy_kw = f"{int(month)}月{int(mday)}日 {SEATS[(len(options) - 2) % len(SEATS)]}"
+
+    cases = {
+        "option_partial": (
+            lambda: legacy_choose_option(options, partial_kw),
+            lambda: FirstComeFlow._choose_option(options, keyword=compile_keyword(partial_kw)),
+        ),
+        "option_fuzzy": (
+            None,
+            lambda: FirstComeFlow._choose_option(options, keyword=compile_keyword(fuzzy_kw)),
+        ),
+        "receive": (
+            lambda: legacy_choose_receive(radios, "スマチケ"),
+            lambda: FirstComeFlow._choose_receive(radios, compile_keyword("スマチケ")),
+        ),
+        "payment": (
+            None,
+            lambda: FirstComeFlow._choose_payment(radios, "ファミリーマート", compile_keyword("クレジットカード")),
+        ),
+    }
+
+    report = {
+        "revision": git_revision(),
+        "options": args.options,
+        "radios": args.radios,
+        "repeat": args.repeat,
+        "keywords": {"partial": partial_kw, "fuzzy": fuzzy_kw},
+        "results": {},
+    }
+    for name, (legacy, current) in cases.items():
+        result = {}
+        if legacy:
+            result["legacy"] = measure(legacy, args.repeat)
+        result["cold"] = measure(current, max(1, args.repeat // 10), cold=clear_caches)
+        result["warm"] = measure(current, args.repeat)
+        report["results"][name] = result
+        print(f"[{name}] " + " / ".join(f"{k} p50 {v['p50_us']}µs" for k, v in result.items()), file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 結果を保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ async def main():
             page = await helper.create_page()
             
             # 直接イベントページに移動してみる
-            event_url = f"https://eplus.jp/sf/detail/{settings.event_id}"
+            event_url = settings.eplus_url(f"/sf/detail/{settings.event_id}")
             print(f"📍 移動先URL: {event_url}")
             print()
             
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""フローの現在地判定・チェックポイント再開のテスト（モックサーバー使用）
+
+ローカルのモックサーバー（src.mock_site）上で FirstComeFlow の _locate() / _resume() / run_steps() を確かめる。
+- 各画面（チケット選択・ログイン・支払）で、後ろのステップから遡って正しい現在地を返すこと
+- チェックポイントに記録した URL を開き、到達済みのステップから再開すること
+- retry=False のステップ（発売待ち）は失敗してもやり直さないこと
+
+使用例:
+    python .\\TEST\\test_flow_resume.py
+    python -m pytest .\\TEST\\test_flow_resume.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# プロジェクトルートをパスに追加（このファイルは TEST/ 配下から直接実行されるため）
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.browser import BrowserHelper
+from src.checkpoint import Checkpoint
+from src.config import Settings
+from src.flows.first_come import FirstComeFlow
+from src.mock_site import MockEplusServer
+from src.mock_site.server import SESSION_COOKIE
+
+EVENT_ID = "resume-event"
+STEP_NAMES = [step.name for step in FirstComeFlow.STEPS]
+
+
+def make_config(server: MockEplusServer, workdir: str) -> Settings:
+    return Settings(
+        base_url=server.base_url,
+        event_id=EVENT_ID,
+        eplus_email="resume@example.com",
+        eplus_password="resume-password",
+        headless=True,
+        video_enabled=False,
+        keep_open_minutes=0,
+        screenshot_dir=os.path.join(workdir, "screenshots"),
+        screenshot_mode="off",
+        selector_cache_path=os.path.join(workdir, "selectors.json"),
+        resource_sizes_path=os.path.join(workdir, "resource_sizes.json"),
+        checkpoint_path=os.path.join(workdir, "checkpoint.json"),
+        trace_dir=os.path.join(workdir, "traces"),
+        session_state_enabled=False,
+        warm_browser_enabled=False,
+        debug=False,
+    )
+
+
+async def check_locate(helper: BrowserHelper, config: Settings):
+    """画面ごとに、最後のステップから遡った現在地"""
+    page = await helper.create_page()
+    flow = FirstComeFlow(page, helper, config)
+    last = len(FirstComeFlow.STEPS) - 1
+    cases = [
+        ("イベント詳細", f"/sf/detail/{EVENT_ID}", "release", False),
+        ("チケット選択", f"/sf/ticket/{EVENT_ID}", "tickets", False),
+        ("ログイン", f"/sf/ticket/{EVENT_ID}/login", "login", False),
+        ("支払・受取", f"/sf/payment/{EVENT_ID}", "payment", True),
+        ("トップ", "/sf/top", "event", False),
+    ]
+    try:
+        for label, path, expected, logged_in in cases:
+            await helper.context.clear_cookies()
+            if logged_in:
+                await helper.context.add_cookies(
+                    [{"name": SESSION_COOKIE, "value": "1", "url": config.base_url}]
+                )
+            await helper.goto(page, config.eplus_url(path), wait_until="load")
+            index = await flow._locate(last)
+            print(f"   {label}: 「{STEP_NAMES[index]}」")
+            assert STEP_NAMES[index] == expected, f"{label}: {STEP_NAMES[index]} != {expected}"
+    finally:
+        await page.close()
+
+
+async def check_resume(helper: BrowserHelper, config: Settings):
+    """チェックポイント（tickets 完了・ログイン画面の URL）から再開する"""
+    await helper.context.clear_cookies()
+    page = await helper.create_page()
+    try:
+        flow = FirstComeFlow(page, helper, config)
+        checkpoint = Checkpoint.from_settings(config)
+        key = f"FirstComeFlow:{EVENT_ID}"
+        checkpoint.save(key, "tickets", config.eplus_url(f"/sf/ticket/{EVENT_ID}/login"))
+        saved = Checkpoint.from_settings(config).load(key)
+        assert saved and saved["step"] == "tickets"
+
+        index = await flow._resume(saved)
+        print(f"   再開位置: 「{STEP_NAMES[index]}」（{page.url}）")
+        assert STEP_NAMES[index] == "login"
+        assert page.url.endswith(f"/sf/ticket/{EVENT_ID}/login")
+
+        # 記録の次のステップまで進んでいない画面なら、記録したステップ自体まで戻る
+        await helper.goto(page, config.eplus_url(f"/sf/ticket/{EVENT_ID}"), wait_until="load")
+        saved = {**saved, "url": page.url}
+        index = await flow._resume(saved)
+        print(f"   チケット選択画面から再開: 「{STEP_NAMES[index]}」")
+        assert STEP_NAMES[index] == "tickets"
+        checkpoint.clear(key)
+    finally:
+        await page.close()
+
+
+async def check_no_retry(helper: BrowserHelper, config: Settings):
+    """retry=False のステップは失敗しても現在地を判定し直さずに終わる"""
+    page = await helper.create_page()
+    try:
+        flow = FirstComeFlow(page, helper, config)
+        calls = {"event": 0, "release": 0}
+
+        async def event():
+            calls["event"] += 1
+            await helper.goto(page, config.eplus_url(f"/sf/detail/{EVENT_ID}"), wait_until="load")
+            return True
+
+        async def release():
+            calls["release"] += 1
+            return False  # 待機上限まで「次へ」が出なかった
+
+        flow._step1_navigate_to_event = event
+        flow._step2_wait_for_next_button = release
+        ok = await flow.run_steps()
+        print(f"   発売待ちの失敗: 結果 {ok} / 実行回数 {calls['release']}")
+        assert ok is False
+        assert calls == {"event": 1, "release": 1}
+    finally:
+        await page.close()
+
+
+async def run_all():
+    with MockEplusServer() as server, tempfile.TemporaryDirectory() as workdir:
+        config = make_config(server, workdir)
+        assert config.flow_step_retries >= 1
+        async with BrowserHelper(config) as helper:
+            print("📍 現在地の判定")
+            await check_locate(helper, config)
+            print("♻️  チェックポイントからの再開")
+            await check_resume(helper, config)
+            print("⏱️  やり直さないステップ")
+            await check_no_retry(helper, config)
+
+
+def test_flow_resume():
+    asyncio.run(run_all())
+
+
+def main():
+    print("🧪 フローの現在地判定・再開テスト")
+    try:
+        asyncio.run(run_all())
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗: {e}")
+        sys.exit(1)
+    print("\n✅ テスト成功")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""main.py の起動時 import の回帰テスト
+
+`python -X importtime main.py --help`（と引数エラー）を別プロセスで実行し、
+Playwright・pydantic-settings・フローが読み込まれていないことを確認する。
+import 合計時間は表示のみで、上限の確認は --budget-ms を指定したときだけ行う（負荷の高いCIで不安定になるため）。
+
+使用例:
+    python .\\TEST\\test_import_time.py
+    python .\\TEST\\test_import_time.py --budget-ms 150 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# --help / 引数エラーで読み込んではいけないモジュール（前方一致）
+FORBIDDEN = ["playwright", "pydantic_settings", "pydantic", "src.config", "src.browser", "src.flows"]
+
+# 例: "import time:       150 |        300 |   asyncio"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(args: list[str]) -> tuple[int, dict[str, tuple[int, int]]]:
+    """main.py を -X importtime 付きで実行し、(終了コード, {モジュール: (self_us, cumulative_us)}) を返す"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py"), *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            modules[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return proc.returncode, modules
+
+
+def forbidden_imports(modules: dict) -> list[str]:
+    return sorted(
+        name for name in modules
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN)
+    )
+
+
+def total_ms(modules: dict) -> float:
+    return sum(self_us for self_us, _ in modules.values()) / 1000
+
+
+def test_cli_help_is_light(budget_ms: Optional[float] = None, top: int = 10):
+    """--help と引数エラーで重いモジュールを読み込まないこと（pytest からも実行できる。budget_ms 指定時は時間も確認）"""
+    failures = []
+    cases = [
+        ("--help", ["--help"], 0),
+        ("引数エラー（モード無し）", [], 2),
+        ("引数エラー（--url 無し）", ["lottery"], 2),
+    ]
+    for label, args, expected_code in cases:
+        code, modules = import_times(args)
+        forbidden = forbidden_imports(modules)
+        elapsed = total_ms(modules)
+        over = budget_ms is not None and elapsed > budget_ms
+        status = "✅" if code == expected_code and not forbidden and not over else "❌"
+        limit = f"（上限 {budget_ms:.0f}ms）" if budget_ms is not None else ""
+        print(f"{status} {label}: 終了コード {code} / import {len(modules)}件 {elapsed:.1f}ms{limit}")
+        if code != expected_code:
+            failures.append(f"{label}: 終了コード {code}（想定 {expected_code}）")
+        if forbidden:
+            failures.append(f"{label}: 読み込んではいけないモジュール {', '.join(forbidden[:10])}")
+        if over:
+            failures.append(f"{label}: import {elapsed:.1f}ms が上限 {budget_ms:.0f}ms を超過")
+            slowest = sorted(modules.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+            for name, (self_us, _) in slowest:
+                print(f"   {self_us / 1000:7.1f}ms  {name}")
+    assert not failures, "\n".join(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py 起動時 import の回帰テスト")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="--help 時の import 合計時間の上限（ミリ秒。省略時は確認しない）"
+    )
+    parser.add_argument("--top", type=int, default=10, help="上限超過時に表示する遅いモジュール数")
+    args = parser.parse_args()
+
+    print("🧪 main.py 起動時 import テスト")
+    try:
+        test_cli_help_is_light(args.budget_ms, args.top)
+    except AssertionError as e:
+        print(f"\n❌ テスト失敗:\n{e}")
+        sys.exit(1)
+    print("\n✅ テスト成功")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ async def main():
             page = await helper.create_page()
             
             # イベントページに移動
-            event_url = f"https://eplus.jp/sf/detail/{settings.event_id}"
+            event_url = settings.eplus_url(f"/sf/detail/{settings.event_id}")
             print(f"📍 イベントページに移動: {event_url}")
             await page.goto(event_url, wait_until="domcontentloaded")
             await helper.safe_wait(3000)
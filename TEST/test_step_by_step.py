@@ -27,7 +27,7 @@ async def main():
             print("=" * 80)
             
             print("📍 e+ログインページに移動中...")
-            await page.goto("https://eplus.jp/sf/login", wait_until="domcontentloaded")
+            await page.goto(settings.eplus_url("/sf/login"), wait_until="domcontentloaded")
             await helper.safe_wait(2000)
             await helper.save_screenshot(page, "test_01_login_page.png")
             
@@ -53,7 +53,7 @@ async def main():
                 print("❌ EVENT_IDが設定されていません")
                 return
             
-            event_url = f"https://eplus.jp/sf/detail/{settings.event_id}"
+            event_url = settings.eplus_url(f"/sf/detail/{settings.event_id}")
             print(f"📍 イベントページに移動: {event_url}")
             
             try:
@@ -35,6 +35,9 @@ async def main():
             print("\n" + "=" * 60)
             print("✅ ログイン完了！")
             print("=" * 60)
+            if config.hold_after_login_minutes > 0:
+                print(f"⏳ {config.hold_after_login_minutes}分間ブラウザを開いたままにします（ページを閉じると終了）...")
+                await helper.keep_alive(page, config.hold_after_login_minutes)
         else:
             print("\n" + "=" * 60)
             print("❌ ログイン失敗")
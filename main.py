@@ -3,79 +3,108 @@
 e+ チケット購入自動化メインスクリプト
 """
 
+from __future__ import annotations
+
 import asyncio
 import argparse
+import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Playwright・pydantic-settings・フローは重いので、引数を解析してから必要なものだけ読み込む
+# （--help や引数エラーでは読み込まない。TEST/test_import_time.py で確認）
+if TYPE_CHECKING:
+    from src.config import Settings
 
-from src.config import Settings
-from src.browser import BrowserHelper
-from src.flows.lottery import LotteryEntryFlow
-from src.flows.purchase import QuickPurchaseFlow
+# 出力先・レベルは設定の読み込み後に src.log.configure_from_settings() で決まる
+log = logging.getLogger("eplus.main")
+# 前に空行を入れる見出し（src.log.SECTION と同じ。--help で src.log を読み込まないよう直接書く）
+SECTION = {"section": True}
 
 async def run_login_only(config: Settings):
     """ログインのみ実行"""
-    print("\n🔐 ログインモード")
+    from src.browser import BrowserHelper
+
+    log.info("🔐 ログインモード", extra=SECTION)
     
     async with BrowserHelper(config) as helper:
         page = await helper.create_page()
         
         # e+ トップページにアクセス
-        await page.goto("https://eplus.jp/", timeout=30000)
-        await helper.safe_wait(3000)
+        await helper.goto(page, config.eplus_url("/"), timeout=30000)
+        await helper.wait_until(page, load_state="load", timeout=3000)
         
-        print("✓ e+ トップページにアクセスしました")
-        print("🖱️  手動でログインしてください（120秒待機）")
+        log.info("✓ e+ トップページにアクセスしました")
+        log.warning("🖱️  手動でログインしてください（120秒待機）")
         
         await helper.save_screenshot(page, "manual_login_01_top.png")
         await helper.safe_wait(120000)
         
         await helper.save_screenshot(page, "manual_login_02_after.png")
-        print("✅ ログイン完了")
+        if await helper.is_logged_in():
+            await helper.save_session()
+        log.info("✅ ログイン完了")
 
 
 async def run_lottery_entry(config: Settings, event_url: str):
     """抽選応募フロー実行"""
-    print("\n🎫 抽選応募モード")
+    from src.browser import BrowserHelper
+    from src.flows.lottery import LotteryEntryFlow
+
+    log.info("🎫 抽選応募モード", extra=SECTION)
     
     async with BrowserHelper(config) as helper:
         page = await helper.create_page()
         
         # まずログイン
-        print("\n📝 ログイン処理...")
-        await page.goto("https://eplus.jp/", timeout=30000)
-        await helper.safe_wait(3000)
+        log.info("📝 ログイン処理...", extra=SECTION)
+        await helper.goto(page, config.eplus_url("/"), timeout=30000)
+        await helper.wait_until(page, load_state="load", timeout=3000)
         
-        print("🖱️  手動でログインしてください（60秒待機）")
-        await helper.safe_wait(60000)
+        if helper.session_restored and await helper.is_logged_in():
+            log.info("✅ 保存済みのログイン状態で認証済み（手動ログインを省略）")
+        else:
+            log.warning("🖱️  手動でログインしてください（60秒待機）")
+            await helper.safe_wait(60000)
+            if await helper.is_logged_in():
+                await helper.save_session()
         
         # 抽選フロー実行
         flow = LotteryEntryFlow(page, helper, config, event_url)
         await flow.execute()
         
-        print("\n⏱️  ブラウザは30秒後に閉じます")
+        log.info("⏱️  ブラウザは30秒後に閉じます", extra=SECTION)
         await asyncio.sleep(30)
 
 
 async def run_quick_purchase(config: Settings, event_url: str):
     """即購入フロー実行"""
-    print("\n⚡ 即購入モード（先着順）")
+    from src.browser import BrowserHelper
+    from src.flows.purchase import QuickPurchaseFlow
+
+    log.info("⚡ 即購入モード（先着順）", extra=SECTION)
     
     async with BrowserHelper(config) as helper:
         page = await helper.create_page()
         
         # まずログイン
-        print("\n📝 ログイン処理...")
-        await page.goto("https://eplus.jp/", timeout=30000)
-        await helper.safe_wait(3000)
+        log.info("📝 ログイン処理...", extra=SECTION)
+        await helper.goto(page, config.eplus_url("/"), timeout=30000)
+        await helper.wait_until(page, load_state="load", timeout=3000)
         
-        print("🖱️  手動でログインしてください（60秒待機）")
-        await helper.safe_wait(60000)
+        if helper.session_restored and await helper.is_logged_in():
+            log.info("✅ 保存済みのログイン状態で認証済み（手動ログインを省略）")
+        else:
+            log.warning("🖱️  手動でログインしてください（60秒待機）")
+            await helper.safe_wait(60000)
+            if await helper.is_logged_in():
+                await helper.save_session()
         
         # 即購入フロー実行
         flow = QuickPurchaseFlow(page, helper, config, event_url)
         await flow.execute()
         
-        print("\n⏱️  ブラウザは30秒後に閉じます")
+        log.info("⏱️  ブラウザは30秒後に閉じます", extra=SECTION)
         await asyncio.sleep(30)
 
 
@@ -127,9 +156,15 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.mode in ("lottery", "purchase") and not args.url:
+        parser.error(f"{args.mode} モードでは --url が必要です")
     
-    # 設定読み込み
+    # 設定読み込み（.env の読み込みとディレクトリ作成は引数チェックの後）
+    from src.config import Settings
+    from src.log import configure_from_settings
+
     config = Settings()
+    configure_from_settings(config)
     
     # コマンドライン引数で上書き
     if args.headless:
@@ -146,16 +181,12 @@ def main():
         asyncio.run(run_login_only(config))
     
     elif args.mode == "lottery":
-        if not args.url:
-            parser.error("lottery モードでは --url が必要です")
         asyncio.run(run_lottery_entry(config, args.url))
     
     elif args.mode == "purchase":
-        if not args.url:
-            parser.error("purchase モードでは --url が必要です")
         asyncio.run(run_quick_purchase(config, args.url))
     
-    print("\n✅ すべての処理が完了しました")
+    log.info("✅ すべての処理が完了しました", extra=SECTION)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+"""静的ファイルのディスクキャッシュ
+
+実行ごとに新しいブラウザコンテキストを作るため、CSS/JS/フォント/画像が毎回ダウンロードされる。
+context.route でこれらのリクエストを受け、本文を内容ハッシュ（sha256）で
+.cache/assets/objects/ に保存し、次回以降はディスクから返す。
+
+- 鮮度は Cache-Control: max-age に従い、期限切れでも ETag / Last-Modified があれば条件付きリクエストで再検証する
+- no-store・エラー応答・検証子も max-age も無い応答は保存しない
+- 合計サイズが上限を超えたら最後に使われたのが古い順に捨てる（LRU）
+- 取得に失敗した場合（通信断・DNS失敗・コンテキスト終了など）は保存せず、通常の処理（route.fallback）に任せる
+
+統計表示と削除:
+    python -m src.asset_cache --stats
+    python -m src.asset_cache --purge
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Request, Route
+
+# キャッシュ対象のリソース種別
+CACHEABLE_TYPES = frozenset({"stylesheet", "script", "font", "image"})
+
+# 保存しないレスポンスヘッダ（本文は展開済みで受け取るため長さ・圧縮系は付け直させる）
+_DROP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection"})
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def _freshness(headers: dict) -> Optional[int]:
+    """キャッシュしてよい秒数（保存不可なら None、再検証前提なら 0）"""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    m = _MAX_AGE.search(cache_control)
+    if m and "no-cache" not in cache_control:
+        return int(m.group(1))
+    if headers.get("etag") or headers.get("last-modified"):
+        return 0
+    return None
+
+
+class AssetCache:
+    """内容アドレス方式の静的ファイルキャッシュ（context.route 用ハンドラ）
+
+    Args:
+        root: 保存先ディレクトリ（index.json と objects/ を置く）
+        max_bytes: 本文の合計サイズ上限
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 200 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stored = 0
+        self.evictions = 0
+        self.errors = 0
+        self.bytes_served = 0
+        self._dirty = False
+        self._index: dict[str, dict] = {}
+        try:
+            self._index = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._index = {}
+
+    # ------------------------------------------------------------------
+    # 保存領域
+    # ------------------------------------------------------------------
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def _read(self, entry: dict) -> Optional[bytes]:
+        try:
+            return self._object_path(entry["sha256"]).read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, url: str, status: int, headers: dict, body: bytes, max_age: int):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(body)
+            tmp.replace(path)
+        now = time.time()
+        self._index.pop(url, None)
+        self._index[url] = {
+            "sha256": digest,
+            "status": status,
+            "headers": {k.lower(): v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+            "size": len(body),
+            "max_age": max_age,
+            "stored": now,
+            "used": now,
+        }
+        self.stored += 1
+        self._dirty = True
+        self._evict()
+
+    def _evict(self):
+        """合計サイズが上限を超えていれば、最後に使われたのが古いものから捨てる"""
+        sizes = {e["sha256"]: e["size"] for e in self._index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self._index.items(), key=lambda kv: kv[1].get("used", 0)):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            self.evictions += 1
+            digest = entry["sha256"]
+            # 同じ内容を参照する別URLが残っていれば本文は消さない
+            if not any(e["sha256"] == digest for e in self._index.values()):
+                total -= entry["size"]
+                self._object_path(digest).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # ルーティング
+    # ------------------------------------------------------------------
+    async def handle(self, route: Route, request: Request):
+        """context.route("**/*", ...) に渡すハンドラ"""
+        if request.method != "GET" or request.resource_type not in CACHEABLE_TYPES:
+            await route.fallback()
+            return
+        try:
+            await self._handle(route, request)
+        except Exception:
+            # 例外をハンドラの外に出すとリクエストが宙に浮き、読み込みがタイムアウトまで止まる。
+            # ネットワークに任せれば本来のエラーがページ（と再試行の判定）に届く
+            self.errors += 1
+            try:
+                await route.fallback()
+            except Exception:
+                pass  # コンテキスト終了などでルートがもう使えない
+
+    async def _handle(self, route: Route, request: Request):
+        url = request.url
+        entry = self._index.get(url)
+        body = self._read(entry) if entry else None
+        if entry and body is not None:
+            if time.time() - entry["stored"] < entry["max_age"]:
+                await self._serve(route, url, entry, body)
+                return
+            # 期限切れ → 検証子があれば条件付きで問い合わせる
+            validators = {}
+            if entry["headers"].get("etag"):
+                validators["if-none-match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                validators["if-modified-since"] = entry["headers"]["last-modified"]
+            if validators:
+                response = await route.fetch(headers={**request.headers, **validators})
+                if response.status == 304:
+                    self.revalidated += 1
+                    entry["stored"] = time.time()
+                    await self._serve(route, url, entry, body)
+                    return
+                await self._store_and_fulfill(route, url, response)
+                return
+
+        await self._store_and_fulfill(route, url, await route.fetch())
+
+    async def _serve(self, route: Route, url: str, entry: dict, body: bytes):
+        self.hits += 1
+        self.bytes_served += len(body)
+        entry["used"] = time.time()
+        self._index.pop(url, None)
+        self._index[url] = entry
+        self._dirty = True
+        await route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+
+    async def _store_and_fulfill(self, route: Route, url: str, response):
+        self.misses += 1
+        body = await response.body()
+        max_age = _freshness({k.lower(): v for k, v in response.headers.items()})
+        if response.status == 200 and max_age is not None:
+            try:
+                self._write(url, response.status, response.headers, body, max_age)
+            except OSError:
+                pass
+        await route.fulfill(response=response, body=body)
+
+    # ------------------------------------------------------------------
+    # 統計・保存・削除
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        """今回の実行でのヒット数などと、保存済みのエントリ数/合計サイズ"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "bytes_served": self.bytes_served,
+            "entries": len(self._index),
+            "size_bytes": sum({e["sha256"]: e["size"] for e in self._index.values()}.values()),
+        }
+
+    def save(self):
+        """索引に変更があれば書き出す"""
+        if not self._dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / "index.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._index, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        self._dirty = False
+
+    def purge(self) -> int:
+        """保存済みのファイルをすべて削除し、削除したファイル数を返す"""
+        removed = 0
+        objects = self.root / "objects"
+        if objects.exists():
+            for path in sorted(objects.rglob("*"), reverse=True):
+                if path.is_file():
+                    path.unlink()
+                    removed += 1
+                else:
+                    path.rmdir()
+        (self.root / "index.json").unlink(missing_ok=True)
+        self._index = {}
+        self._dirty = False
+        return removed
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from .config import Settings
+
+    parser = argparse.ArgumentParser(description="静的ファイルキャッシュの統計表示・削除")
+    parser.add_argument("--dir", type=Path, default=None, help="キャッシュディレクトリ（省略時は ASSET_CACHE_DIR）")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--stats", action="store_true", help="エントリ数と合計サイズを表示（既定）")
+    group.add_argument("--purge", action="store_true", help="キャッシュをすべて削除")
+    args = parser.parse_args(argv)
+
+    config = Settings()
+    cache = AssetCache(args.dir or config.asset_cache_dir, config.asset_cache_max_mb * 1024 * 1024)
+    if args.purge:
+        removed = cache.purge()
+        print(f"🧹 静的ファイルキャッシュを削除: {removed}件 ({cache.root})")
+        return 0
+    stats = cache.stats()
+    print(f"📦 {cache.root}: {stats['entries']}件 / {stats['size_bytes'] / 1024 / 1024:.1f}MB "
+          f"(上限 {config.asset_cache_max_mb}MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,61 @@
 """ブラウザ制御ヘルパー"""
 
 import asyncio
-from pathlib import Path
+import inspect
 import json
-from typing import Optional
-from playwright.async_api import Browser, BrowserContext, Page, async_playwright, Playwright
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence, Union
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    ElementHandle,
+    Frame,
+    Page,
+    async_playwright,
+    Playwright,
+)
 
+from .asset_cache import AssetCache
 from .config import Settings
+from .log import configure_from_settings, flush as flush_log, get_logger
+from .privacy_mask import MASK_STATS_JS, masker_script
+from .resource_filter import ResourceFilter
+from .retry import Retrier, is_fatal, is_transient
+from .selector_cache import SelectorCache
+from .session_store import SessionStore
+from .trace import Tracer, record, set_tracer, span
+from .video_retention import spawn as spawn_video_retention
+
+log = get_logger(__name__)
+
+# click_element の試行ごとのクリック方法（失敗するたびに次へ切り替える）
+CLICK_STRATEGIES = ("click", "js", "force")
+
+# Chromium の起動引数（常駐ブラウザでも同じものを使う）
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox'
+]
+
+
+def is_port_open(host: str, port: int, timeout: float = 0.2) -> bool:
+    """ローカルのポートが待ち受け中か（常駐ブラウザの有無を接続前に安く確かめる）"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def read_warm_state(path: Union[str, Path]) -> Optional[dict]:
+    """常駐ブラウザが書いた状態ファイル（pid・port・headless）。無い・読めなければ None"""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
 
 
 class BrowserHelper:
@@ -17,6 +66,26 @@ class BrowserHelper:
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self.selector_cache: Optional[SelectorCache] = None
+        self._pending_writes: set[asyncio.Future] = set()
+        self.tracer: Optional[Tracer] = None
+        self._videos: list[tuple[Page, float]] = []  # 録画中のページと録画開始時刻
+        self.trace_path: Optional[Path] = None
+        self.har_path: Optional[Path] = None  # RECORD_HAR の保存先
+        self._stamp = ""
+        self.resource_filter = ResourceFilter.from_settings(config)
+        self.asset_cache: Optional[AssetCache] = None
+        # HAR の記録・再生中はキャッシュを通さない（記録には実際の通信を残し、再生では実サイトに取りに行かない）
+        if config.asset_cache_enabled and not (config.record_har or config.replay_har):
+            self.asset_cache = AssetCache(config.asset_cache_dir, config.asset_cache_max_mb * 1024 * 1024)
+        if config.selector_cache_enabled:
+            self.selector_cache = SelectorCache(config.selector_cache_path)
+        self.warm = False  # 常駐ブラウザに接続した場合 True
+        self.retrier = Retrier.from_settings(config)
+        self.session_store: Optional[SessionStore] = None
+        self.session_restored = False
+        if config.session_state_enabled:
+            self.session_store = SessionStore.from_settings(config)
     
     async def __aenter__(self):
         """非同期コンテキストマネージャー - 開始"""
@@ -29,14 +98,16 @@ class BrowserHelper:
     
     async def start(self):
         """ブラウザを起動"""
+        configure_from_settings(self.config)
+        # スパンJSONLとPlaywrightトレースは同じ時刻印で保存し、解析時に対応付ける
+        self._stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.config.trace_log_enabled or self._video_retained():
+            # 録画の切り出しにはステップの時間帯が要るため、ログを書かない場合もメモリ上で記録する
+            path = Path(self.config.trace_dir) / f"trace_{self._stamp}.jsonl" if self.config.trace_log_enabled else None
+            self.tracer = Tracer(path)
+            set_tracer(self.tracer)
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.config.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox'
-            ]
-        )
+        self.browser = await self._launch_or_connect()
         new_context_kwargs = dict(
             viewport={"width": 1280, "height": 800},
             user_agent=(
@@ -51,10 +122,87 @@ class BrowserHelper:
                 "record_video_dir": str(self.config.video_dir),
                 "record_video_size": {"width": 1280, "height": 800},
             })
+        # HAR の記録（コンテキストを閉じた時点で書き出される）
+        if self.config.record_har:
+            self.har_path = Path(self.config.record_har.replace("{stamp}", self._stamp))
+            self.har_path.parent.mkdir(parents=True, exist_ok=True)
+            new_context_kwargs["record_har_path"] = str(self.har_path)
+            if self.config.har_url_filter:
+                new_context_kwargs["record_har_url_filter"] = self.config.har_url_filter
+        # 保存済みのログイン状態を復元
+        if self.session_store:
+            try:
+                state = self.session_store.load()
+            except ImportError:
+                log.warning("⚠️ cryptography が無いためログイン状態の保存を無効化します（pip install cryptography）")
+                self.session_store = None
+                state = None
+            if state:
+                new_context_kwargs["storage_state"] = state
+                self.session_restored = True
+                log.debug(f"🔑 保存済みのログイン状態を読み込み: {self.session_store.path}")
         self.context = await self.browser.new_context(**new_context_kwargs)
-    
+        if self.config.mask_personal_info:
+            # 全ページ・全フレームの各ドキュメントで1回だけ動く
+            await self.context.add_init_script(masker_script(self.config.eplus_email or ""))
+        # route は後に登録したものが先に呼ばれる → 遮断を判定してから、通すものだけキャッシュへ回す
+        if self.config.replay_har:
+            # HAR の応答を返し、HAR に無いリクエストは遮断する（実サイトには接続しない）
+            await self.context.route_from_har(
+                self.config.replay_har, url=self.config.har_url_filter or None, not_found="abort"
+            )
+            log.debug(f"📼 HAR を再生: {self.config.replay_har}")
+        if self.asset_cache:
+            await self.context.route("**/*", self.asset_cache.handle)
+        # 画像・フォント・広告タグなどの遮断（サイズの観測は遮断なしでも行い、推定に使う）
+        self.context.on("response", self.resource_filter.observe)
+        if self.resource_filter.profile.enabled:
+            await self.context.route("**/*", self.resource_filter.handle)
+        if self.config.trace_enabled:
+            await self.context.tracing.start(screenshots=True, snapshots=True)
+            self.trace_path = Path(self.config.trace_dir) / f"playwright_{self._stamp}.zip"
+
+    async def _launch_or_connect(self) -> Browser:
+        """常駐ブラウザ（WARM_BROWSER_ENABLED=true のとき）があれば CDP で接続し、無ければ通常どおり起動する"""
+        if self.config.warm_browser_enabled:
+            browser = await self._connect_warm()
+            if browser:
+                return browser
+        return await self.playwright.chromium.launch(headless=self.config.headless, args=LAUNCH_ARGS)
+
+    async def _connect_warm(self) -> Optional[Browser]:
+        """src.browser_daemon が状態ファイルを書いていて、ポート・HEADLESS が一致する場合だけ接続する"""
+        port = self.config.warm_browser_port
+        state = read_warm_state(self.config.warm_browser_state_path)
+        if not state or state.get("port") != port or not is_port_open("127.0.0.1", port):
+            log.info(f"♨️  常駐ブラウザが見つかりません（通常起動します）: {self.config.warm_browser_state_path}")
+            return None
+        if state.get("headless") != self.config.headless:
+            mode = "headless" if state.get("headless") else "headed"
+            log.info(f"♨️  常駐ブラウザは {mode} で起動しているため接続しません（HEADLESS={self.config.headless}。通常起動します）")
+            return None
+        try:
+            browser = await self.playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{port}", timeout=3000)
+        except Exception as e:
+            log.warning(f"⚠️ 常駐ブラウザに接続できません（通常起動します）: {e}")
+            return None
+        self.warm = True
+        log.info(f"♨️  常駐ブラウザに接続: 127.0.0.1:{port}（pid {state.get('pid')}）")
+        return browser
+
     async def stop(self):
-        """ブラウザを停止"""
+        """ブラウザを停止（常駐ブラウザの場合は作成したコンテキストを閉じて切断するだけ）"""
+        await self.flush_screenshots()
+        if self.context and self.config.mask_personal_info:
+            await self._emit_mask_stats()
+        if self.context and self.trace_path:
+            # コンテキストを閉じる前に書き出す（閉じた後は保存できない）
+            try:
+                self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+                await self.context.tracing.stop(path=str(self.trace_path))
+                log.info(f"🧵 Playwrightトレース保存: {self.trace_path}")
+            except Exception as e:
+                log.warning(f"⚠️ Playwrightトレースの保存に失敗: {e}")
         if self.context:
             # 動画保存のため、ページを先に閉じる
             try:
@@ -66,121 +214,441 @@ class BrowserHelper:
             except Exception:
                 pass
             await self.context.close()
+            if self.har_path:
+                log.info(f"📼 HAR 保存: {self.har_path}")
+            # 録画はコンテキストを閉じた時点で書き出し済み
+            if self._videos:
+                videos = await self._video_entries()
+                if videos:
+                    self._start_video_retention(videos)
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        if self.selector_cache:
+            try:
+                self.selector_cache.save()
+            except OSError:
+                pass
+            log.debug(f"🗂️  セレクタキャッシュ: {self.selector_cache.stats()}")
+        if self.asset_cache:
+            try:
+                self.asset_cache.save()
+            except OSError:
+                pass
+            log.debug(f"📦 静的ファイルキャッシュ: {self.asset_cache.stats()}")
+        try:
+            self.resource_filter.save()
+        except OSError:
+            pass
+        if self.resource_filter.profile.enabled:
+            log.debug(f"🚫 リクエスト遮断: {self.resource_filter.summary()}")
+        if self.tracer:
+            self.tracer.close()
+            set_tracer(None)
+            log.debug(f"🧭 トレース保存: {self.tracer.path}")
+        # 呼び出し側が終了後に print しても順序が崩れないよう、ここまでのログを書き出しておく
+        flush_log()
     
+    async def is_logged_in(self, timeout: int = 3000) -> bool:
+        """ログイン済みかを画面遷移なしで確認する
+
+        コンテキストのCookieでログイン確認ページ（session_probe_path）をリダイレクトなしで要求し、
+        200 が返ればログイン済み、ログイン画面へのリダイレクトなら未ログインとみなす。
+        """
+        if not self.context:
+            return False
+        record("session_probes")
+        started = time.perf_counter()
+        try:
+            response = await self.context.request.get(
+                self.config.eplus_url(self.config.session_probe_path),
+                max_redirects=0,
+                timeout=timeout,
+            )
+        except Exception:
+            return False
+        finally:
+            record("session_probe_ms", (time.perf_counter() - started) * 1000)
+        logged_in = response.status == 200 and "login" not in response.url.lower()
+        await response.dispose()
+        return logged_in
+
+    async def save_session(self):
+        """現在のログイン状態を暗号化して保存（ログイン成功を確認した後に呼ぶ）"""
+        if not self.session_store or not self.context:
+            return
+        try:
+            self.session_store.save(await self.context.storage_state())
+            log.debug(f"🔑 ログイン状態を保存: {self.session_store.path}")
+        except Exception as e:
+            log.warning(f"⚠️ ログイン状態の保存に失敗: {e}")
+
+    def clear_session(self):
+        """保存済みのログイン状態を削除"""
+        if self.session_store:
+            self.session_store.clear()
+
     async def create_page(self) -> Page:
         """新しいページを作成"""
         if not self.context:
             raise RuntimeError("Browser context not initialized")
         page = await self.context.new_page()
-        # 個人情報のマスキングを適用
-        if self.config.mask_personal_info:
-            try:
-                await self._apply_privacy_masks(page)
-            except Exception:
-                pass
+        if self._video_retained():
+            self._videos.append((page, time.time()))
         return page
 
-    async def _apply_privacy_masks(self, page: Page):
-        """入力欄などの個人情報を画面上でマスク（録画用）"""
-        # 1) CSSで代表的な入力欄をぼかす
-        css = """
-        input[type="password"],
-        input[name="login_id"],
-        input[name="login_pw"],
-        #login_id,
-        #login_pw,
-        input[autocomplete="username"],
-        input[autocomplete="current-password"],
-        #securityCode,
-        input[name*="security" i],
-        .GB1112MainFormCreditCardNo,
-        [id^="creditCardId_"],
-        #sm-menu-card,
-        .sm-menu
-        { filter: blur(8px) !important; -webkit-filter: blur(8px) !important; }
-        """
+    def _video_retained(self) -> bool:
+        """録画を実行後に切り出す・削除するか"""
+        return self.config.video_enabled and self.config.video_retention != "always"
 
-        async def apply_to_frame(fr):
+    async def _video_entries(self) -> list[dict]:
+        """録画中のページの録画ファイルと時間帯（ページを閉じた後に呼ぶ）"""
+        entries = []
+        ended = time.time()
+        for page, started in self._videos:
             try:
-                await fr.add_style_tag(content=css)
+                path = await page.video.path() if page.video else None
             except Exception:
-                pass
+                # 常駐ブラウザ（CDP接続）では録画ファイルのパスを取得できない
+                path = None
+            if path:
+                entries.append({"path": str(Path(path).resolve()), "started": started, "ended": ended})
+        return entries
 
-        # ページ本体と既存iframeに適用
-        await apply_to_frame(page)
-        for fr in page.frames:
-            await apply_to_frame(fr)
+    def _start_video_retention(self, videos: list[dict]):
+        """録画の切り出し・削除を別プロセスで開始（終了は待たない）"""
+        job = {
+            "mode": self.config.video_retention,
+            "last_minutes": self.config.video_last_minutes,
+            "padding_seconds": self.config.video_clip_padding_seconds,
+            "ffmpeg": self.config.ffmpeg_path,
+            "videos": videos,
+            "windows": self.tracer.windows if self.tracer else [],
+        }
+        job_path = Path(self.config.video_dir) / f".retention_{self._stamp}.json"
+        try:
+            spawn_video_retention(job, job_path)
+            log.debug(f"🎞️  録画の保持処理を開始（{self.config.video_retention}）: {job_path}")
+        except OSError as e:
+            log.warning(f"⚠️ 録画の保持処理を開始できません: {e}")
 
-        # 新規にアタッチされるiframeにも適用
-        def _on_frame_attached(frame):
-            try:
-                asyncio.create_task(apply_to_frame(frame))
-            except Exception:
-                pass
-        page.on("frameattached", _on_frame_attached)
-
-        # 2) 画面上に表示されるメールアドレス文字列を伏字化（テキストノードのみ）
-        email = getattr(self.config, "eplus_email", "") or ""
-        if email:
-            js = """
-            (function(maskTarget) {
-              try {
-                const mask = (text) => text.split(maskTarget).join('*'.repeat(8));
-                // 既存のテキストノードを書き換え
-                const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
-                let node; while ((node = walker.nextNode())) {
-                  if (node.nodeValue && node.nodeValue.includes(maskTarget)) {
-                    node.nodeValue = mask(node.nodeValue);
-                  }
-                }
-                // 変化を監視して都度マスク
-                const obs = new MutationObserver((mutations) => {
-                  for (const m of mutations) {
-                    const nodes = [];
-                    if (m.addedNodes) nodes.push(...m.addedNodes);
-                    for (const n of nodes) {
-                      try {
-                        if (n.nodeType === Node.TEXT_NODE) {
-                          if (n.nodeValue && n.nodeValue.includes(maskTarget)) {
-                            n.nodeValue = mask(n.nodeValue);
-                          }
-                        } else if (n.nodeType === Node.ELEMENT_NODE) {
-                          const w = document.createTreeWalker(n, NodeFilter.SHOW_TEXT);
-                          let tn; while ((tn = w.nextNode())) {
-                            if (tn.nodeValue && tn.nodeValue.includes(maskTarget)) {
-                              tn.nodeValue = mask(tn.nodeValue);
-                            }
-                          }
-                        }
-                      } catch(e) {}
-                    }
-                  }
-                });
-                obs.observe(document.body, {childList: true, subtree: true, characterData: true});
-              } catch(e) {}
-            })({json_email});
-            """.replace("{json_email}", json.dumps(email))
+    async def mask_stats(self, page: Page) -> dict:
+        """個人情報マスクのページ内集計（全フレームの合計。src/privacy_mask.py 参照）"""
+        totals: dict[str, float] = {}
+        for frame in page.frames:
             try:
-                await page.add_init_script(js)
-                await page.evaluate(js)
+                stats = await frame.evaluate(MASK_STATS_JS)
             except Exception:
-                pass
+                continue
+            for key, value in (stats or {}).items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    async def _emit_mask_stats(self):
+        """開いているページのマスク集計をトレースに書き出す（DEBUG 時は表示も）"""
+        totals: dict[str, float] = {}
+        for page in self.context.pages:
+            for key, value in (await self.mask_stats(page)).items():
+                totals[key] = totals.get(key, 0) + value
+        if not totals:
+            return
+        async with span("privacy_mask") as sp:
+            for key, value in totals.items():
+                sp.add(f"mask_{key}", value)
+        log.debug(
+            f"🙈 マスク: 走査 {totals.get('scanned', 0):.0f}ノード / 伏字 {totals.get('masked', 0):.0f} / "
+            f"{totals.get('batches', 0):.0f}回 {totals.get('time_ms', 0):.1f}ms"
+        )
     
+    async def goto(self, page: Page, url: str, **kwargs):
+        """ページ遷移（通信断などの一時的な失敗は再試行。タイムアウトは再試行しない。所要時間をトレースに記録）"""
+
+        async def attempt(_attempt: int):
+            started = time.perf_counter()
+            try:
+                return await page.goto(url, **kwargs)
+            finally:
+                record("navigations")
+                record("navigation_ms", (time.perf_counter() - started) * 1000)
+
+        return await self.retrier.call("goto", attempt, retryable=is_transient)
+
     async def safe_wait(self, ms: int):
-        """安全な待機（ミリ秒）"""
+        """安全な待機（ミリ秒）
+
+        固定時間の待機。手動操作の猶予など「時間そのもの」を待つ場合に使う。
+        ページの準備完了を待つ場合は wait_until を使うこと。
+        """
         await asyncio.sleep(ms / 1000)
+
+    async def keep_alive(self, page: Optional[Page], minutes: float):
+        """ブラウザを開いたまま待機する
+
+        指定分数の経過、ページが閉じられる、呼び出し元タスクのキャンセル（Ctrl+C）の
+        いずれかで終了する。手動操作のためにブラウザを残しておく用途に使う。
+        """
+        if not minutes or minutes <= 0:
+            return
+        closed = asyncio.Event()
+        if page is not None:
+            if page.is_closed():
+                return
+            page.once("close", lambda _: closed.set())
+        try:
+            await asyncio.wait_for(closed.wait(), timeout=minutes * 60)
+        except asyncio.TimeoutError:
+            pass
+
+    async def wait_until(
+        self,
+        page: Page,
+        predicate: Union[str, Callable[[], Any], None] = None,
+        *,
+        arg: Any = None,
+        url_change: Optional[str] = None,
+        load_state: Optional[str] = None,
+        selector: Optional[str] = None,
+        state: str = "visible",
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """条件が満たされるまで待機（満たされればTrue、タイムアウトならFalse）
+
+        Args:
+            page: 対象のページ（またはフレーム）
+            predicate: JS式/関数（文字列、wait_for_function で評価）または Python の呼び出し可能オブジェクト
+            arg: JS predicate に渡す引数
+            url_change: このURLから遷移するまで待つ（クリック前の page.url を渡す）
+            load_state: "domcontentloaded" / "load" / "networkidle"
+            selector: 出現を待つセレクタ（state で状態を指定）
+            timeout: 全条件で共有する上限（ミリ秒、省略時は config.wait_timeout_ms）
+
+        複数指定した場合は url_change → load_state → selector → predicate の順にすべて待つ。
+        タイムアウトしても例外は投げないため、固定待機の置き換えとしてそのまま使える。
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        budget_ms = timeout if timeout is not None else self.config.wait_timeout_ms
+        deadline = started + budget_ms / 1000
+
+        def remaining() -> float:
+            left = (deadline - loop.time()) * 1000
+            if left <= 0:
+                raise asyncio.TimeoutError()
+            # Playwright は timeout=0 を「無制限」と解釈するため最低1msにする
+            return max(1, left)
+
+        try:
+            if url_change is not None:
+                await page.wait_for_url(
+                    lambda url: url != url_change, wait_until="commit", timeout=remaining()
+                )
+            if load_state:
+                await page.wait_for_load_state(load_state, timeout=remaining())
+            if selector:
+                # 待機中の遷移で実行コンテキストが破棄された場合は、残り時間で待ち直す
+                await self.retrier.call(
+                    "selector",
+                    lambda _attempt: page.wait_for_selector(selector, state=state, timeout=remaining()),
+                    retryable=is_transient,
+                )
+            if isinstance(predicate, str):
+                await page.wait_for_function(predicate, arg=arg, timeout=remaining())
+            elif predicate is not None:
+                while True:
+                    try:
+                        result = predicate()
+                        if inspect.isawaitable(result):
+                            result = await result
+                    except Exception:
+                        result = False
+                    if result:
+                        break
+                    await asyncio.sleep(min(0.1, remaining() / 1000))
+            return True
+        except Exception:
+            record("wait_timeouts")
+            return False
+        finally:
+            elapsed_ms = (loop.time() - started) * 1000
+            record("wait_ms", elapsed_ms)
+            if url_change is not None or load_state:
+                record("navigation_ms", elapsed_ms)
     
-    async def save_screenshot(self, page: Page, filename: str):
-        """スクリーンショットを保存"""
-        screenshot_dir = Path(self.config.screenshot_dir)
-        screenshot_dir.mkdir(parents=True, exist_ok=True)
-        
-        filepath = screenshot_dir / filename
-        await page.screenshot(path=str(filepath), full_page=True)
-        
-        if self.config.debug:
-            print(f"📸 スクリーンショット保存: {filepath}")
+    async def find_first(
+        self,
+        target: Union[Page, Frame, ElementHandle, Sequence[Union[Page, Frame, ElementHandle]]],
+        selectors: Sequence[str],
+        timeout: Optional[int] = None,
+        state: str = "visible",
+        cache_key: Optional[str] = None,
+    ) -> tuple[Optional[ElementHandle], Optional[str]]:
+        """候補セレクタを一斉に探索し、最初に見つかった要素とそのセレクタを返す
+
+        Args:
+            target: 探索対象（ページ/フレーム/要素、またはそのリスト）
+            selectors: 候補セレクタ（先頭ほど優先）
+            timeout: 出現待ちの上限（ミリ秒、省略時は config.wait_timeout_ms、0なら即時照会のみ）
+            state: "visible" または "attached"
+            cache_key: セレクタ的中キャッシュのキー（例: "auto_login.email"）。指定時は
+                前回ヒットしたセレクタだけを先に照会し、結果を記録する
+
+        まず全候補を並列に即時照会し、既に存在するものがあればリスト順で最優先のものを返す。
+        無ければ全候補の wait_for_selector を同時に走らせ、最初に出現したものを返す。
+        候補を1つずつ待つ場合と違い、外れ候補のタイムアウトが積み上がらない。
+        見つからなければ (None, None)。
+        """
+        targets = list(target) if isinstance(target, (list, tuple)) else [target]
+        selectors = list(selectors)
+        record("find_first_calls")
+
+        cache = self.selector_cache if cache_key else None
+        key = None
+        if cache:
+            key = cache.make_key(cache_key, getattr(targets[0], "url", "") if targets else "")
+            best = cache.winner(key, selectors)
+            if best:
+                el, sel = await self._probe_first(targets, [best], state)
+                if el:
+                    cache.record(key, sel)
+                    return el, sel
+
+        budget_ms = timeout if timeout is not None else self.config.wait_timeout_ms
+        deadline = time.monotonic() + budget_ms / 1000
+
+        async def attempt(attempt_number: int):
+            left = budget_ms if attempt_number == 1 else max(0, int((deadline - time.monotonic()) * 1000))
+            return await self._race_selectors(targets, selectors, left, state)
+
+        try:
+            el, sel = await self.retrier.call("selector", attempt, retryable=is_transient)
+        except Exception:
+            el, sel = None, None
+        if cache:
+            cache.record(key, sel)
+        return el, sel
+
+    async def _probe_first(self, targets: list, selectors: list[str], state: str):
+        """全候補を並列に即時照会し、存在するもののうちリスト順で最優先のものを返す"""
+        pairs = [(sel, t) for sel in selectors for t in targets]
+        record("selector_attempts", len(pairs))
+
+        async def probe(t, sel):
+            try:
+                el = await t.query_selector(sel)
+                if el and state == "visible" and not await el.is_visible():
+                    return None
+                return el
+            except Exception:
+                return None
+
+        found = await asyncio.gather(*(probe(t, sel) for sel, t in pairs))
+        for (sel, _t), el in zip(pairs, found):
+            if el:
+                return el, sel
+        return None, None
+
+    async def _race_selectors(self, targets: list, selectors: list[str], budget_ms: int, state: str):
+        """即時照会で見つからなければ全候補の wait_for_selector を同時に走らせる
+
+        全候補が遷移などの一時的なエラーで終わった場合は、そのエラーを送出する（find_first が再試行する）。
+        """
+        el, sel = await self._probe_first(targets, selectors, state)
+        if el:
+            return el, sel
+
+        pairs = [(sel, t) for sel in selectors for t in targets]
+        if budget_ms <= 0 or not pairs:
+            return None, None
+
+        tasks = {
+            asyncio.ensure_future(t.wait_for_selector(sel, state=state, timeout=budget_ms)): i
+            for i, (sel, t) in enumerate(pairs)
+        }
+        pending = set(tasks)
+        transient = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [
+                    task for task in done
+                    if not task.cancelled() and task.exception() is None and task.result()
+                ]
+                if winners:
+                    best = min(winners, key=lambda task: tasks[task])
+                    return best.result(), pairs[tasks[best]][0]
+                for task in done:
+                    if not task.cancelled() and task.exception() and is_transient(task.exception()):
+                        transient = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        if transient:
+            raise transient
+        return None, None
+
+    async def click_element(self, element: ElementHandle) -> bool:
+        """要素をクリック
+
+        失敗したらバックオフして再試行し、試行ごとに 通常クリック → JavaScriptクリック → forceクリック と切り替える。
+        要素が DOM から外れた・ページが閉じたなど、やり直しても変わらない場合は即座に False。
+        """
+
+        async def attempt(attempt_number: int):
+            strategy = CLICK_STRATEGIES[min(attempt_number, len(CLICK_STRATEGIES)) - 1]
+            if strategy == "click":
+                await element.click(timeout=3000)
+            elif strategy == "js":
+                await element.evaluate("(el) => el.click()")
+            else:
+                await element.click(force=True, timeout=3000)
+
+        try:
+            await self.retrier.call("click", attempt, retryable=lambda e: not is_fatal(e))
+            return True
+        except Exception:
+            return False
+
+    async def save_screenshot(self, page: Page, filename: str, error: bool = False) -> Optional[bytes]:
+        """スクリーンショットを保存
+
+        撮影（ブラウザ側のPNGエンコード）だけを待ち、ファイル書き込みはスレッドプールで
+        バックグラウンド実行する。未完了の書き込みは stop() 時にまとめて待つ。
+        config.screenshot_mode で撮影範囲を切り替える:
+            off: 撮影しない / errors-only: error=True のときのみ全体 /
+            viewport: 表示領域のみ / full: ページ全体
+
+        Returns:
+            撮影したPNGのバイト列（撮影しなかった・失敗した場合は None）
+        """
+        mode = self.config.screenshot_mode
+        if mode == "off" or (mode == "errors-only" and not error):
+            return None
+
+        filepath = Path(self.config.screenshot_dir) / filename
+        started = time.perf_counter()
+        try:
+            data = await page.screenshot(full_page=(mode != "viewport"))
+        except Exception as e:
+            log.debug(f"⚠️  スクリーンショット失敗: {filename} ({e})")
+            return None
+        finally:
+            record("screenshots")
+            record("screenshot_ms", (time.perf_counter() - started) * 1000)
+
+        future = asyncio.get_running_loop().run_in_executor(None, self._write_file, filepath, data)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._pending_writes.discard)
+
+        log.debug(f"📸 スクリーンショット保存: {filepath}")
+        return data
+
+    @staticmethod
+    def _write_file(filepath: Path, data: bytes):
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_bytes(data)
+
+    async def flush_screenshots(self):
+        """バックグラウンドのスクリーンショット書き込みが終わるまで待つ"""
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
@@ -0,0 +1,72 @@
+"""常駐ブラウザ（ウォームスタート用）
+
+Chromium を --remote-debugging-port 付きで起動したまま待機する。
+起動中は状態ファイル（WARM_BROWSER_STATE_PATH。pid・port・headless）を書き、終了時に消す。
+WARM_BROWSER_ENABLED=true の BrowserHelper は起動時にこのファイルとポートを確認し、HEADLESS も一致すれば
+connect_over_cdp で接続して新しいコンテキストだけを作る（無ければ通常起動）。
+main.py や login.py を続けて何度も実行するデバッグ時に、毎回のChromium起動を省ける。
+
+使用例:
+    python -m src.browser_daemon              # 別ターミナルで常駐（Ctrl+Cで終了）
+    python -m src.browser_daemon --headless
+
+注意: デバッグポートは 127.0.0.1 のみで待ち受けるが、同じPC上の他のプロセスからは操作できる。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from .browser import LAUNCH_ARGS, is_port_open
+from .config import Settings
+
+
+async def serve(port: int, headless: bool, state_path: Path):
+    """ブラウザが閉じられるまで常駐する（その間だけ状態ファイルを置く）"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=LAUNCH_ARGS + [f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"],
+        )
+        print(f"♨️  常駐ブラウザ起動: 127.0.0.1:{port}（{'headless' if headless else 'headed'}）")
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(
+            json.dumps({"pid": os.getpid(), "port": port, "headless": headless}), encoding="utf-8"
+        )
+        print(f"   WARM_BROWSER_ENABLED=true の BrowserHelper が接続します（状態: {state_path}。Ctrl+Cで終了）")
+        try:
+            disconnected = asyncio.Event()
+            browser.on("disconnected", lambda _: disconnected.set())
+            await disconnected.wait()
+            print("🛑 常駐ブラウザが終了しました")
+        finally:
+            state_path.unlink(missing_ok=True)
+
+
+def main():
+    config = Settings()
+    parser = argparse.ArgumentParser(description="常駐ブラウザ（ウォームスタート用）")
+    parser.add_argument("--port", type=int, default=config.warm_browser_port, help="デバッグポート")
+    parser.add_argument(
+        "--state-path", type=Path, default=config.warm_browser_state_path, help="状態ファイル（pid・port・headless）"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--headless", dest="headless", action="store_true", default=config.headless, help="画面なしで起動")
+    mode.add_argument("--headed", dest="headless", action="store_false", help="画面ありで起動")
+    args = parser.parse_args()
+
+    if is_port_open("127.0.0.1", args.port):
+        print(f"⚠️ ポート {args.port} はすでに使用中です（常駐ブラウザが起動済みの可能性）")
+        return
+    try:
+        asyncio.run(serve(args.port, args.headless, args.state_path))
+    except KeyboardInterrupt:
+        print("\n🛑 常駐ブラウザ停止")
+
+
+if __name__ == "__main__":
+    main()
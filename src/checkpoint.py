@@ -0,0 +1,58 @@
+"""フローのチェックポイント
+
+ステップが完了するたびに「フロー:イベント」単位で完了したステップ名と URL を JSON に記録する。
+再実行時（または途中失敗のリトライ時）は BaseFlow.run_steps() がこれを読み、
+保存した URL を開いたうえで各ステップの前提条件を確かめ、到達済みの一番先のステップから再開する。
+フローが最後まで完了したら記録を消す。
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class Checkpoint:
+    """チェックポイント（JSONファイル）
+
+    Args:
+        path: 保存先のJSONファイル
+        max_age_seconds: 記録からこの秒数を過ぎたものは使わない（セッション切れ等で再開できないため）
+    """
+
+    def __init__(self, path: Path, max_age_seconds: int):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        try:
+            self._entries: dict[str, dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @classmethod
+    def from_settings(cls, config) -> "Checkpoint":
+        return cls(config.checkpoint_path, config.checkpoint_max_age_minutes * 60)
+
+    def load(self, key: str) -> Optional[dict]:
+        """{"step", "url", "saved"} を返す（無い・期限切れなら None）"""
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if time.time() - entry.get("saved", 0) > self.max_age_seconds:
+            self.clear(key)
+            return None
+        return entry
+
+    def save(self, key: str, step: str, url: str):
+        """完了したステップと、その時点の URL を記録"""
+        self._entries[key] = {"step": step, "url": url, "saved": time.time()}
+        self._write()
+
+    def clear(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            self._write()
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
@@ -1,6 +1,6 @@
 """設定管理モジュール"""
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,10 +14,20 @@ class Settings(BaseSettings):
         extra="ignore"
     )
     
+    # 接続先（ローカルのモックサーバーを使う場合は http://127.0.0.1:8765 など）
+    base_url: str = "https://eplus.jp"
+
     # e+ ログイン情報
     eplus_email: str = ""
     eplus_password: str = ""
     
+    # ログイン状態の再利用（storage_state を暗号化して保存し、有効な間はログイン操作を省略）
+    session_state_enabled: bool = True
+    session_state_path: Path = Path(".cache/session.enc")
+    session_key: str = ""  # 暗号化の鍵（空ならログイン情報から導出）
+    session_max_age_minutes: int = 720  # 保存からこの分数を過ぎたら破棄
+    session_probe_path: str = "/sf/mypage"  # ログイン確認に使うページ（未ログインならログイン画面へリダイレクトされる）
+    
     # チケット購入設定
     event_id: str = ""  # 例: 0424600001-P0030270
     
@@ -37,23 +47,79 @@ class Settings(BaseSettings):
     # 録画・マスキング設定
     video_enabled: bool = False  # ブラウザ操作の録画を有効化
     video_dir: Path = Path("videos")  # 録画ファイルの保存先
+    # 録画の保持: always（全部残す） / on-failure（失敗したステップの区間だけ切り出して残す） / last-n-minutes（最後のN分だけ）
+    video_retention: Literal["always", "on-failure", "last-n-minutes"] = "always"
+    video_last_minutes: int = 5
+    video_clip_padding_seconds: int = 3  # on-failure で切り出す区間の前後の余白
+    ffmpeg_path: str = "ffmpeg"  # 切り出しに使う ffmpeg（見つからなければ切り出さずに残す）
     mask_personal_info: bool = True  # 画面上の個人情報をマスク（CSS/MutationObserver）
     keep_open_minutes: int = 0  # フロー完了後の待機分数（0で待機なし＝完了後すぐブラウザ終了）
+    hold_after_login_minutes: int = 0  # login.py でログイン後にブラウザを開いておく分数（0で待機なし）
 
     # OpenAI API
     openai_api_key: str = ""
     
     # ブラウザ設定
     headless: bool = False
+    # 常駐ブラウザ（python -m src.browser_daemon）が起動していれば接続し、Chromiumの起動を省く（既定は無効）
+    warm_browser_enabled: bool = False
+    warm_browser_port: int = 9333
+    warm_browser_state_path: Path = Path(".cache/warm_browser.json")  # 常駐中に書く（pid・port・headless）
     timeout_ms: int = 30000
+    wait_timeout_ms: int = 10000  # wait_until（条件待機）の既定上限
     screenshot_dir: Path = Path("screenshots")
+    # スクリーンショット: off / errors-only（エラー時のみ） / viewport（表示領域） / full（ページ全体）
+    screenshot_mode: Literal["off", "errors-only", "viewport", "full"] = "full"
+    
+    # トレース（ステップごとの所要時間・セレクタ照会数などを JSONL で記録）
+    trace_log_enabled: bool = True
+    trace_dir: Path = Path("traces")
+    # Playwright トレース（スクリーンショット・DOMスナップショット付き zip。重いので調査時のみ）
+    trace_enabled: bool = False
+    # HAR の記録・再生（実サイトでの1回の実行を記録し、同じ応答でオフラインに何度でも再生する）
+    record_har: str = ""  # 記録先（例: "hars/first_come_{stamp}.har"。{stamp} は実行の日時）
+    replay_har: str = ""  # 再生する HAR（HAR に無いリクエストは遮断する）
+    har_url_filter: str = ""  # 記録・再生の対象URL（glob。空なら全リクエスト。対象外は通常どおり通信する）
+
+    # リクエスト遮断: off / lean（画像・動画・フォント・広告/解析ホスト） / strict（lean＋CSS・その他）
+    # 画像のボタンやレイアウトに依存するセレクタが壊れることがあるため、既定は遮断しない（off）
+    resource_profile: Literal["off", "lean", "strict"] = "off"
+    block_resource_types: str = ""  # 追加で遮断するリソース種別（カンマ区切り、例: "stylesheet,script"）
+    block_hosts: str = ""  # 追加で遮断するホスト（カンマ区切り、例: "ads.example.com,*.cdn.example.net"）
+    allow_hosts: str = ""  # 遮断しないホスト（種別・ホストの遮断より優先）
+    resource_sizes_path: Path = Path(".cache/resource_sizes.json")  # 遮断バイト数の推定に使う観測サイズ
+
+    # 静的ファイル（CSS/JS/フォント/画像）のディスクキャッシュ。実行をまたいで再利用する
+    asset_cache_enabled: bool = False
+    asset_cache_dir: Path = Path(".cache/assets")
+    asset_cache_max_mb: int = 200  # 合計サイズの上限（超えたら古い順に削除）
+
+    # セレクタ的中キャッシュ（前回ヒットした候補を次回最初に照会する）
+    selector_cache_enabled: bool = True
+    selector_cache_path: Path = Path(".cache/selectors.json")
+
+    # フローのチェックポイント（完了したステップとURLを記録し、再実行・リトライ時は到達済みのステップから再開）
+    checkpoint_enabled: bool = True
+    checkpoint_path: Path = Path(".cache/checkpoint.json")
+    checkpoint_max_age_minutes: int = 30
+    flow_step_retries: int = 1  # ステップ失敗時に現在地を判定し直して再開する回数
+
+    # 一時的な失敗（通信断・遷移中のコンテキスト破棄・クリック阻害など）の再試行（指数バックオフ＋ジッター）
+    retry_enabled: bool = True
+    retry_max_attempts: int = 0  # 遷移・クリック・セレクタ待機の最大試行回数（0なら操作ごとの既定値: 3）
+    retry_step_budget_ms: int = 15000  # 1ステップ内で再試行に使える合計時間
     
     # AI支援機能
     use_ai_selector: bool = True
     ai_model: str = "gpt-4o-mini"
     
     # デバッグ設定
-    debug: bool = True
+    debug: bool = True  # true なら DEBUG レベルのログも出す（LOG_LEVEL 未指定時）
+
+    # ログ（出力は別スレッドで行い、操作を待たせない）
+    log_level: Optional[Literal["DEBUG", "INFO", "WARNING", "ERROR"]] = None  # 未指定なら DEBUG=true で DEBUG、それ以外は INFO
+    log_quiet: bool = False  # true ならコンソールには警告・エラーのみ
+    log_json_path: str = ""  # 指定すると JSON Lines（ts, level, logger, flow, step, msg）でも書き出す
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -63,6 +129,16 @@ class Settings(BaseSettings):
         if self.video_enabled:
             Path(self.video_dir).mkdir(parents=True, exist_ok=True)
 
+    def eplus_url(self, path: str = "/") -> str:
+        """base_url を起点にした e+ のURLを組み立てる（例: "/sf/detail/xxx"）"""
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+
 
-# グローバル設定インスタンス
-settings = Settings()
+# グローバル設定インスタンス（`from src.config import settings` で初めて参照したときに作る。
+# import だけで .env の読み込みやディレクトリ作成が起きないようにするため）
+def __getattr__(name: str):
+    if name == "settings":
+        instance = Settings()
+        globals()["settings"] = instance  # 2回目以降は通常の属性として返る
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,21 +1,149 @@
 """ベースフロークラス"""
 
+import functools
+import inspect
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
 from playwright.async_api import Page
 
 from ..config import Settings
 from ..browser import BrowserHelper
+from ..checkpoint import Checkpoint
+from ..log import get_logger, log_context
+from ..retry import retry_budget
+from ..trace import record, span
+
+log = get_logger(__name__)
+
+
+def _traced(name: str, fn):
+    """コルーチンメソッドをスパンで囲む（戻り値 False は ok=False として記録）
+
+    実行中のログには flow（クラス名）と step（_step* のメソッド名）が付く。
+    """
+    cls_name, method = name.split(".", 1)
+    fields = {"flow": cls_name} if method == "execute" else {"flow": cls_name, "step": method.lstrip("_")}
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with log_context(**fields):
+            async with span(name) as sp:
+                result = await fn(*args, **kwargs)
+                if result is False:
+                    sp.set(ok=False)
+                return result
+
+    return wrapper
+
+
+@dataclass(frozen=True)
+class FlowStep:
+    """フローの1ステップ
+
+    Args:
+        name: チェックポイントに記録する名前
+        run: 実行するメソッド名（成功で True を返す）
+        ready: 「ページがこのステップを実行できる段階にあるか」を返すメソッド名。
+            再開・リトライ時に現在地の判定に使う。None は入口（常に実行可能）
+        retry: 失敗したときに現在地を判定し直してやり直すか。
+            待機の上限を使い切って失敗するステップ（発売待ちなど）は False にする
+    """
+
+    name: str
+    run: str
+    ready: Optional[str] = None
+    retry: bool = True
 
 
 class BaseFlow(ABC):
-    """すべてのフローの基底クラス"""
-    
+    """すべてのフローの基底クラス
+
+    サブクラスの execute() と _step* メソッドは自動的にトレースのスパンで囲まれる。
+    STEPS を宣言したフローは run_steps() で実行でき、チェックポイントからの再開と
+    失敗時のリトライ（現在地を判定し直して続きから）が使える。各ステップ内の遷移・クリックの
+    再試行時間は retry_step_budget_ms で制限される。
+    """
+
+    STEPS: tuple[FlowStep, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, fn in list(vars(cls).items()):
+            if (name == "execute" or name.startswith("_step")) and inspect.iscoroutinefunction(fn):
+                setattr(cls, name, _traced(f"{cls.__name__}.{name}", fn))
+
     def __init__(self, page: Page, helper: BrowserHelper, config: Settings):
         self.page = page
         self.helper = helper
         self.config = config
-    
+
     @abstractmethod
     async def execute(self):
         """フローの実行（サブクラスで実装）"""
         pass
+
+    def checkpoint_key(self) -> str:
+        """チェックポイントの単位（同じフローでも対象が違えば別に記録する。例: イベントID）"""
+        return ""
+
+    async def run_steps(self) -> bool:
+        """STEPS を順に実行（チェックポイントがあれば到達済みのステップから再開）"""
+        checkpoint = Checkpoint.from_settings(self.config) if self.config.checkpoint_enabled else None
+        key = f"{type(self).__name__}:{self.checkpoint_key()}"
+        index = 0
+        if checkpoint and (saved := checkpoint.load(key)):
+            index = await self._resume(saved)
+
+        retries = self.config.flow_step_retries
+        while index < len(self.STEPS):
+            step = self.STEPS[index]
+            with retry_budget(self.config.retry_step_budget_ms):
+                ok = await getattr(self, step.run)()
+            if ok:
+                if checkpoint:
+                    checkpoint.save(key, step.name, self.page.url)
+                index += 1
+                continue
+            if not step.retry or retries <= 0 or self.page.is_closed():
+                return False
+            retries -= 1
+            record("step_retries")
+            index = await self._locate(index)
+            log.info(f"🔁 ステップ「{step.name}」失敗 → 「{self.STEPS[index].name}」からやり直します")
+
+        if checkpoint:
+            checkpoint.clear(key)
+        return True
+
+    async def _resume(self, saved: dict) -> int:
+        """チェックポイントの URL を開き、再開するステップの番号を返す"""
+        names = [step.name for step in self.STEPS]
+        if saved.get("step") not in names:
+            return 0
+        upto = min(names.index(saved["step"]) + 1, len(self.STEPS) - 1)
+        url = saved.get("url") or ""
+        if url and self.page.url != url:
+            try:
+                await self.helper.goto(self.page, url, wait_until="domcontentloaded")
+            except Exception as e:
+                log.warning(f"⚠️  チェックポイントのページを開けません（最初から実行します）: {e}")
+                return 0
+        index = await self._locate(upto)
+        if index > 0:
+            record("checkpoint_resumes")
+            log.info(f"♻️  チェックポイントから再開: 「{self.STEPS[index].name}」（{url}）")
+        return index
+
+    async def _locate(self, upto: int) -> int:
+        """upto 以前で、前提条件を満たす一番先のステップ番号（どれも満たさなければ 0）"""
+        for index in range(upto, 0, -1):
+            ready = self.STEPS[index].ready
+            if ready is None:
+                return index
+            try:
+                if await getattr(self, ready)():
+                    return index
+            except Exception:
+                pass
+        return 0
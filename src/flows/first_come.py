@@ -1,10 +1,114 @@
 """先着チケット購入フロー"""
 import asyncio
-from playwright.async_api import Page
+from typing import Optional
+from playwright.async_api import ElementHandle, Page
 from ..browser import BrowserHelper
 from ..config import Settings
-from ..auto_login import auto_login
-from .base import BaseFlow
+from ..log import SECTION, get_logger
+from ..login_engine import LoginEngine
+from ..textmatch import EXACT, FUZZY, PARTIAL, Keyword, Keywords, as_keyword, compile_keyword, normalize
+from ..trace import span
+from .base import BaseFlow, FlowStep
+
+log = get_logger(__name__)
+
+
+RECEIVE_RADIO_NAME = "vuketoriHohoSentaku"
+PAY_RADIO_NAME = "vsiharaiHohoSentaku"
+
+# 指定nameのラジオ群を {name: [{index, id, value, checked, label}]} で返す
+RADIO_GROUPS_JS = """
+(names) => {
+  const labelOf = (el) => {
+    const byFor = el.id ? document.querySelector(`label[for="${el.id}"]`) : null;
+    if (byFor) return byFor.innerText;
+    const wrap = el.closest('label');
+    return wrap ? wrap.innerText : '';
+  };
+  const groups = {};
+  for (const name of names) {
+    const radios = document.querySelectorAll(`input[type='radio'][name='${name}']`);
+    groups[name] = [...radios].map((el, index) => ({
+      index, id: el.id, value: el.getAttribute('value'), checked: el.checked, label: labelOf(el) || '',
+    }));
+  }
+  return groups;
+}
+"""
+
+# ラジオ群の index 番目が checked で、取得時と同じ value のままか（描き直しで別のラジオに変わっていないか）
+RADIO_CHECKED_JS = """
+([name, index, value]) => {
+  const el = document.querySelectorAll(`input[type='radio'][name='${name}']`)[index];
+  return !!el && el.checked && el.getAttribute('value') === value;
+}
+"""
+
+# 「受付中」の枠内に表示中の「次へ」ボタンが現れたら、その要素で resolve する Promise
+# （読み込み済みのDOMを MutationObserver で監視するだけで、通信は発生しない。timeoutMs 経過で null）
+NEXT_BUTTON_OBSERVER_JS = """
+({ timeoutMs }) => new Promise((resolve) => {
+  const CONTAINER = '.eventlist__item, .item, article, section, li, div[class*="event"]';
+  const visible = (el) => !el.hidden && !el.disabled && el.getClientRects().length > 0
+    && getComputedStyle(el).visibility !== 'hidden';
+  const find = () => {
+    const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT, {
+      acceptNode: (n) => n.nodeValue.includes('受付中') ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP,
+    });
+    const hits = [];
+    while (walker.nextNode()) hits.push(walker.currentNode.parentElement);
+    // 最後（一番最近）の「受付中」を優先
+    for (const el of hits.reverse()) {
+      const box = el && el.closest(CONTAINER);
+      if (!box) continue;
+      const button = [...box.querySelectorAll('button, a, input[type="submit"]')]
+        .find((b) => (b.textContent || b.value || '').includes('次へ') && visible(b));
+      if (button) return button;
+    }
+    return null;
+  };
+
+  let done = false, scheduled = false, observer = null, fallback = null, timer = null;
+  const finish = (el) => {
+    if (done) return;
+    done = true;
+    if (observer) observer.disconnect();
+    clearInterval(fallback);
+    clearTimeout(timer);
+    resolve(el);
+  };
+  const check = () => {
+    scheduled = false;
+    const el = find();
+    if (el) finish(el);
+  };
+  check();
+  if (done) return;
+  // 同じタスク内の変更はまとめて1回だけ調べる
+  observer = new MutationObserver(() => {
+    if (!scheduled) { scheduled = true; queueMicrotask(check); }
+  });
+  observer.observe(document.documentElement, {
+    childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ['class', 'style', 'hidden', 'disabled'],
+  });
+  // CSS だけで表示が切り替わる場合の保険（ページ内のタイマーのみ）
+  fallback = setInterval(check, 1000);
+  if (timeoutMs > 0) timer = setTimeout(() => finish(null), timeoutMs);
+})
+"""
+
+
+# チケット選択ページ（公演日時・席種の <select> がある）か
+TICKET_PAGE_JS = """
+() => !!document.querySelector("select[name*='performance'], select[name*='seat'], #performanceSelect, #seatTypeSelect")
+  || [...document.querySelectorAll('tr th')].some((th) => /公演日時|席種/.test(th.textContent))
+"""
+
+
+# 受取方法の優先店舗（delivery_method にセブンの指定があればセブンを先に）
+FAMILYMART = compile_keyword("ファミリーマート")
+SEVEN_ELEVEN = compile_keyword("セブン-イレブン")
 
 
 class FirstComeFlow(BaseFlow):
@@ -18,260 +122,254 @@ class FirstComeFlow(BaseFlow):
     6. 支払方法・受取方法を選択
     """
     
+    # 実行順。ready は再開・リトライ時に「ページがこのステップの段階にあるか」を判定する
+    STEPS = (
+        FlowStep("event", "_step1_navigate_to_event"),  # ステップ1: イベント詳細ページへ移動（ログイン不要）
+        FlowStep("release", "_step2_wait_for_next_button", ready="_ready_release", retry=False),  # ステップ2: 「次へ」待機＆クリック（待機上限で失敗したらやり直さない）
+        FlowStep("tickets", "_step3_select_tickets", ready="_ready_tickets"),  # ステップ3: 公演日時・席種・枚数
+        FlowStep("login", "_step4_login", ready="_ready_login"),  # ステップ4: ログイン（チケット選択後に必要）
+        FlowStep("payment", "_step5_select_payment_delivery", ready="_ready_payment"),  # ステップ5: 支払・受取
+    )
+    
     def __init__(self, page: Page, helper: BrowserHelper, config: Settings):
         super().__init__(page, helper, config)
+        self.keywords = Keywords.from_settings(config)
+    
+    def checkpoint_key(self) -> str:
+        return self.config.event_id
         
     async def execute(self) -> bool:
         """フローを実行"""
         try:
-            print("=" * 60)
-            print("🎫 先着チケット購入フロー開始")
-            print("=" * 60)
+            log.info("=" * 60)
+            log.info("🎫 先着チケット購入フロー開始")
+            log.info("=" * 60)
             
-            # ステップ1: イベント詳細ページへ移動（ログイン不要）
-            if not await self._step1_navigate_to_event():
+            if not await self.run_steps():
                 return False
             
-            # ステップ2: 「次へ」ボタン待機＆クリック
-            if not await self._step2_wait_for_next_button():
-                return False
-            
-            # ステップ3: チケット選択（公演日時・席種・枚数）
-            if not await self._step3_select_tickets():
-                return False
-            
-            # ステップ4: ログイン（チケット選択後に必要）
-            if not await self._step4_login():
-                return False
-            
-            # ステップ5: 支払方法・受取方法選択
-            if not await self._step5_select_payment_delivery():
-                return False
-            
-            print("=" * 60)
-            print("✅ 先着チケット購入フロー完了")
-            print("=" * 60)
+            log.info("=" * 60)
+            log.info("✅ 先着チケット購入フロー完了")
+            log.info("=" * 60)
             return True
             
         except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            await self.helper.save_screenshot(self.page, "first_come_error.png")
+            log.error(f"❌ エラーが発生しました: {e}")
+            await self.helper.save_screenshot(self.page, "first_come_error.png", error=True)
             return False
     
+    async def _ready_release(self) -> bool:
+        return "/sf/detail/" in self.page.url
+
+    async def _ready_tickets(self) -> bool:
+        return await self.page.evaluate(TICKET_PAGE_JS)
+
+    async def _ready_login(self) -> bool:
+        field, _ = await self.helper.find_first(
+            list(self.page.frames), LoginEngine.PASSWORD_SELECTORS[:2], timeout=0, state="attached"
+        )
+        return field is not None
+
+    async def _ready_payment(self) -> bool:
+        return await self.page.evaluate(
+            "(names) => names.some((n) => document.querySelector(`input[name='${n}']`))",
+            [RECEIVE_RADIO_NAME, PAY_RADIO_NAME],
+        )
+
     async def _step1_navigate_to_event(self) -> bool:
         """ステップ1: イベント詳細ページへ移動"""
-        print("\n[ステップ1] イベント詳細ページへ移動")
-        print("-" * 60)
+        log.info("[ステップ1] イベント詳細ページへ移動", extra=SECTION)
+        log.info("-" * 60)
         
         try:
-            event_url = f"https://eplus.jp/sf/detail/{self.config.event_id}"
-            print(f"📍 イベントページに移動: {event_url}")
+            event_url = self.config.eplus_url(f"/sf/detail/{self.config.event_id}")
+            log.info(f"📍 イベントページに移動: {event_url}")
             
-            await self.page.goto(event_url, wait_until="domcontentloaded")
-            await self.helper.safe_wait(3000)
+            await self.helper.goto(self.page, event_url, wait_until="domcontentloaded")
+            await self.helper.wait_until(self.page, load_state="load", timeout=3000)
             await self.helper.save_screenshot(self.page, "step1_event_detail_page.png")
             
-            print(f"✅ ステップ1完了: イベントページ表示")
+            log.info(f"✅ ステップ1完了: イベントページ表示")
             return True
             
         except Exception as e:
-            print(f"❌ ステップ1でエラー: {e}")
-            await self.helper.save_screenshot(self.page, "step1_error.png")
+            log.error(f"❌ ステップ1でエラー: {e}")
+            await self.helper.save_screenshot(self.page, "step1_error.png", error=True)
             return False
     
     async def _step2_wait_for_next_button(self) -> bool:
         """ステップ2: 「次へ」ボタンが出現するまで待機してクリック"""
-        print("\n[ステップ2] 「次へ」ボタン待機")
-        print("-" * 60)
+        log.info("[ステップ2] 「次へ」ボタン待機", extra=SECTION)
+        log.info("-" * 60)
         
         try:
-            print("⏳ 発売時刻まで待機中...")
-            print("   （「受付中」の「次へ」ボタンが出現するまでポーリングします）")
+            log.info("⏳ 発売時刻まで待機中...")
+            log.info("   （「受付中」の「次へ」ボタンの出現をページ内で監視します）")
             
             max_wait_time = 3600  # 最大1時間待機
-            check_interval = 2  # 2秒ごとにチェック
-            elapsed_time = 0
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_wait_time
             
-            while elapsed_time < max_wait_time:
-                try:
-                    # ページ全体から「受付中」のテキストを探す
-                    accepting_elements = await self.page.query_selector_all("text=/受付中/")
-                    
-                    if accepting_elements:
-                        print(f"✅ 「受付中」要素を発見: {len(accepting_elements)}個")
-                        
-                        # 最後（一番最近）の「受付中」要素を取得
-                        target_element = accepting_elements[-1]
-                        
-                        # その近くにある「次へ」ボタンを探す
-                        # 親要素を遡って「次へ」ボタンを探す
-                        parent = await target_element.evaluate_handle("el => el.closest('.eventlist__item, .item, article, section, li, div[class*=\"event\"]')")
-                        
-                        if parent:
-                            # 親要素内の「次へ」ボタンを探す
-                            next_button_selectors = [
-                                "button:has-text('次へ')",
-                                "a:has-text('次へ')",
-                                "button.button--primary:has-text('次へ')",
-                                "button[type='submit']:has-text('次へ')",
-                            ]
-                            
-                            for selector in next_button_selectors:
-                                try:
-                                    button = await parent.query_selector(selector)
-                                    if button and await button.is_visible():
-                                        print(f"✅ 「受付中」に対応する「次へ」ボタンを発見")
-                                        print("🖱️  ボタンをクリックします...")
-                                        
-                                        # クリック試行
-                                        await self.helper.safe_wait(500)
-                                        
-                                        # 複数の方法でクリック
-                                        try:
-                                            await button.click(timeout=3000)
-                                            click_success = True
-                                        except:
-                                            try:
-                                                await self.page.evaluate("(el) => el.click()", button)
-                                                click_success = True
-                                            except:
-                                                try:
-                                                    await button.click(force=True, timeout=3000)
-                                                    click_success = True
-                                                except:
-                                                    click_success = False
-                                        
-                                        if click_success:
-                                            print("✅ ステップ2完了: 「次へ」ボタンクリック成功")
-                                            await self.helper.safe_wait(3000)
-                                            await self.helper.save_screenshot(self.page, "step2_after_next_button.png")
-                                            return True
-                                except:
-                                    continue
-                    
-                    # 進捗表示
-                    if elapsed_time % 60 == 0:  # 1分ごとに表示
-                        print(f"   待機中... ({elapsed_time // 60}分経過)")
-                    
-                except Exception as check_error:
-                    # チェック中のエラーは無視して次の試行へ
-                    pass
+            while True:
+                button = await self._wait_for_next_button(deadline)
+                if not button:
+                    break
+                log.info(f"✅ 「受付中」に対応する「次へ」ボタンを発見")
+                log.info("🖱️  ボタンをクリックします...")
                 
-                await asyncio.sleep(check_interval)
-                elapsed_time += check_interval
-            
-            print(f"⚠️  タイムアウト: {max_wait_time}秒経過しても「受付中」の「次へ」ボタンが見つかりませんでした")
-            await self.helper.save_screenshot(self.page, "step2_timeout.png")
+                before_url = self.page.url
+                if await self.helper.click_element(button):
+                    log.info("✅ ステップ2完了: 「次へ」ボタンクリック成功")
+                    await self.helper.wait_until(
+                        self.page, url_change=before_url, load_state="domcontentloaded", timeout=3000
+                    )
+                    await self.helper.save_screenshot(self.page, "step2_after_next_button.png")
+                    return True
+                # クリックできなければ少し待って探し直す
+                await asyncio.sleep(1)
+            
+            log.warning(f"⚠️  タイムアウト: {max_wait_time}秒経過しても「受付中」の「次へ」ボタンが見つかりませんでした")
+            await self.helper.save_screenshot(self.page, "step2_timeout.png", error=True)
             return False
             
         except Exception as e:
-            print(f"❌ ステップ2でエラー: {e}")
-            await self.helper.save_screenshot(self.page, "step2_error.png")
+            log.error(f"❌ ステップ2でエラー: {e}")
+            await self.helper.save_screenshot(self.page, "step2_error.png", error=True)
             return False
     
+    async def _wait_for_next_button(self, deadline: float) -> Optional[ElementHandle]:
+        """「受付中」の「次へ」ボタンが出現するまで待つ（deadline は loop.time() 基準、超過で None）
+
+        ページ内の MutationObserver が見つけた時点で1回だけ応答が返る。
+        待機中に再読み込み・遷移で実行コンテキストが破棄された場合は、読み込み後に監視を入れ直す。
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            left = deadline - loop.time()
+            if left <= 0 or self.page.is_closed():
+                return None
+            watch = asyncio.ensure_future(
+                self.page.evaluate_handle(NEXT_BUTTON_OBSERVER_JS, {"timeoutMs": int(left * 1000)})
+            )
+            minutes = 0
+            # 応答待ちの間も1分ごとに経過を表示（ブラウザとの通信は発生しない）
+            while not (await asyncio.wait({watch}, timeout=60))[0]:
+                minutes += 1
+                log.info(f"   待機中... ({minutes}分経過)")
+            try:
+                handle = watch.result()
+            except Exception:
+                if self.page.is_closed():
+                    return None
+                await self.helper.wait_until(self.page, load_state="domcontentloaded")
+                await asyncio.sleep(0.1)
+                continue
+            element = handle.as_element()
+            if element:
+                return element
+            await handle.dispose()
+
     async def _step3_select_tickets(self) -> bool:
         """ステップ3: チケット選択（公演日時・席種・枚数）"""
-        print("\n[ステップ3] チケット選択")
-        print("-" * 60)
+        log.info("[ステップ3] チケット選択", extra=SECTION)
+        log.info("-" * 60)
         
         try:
             await self.helper.save_screenshot(self.page, "step3_before_ticket_selection.png")
             
             # 公演日時の選択（テーブル行の見出しベースで検出）
-            print("📅 公演日時を選択中...")
+            log.info("📅 公演日時を選択中...")
             if self.config.performance_keyword:
-                print(f"   キーワード: '{self.config.performance_keyword}'")
+                log.info(f"   キーワード: '{self.config.performance_keyword}'")
             performance_selected = False
             # まずは見出し『公演日時』行の<select>を探す
-            perf_select = await self.page.query_selector("xpath=//tr[.//th[contains(normalize-space(),'公演日時')]]//select")
-            # 見つからなければフォールバックの汎用セレクタ
-            if not perf_select:
-                for selector in [
+            perf_select, _ = await self.helper.find_first(
+                self.page,
+                [
+                    "xpath=//tr[.//th[contains(normalize-space(),'公演日時')]]//select",
                     "select[name*='performance']",
                     "select[name*='schedule']",
                     "select[name*='date']",
                     "#performanceSelect",
-                    ".performance-select select"
-                ]:
-                    try:
-                        el = await self.page.query_selector(selector)
-                        if el:
-                            perf_select = el
-                            break
-                    except:
-                        pass
+                    ".performance-select select",
+                ],
+                timeout=0,
+                state="attached",
+                cache_key="first_come.step3.performance",
+            )
             if perf_select:
-                performance_selected = await self._select_option_by_keyword_or_index(
-                    perf_select,
-                    keyword=self.config.performance_keyword,
-                    index=self.config.performance_index,
-                    skip_placeholder_auto=True
-                )
+                async with span("step3.select_performance"):
+                    performance_selected = await self._select_option_by_keyword_or_index(
+                        perf_select,
+                        keyword=self.keywords.performance,
+                        index=self.config.performance_index,
+                        skip_placeholder_auto=True
+                    )
             if not performance_selected:
-                print("⚠️  公演日時の選択をスキップ（選択肢なし/要素未検出）")
+                log.warning("⚠️  公演日時の選択をスキップ（選択肢なし/要素未検出）")
             
             # 席種の選択（見出し『席種』行の<select>）
-            print("🎭 席種を選択中...")
+            log.info("🎭 席種を選択中...")
+            await self._wait_select_ready("席種")
             if self.config.seat_type_keyword:
-                print(f"   キーワード: '{self.config.seat_type_keyword}'")
+                log.info(f"   キーワード: '{self.config.seat_type_keyword}'")
             seat_selected = False
-            seat_select = await self.page.query_selector("xpath=//tr[.//th[contains(normalize-space(),'席種')]]//select")
-            if not seat_select:
-                for selector in [
+            seat_select, _ = await self.helper.find_first(
+                self.page,
+                [
+                    "xpath=//tr[.//th[contains(normalize-space(),'席種')]]//select",
                     "select[name*='seat']",
                     "select[name*='ticket']",
                     "#seatTypeSelect",
-                    ".seat-select select"
-                ]:
-                    try:
-                        el = await self.page.query_selector(selector)
-                        if el:
-                            seat_select = el
-                            break
-                    except:
-                        pass
+                    ".seat-select select",
+                ],
+                timeout=0,
+                state="attached",
+                cache_key="first_come.step3.seat_type",
+            )
             if seat_select:
-                seat_selected = await self._select_option_by_keyword_or_index(
-                    seat_select,
-                    keyword=self.config.seat_type_keyword,
-                    index=self.config.seat_type_index,
-                    skip_placeholder_auto=True
-                )
+                async with span("step3.select_seat_type"):
+                    seat_selected = await self._select_option_by_keyword_or_index(
+                        seat_select,
+                        keyword=self.keywords.seat_type,
+                        index=self.config.seat_type_index,
+                        skip_placeholder_auto=True
+                    )
             if not seat_selected:
-                print("⚠️  席種の選択をスキップ（選択肢なし/要素未検出）")
+                log.warning("⚠️  席種の選択をスキップ（選択肢なし/要素未検出）")
             
             # 枚数の選択（見出し『枚数』行の<select>）
-            print(f"🎟️  枚数を選択中: {self.config.ticket_count}枚")
+            log.info(f"🎟️  枚数を選択中: {self.config.ticket_count}枚")
+            await self._wait_select_ready("枚数")
             count_selected = False
-            count_select = await self.page.query_selector("xpath=//tr[.//th[contains(normalize-space(),'枚数')]]//select")
-            if not count_select:
-                for selector in [
+            count_select, _ = await self.helper.find_first(
+                self.page,
+                [
+                    "xpath=//tr[.//th[contains(normalize-space(),'枚数')]]//select",
                     "select[name*='count']",
                     "select[name*='quantity']",
                     "select[name*='num']",
                     "#ticketCountSelect",
-                    ".count-select select"
-                ]:
-                    try:
-                        el = await self.page.query_selector(selector)
-                        if el:
-                            count_select = el
-                            break
-                    except:
-                        pass
+                    ".count-select select",
+                ],
+                timeout=0,
+                state="attached",
+                cache_key="first_come.step3.count",
+            )
             if count_select:
-                count_selected = await self._select_option_by_keyword_or_index(
-                    count_select,
-                    count=self.config.ticket_count,
-                    skip_placeholder_auto=True
-                )
+                async with span("step3.select_count"):
+                    count_selected = await self._select_option_by_keyword_or_index(
+                        count_select,
+                        count=self.config.ticket_count,
+                        skip_placeholder_auto=True
+                    )
             if not count_selected:
-                print("⚠️  枚数の選択をスキップ（選択肢なし/要素未検出）")
+                log.warning("⚠️  枚数の選択をスキップ（選択肢なし/要素未検出）")
             
             await self.helper.save_screenshot(self.page, "step3_after_ticket_selection.png")
             
             # 「ログイン」ボタンをクリック
-            print("🔐 ログインボタンを探しています...")
+            log.info("🔐 ログインボタンを探しています...")
             login_button_selectors = [
                 "button:has-text('ログイン')",
                 "a:has-text('ログイン')",
@@ -280,396 +378,212 @@ class FirstComeFlow(BaseFlow):
             ]
             
             login_clicked = False
-            for selector in login_button_selectors:
-                if await self._safe_click(selector):
-                    print("✅ ログインボタンクリック成功")
-                    login_clicked = True
-                    await self.helper.safe_wait(2000)
-                    break
+            before_url = self.page.url
+            if await self._safe_click(login_button_selectors, cache_key="first_come.step3.login"):
+                log.info("✅ ログインボタンクリック成功")
+                login_clicked = True
+                # ログインフォーム（iframe含む）の読み込み完了まで待つ
+                await self.helper.wait_until(self.page, url_change=before_url, load_state="load", timeout=2000)
             
             if not login_clicked:
-                print("⚠️  ログインボタンが見つかりません")
-                await self.helper.save_screenshot(self.page, "step3_login_button_not_found.png")
+                log.warning("⚠️  ログインボタンが見つかりません")
+                await self.helper.save_screenshot(self.page, "step3_login_button_not_found.png", error=True)
                 return False
             
-            print("✅ ステップ3完了: チケット選択完了")
+            log.info("✅ ステップ3完了: チケット選択完了")
             return True
             
         except Exception as e:
-            print(f"❌ ステップ3でエラー: {e}")
-            await self.helper.save_screenshot(self.page, "step3_error.png")
+            log.error(f"❌ ステップ3でエラー: {e}")
+            await self.helper.save_screenshot(self.page, "step3_error.png", error=True)
             return False
     
+    async def _wait_select_ready(self, heading: str, timeout: int = 500) -> bool:
+        """見出し行の<select>に選択肢が揃うまで待機（前の選択で動的に更新される場合に備える）"""
+        return await self.helper.wait_until(
+            self.page,
+            """(heading) => {
+                const rows = [...document.querySelectorAll('tr')].filter(
+                    (tr) => [...tr.querySelectorAll('th')].some((th) => th.textContent.includes(heading))
+                );
+                const select = rows.length ? rows[0].querySelector('select') : null;
+                return !select || (!select.disabled && select.options.length > 1);
+            }""",
+            arg=heading,
+            timeout=timeout,
+        )
+
     async def _select_option_by_keyword_or_index(
         self,
         select_el,
-        keyword: str | None = None,
+        keyword: Keyword | str | None = None,
         index: int | None = None,
         count: int | None = None,
         skip_placeholder_auto: bool = True,
     ) -> bool:
         """<select>の<option>を選択するユーティリティ。
-        優先度: keyword（完全/部分一致）→ count（『n枚』/ value末尾 '/n'）→ index（先頭プレースホルダを自動スキップ）
+        優先度: keyword（完全一致→部分一致→語・日付の一致）→ count（『n枚』/ value末尾 '/n'）→ index（先頭プレースホルダを自動スキップ）
+
+        全optionの文言と値は1回の evaluate でまとめて取得し、判定はPython側で行う。
         """
         try:
-            options = await select_el.query_selector_all("option")
-            if not options:
+            options = await select_el.evaluate(
+                "(sel) => [...sel.options].map((o) => ({text: o.textContent, value: o.getAttribute('value')}))"
+            )
+            choice = self._choose_option(
+                options,
+                keyword=keyword,
+                index=index,
+                count=count,
+                skip_placeholder_auto=skip_placeholder_auto,
+            )
+            if not choice:
                 return False
 
-            import unicodedata
-            def _normalize(text: str) -> str:
-                # 全角→半角、NBSP除去、前後空白除去、lower
-                t = unicodedata.normalize('NFKC', (text or "")).replace("\xa0", " ").replace("\u3000", " ").strip()
-                return t.lower()
-
-            # 1) keyword での選択（公演日時/席種）
-            if keyword:
-                kw = _normalize(keyword)
-                for opt in options:
-                    text = _normalize(await opt.inner_text())
-                    if kw in text:
-                        value = await opt.get_attribute("value")
-                        if value is not None:
-                            await select_el.select_option(value=value)
-                            print(f"   → 選択: '{text}' (value='{value}')")
-                            await self.helper.safe_wait(500)
-                            return True
-
-            # 2) 枚数の選択（ラベル 'n枚' or value 末尾 '/n'）
-            if count is not None:
-                for opt in options:
-                    text = _normalize(await opt.inner_text())
-                    value = await opt.get_attribute("value") or ""
-                    if f"{count}枚" in text or value.endswith(f"/{count}"):
-                        await select_el.select_option(value=value)
-                        print(f"   → 枚数選択: '{text}' (value='{value}')")
-                        await self.helper.safe_wait(500)
-                        return True
-
-            # 3) インデックスでのフォールバック
-            if index is not None:
-                target_index = index
-                if skip_placeholder_auto and len(options) >= 2:
-                    # 先頭がプレースホルダ（空value or 『選択して下さい』）なら+1
-                    first_text = _normalize(await options[0].inner_text())
-                    first_val = await options[0].get_attribute("value") or ""
-                    if first_val == "" or "選択して下さい" in first_text:
-                        target_index = index + 1
-                if 0 <= target_index < len(options):
-                    value = await options[target_index].get_attribute("value")
-                    text = _normalize(await options[target_index].inner_text())
-                    if value is not None:
-                        await select_el.select_option(value=value)
-                        print(f"   → フォールバック選択: '{text}' (index={target_index}, value='{value}')")
-                        await self.helper.safe_wait(500)
-                        return True
-
-            return False
+            label, text, value, target_index = choice
+            await select_el.select_option(value=value)
+            if label in (EXACT, PARTIAL, FUZZY):
+                log.info(f"   → 選択（{label}）: '{text}' (value='{value}')")
+            elif label == "count":
+                log.info(f"   → 枚数選択: '{text}' (value='{value}')")
+            else:
+                log.info(f"   → フォールバック選択: '{text}' (index={target_index}, value='{value}')")
+            return True
 
         except Exception as e:
             return False
 
+    @staticmethod
+    def _choose_option(
+        options: list[dict],
+        keyword: Keyword | str | None = None,
+        index: int | None = None,
+        count: int | None = None,
+        skip_placeholder_auto: bool = True,
+    ) -> tuple[str, str, str, int] | None:
+        """option一覧（{text, value}）から選ぶべきものを決める
+
+        Returns:
+            (判定種別（exact/partial/fuzzy/count/index）, 正規化済み文言, value, インデックス)。該当なしは None
+        """
+        if not options:
+            return None
+
+        values = [opt.get("value") for opt in options]
+
+        # 1) keyword での選択（公演日時/席種）。value の無い option は対象外
+        keyword = as_keyword(keyword)
+        if keyword:
+            match = keyword.best([opt.get("text") for opt in options], lambda i: values[i] is not None)
+            if match:
+                return match.tier, match.text, values[match.index], match.index
+
+        texts = [normalize(opt.get("text")) for opt in options]
+
+        # 2) 枚数の選択（ラベル 'n枚' or value 末尾 '/n'）
+        if count is not None:
+            for i, text in enumerate(texts):
+                value = values[i] or ""
+                if f"{count}枚" in text or value.endswith(f"/{count}"):
+                    return "count", text, value, i
+
+        # 3) インデックスでのフォールバック
+        if index is not None:
+            target_index = index
+            if skip_placeholder_auto and len(options) >= 2:
+                # 先頭がプレースホルダ（空value or 『選択して下さい』）なら+1
+                if (values[0] or "") == "" or "選択して下さい" in texts[0]:
+                    target_index = index + 1
+            if 0 <= target_index < len(options) and values[target_index] is not None:
+                return "index", texts[target_index], values[target_index], target_index
+
+        return None
+
     async def _step4_login(self) -> bool:
-        """ステップ4: ログイン（チケット選択後）"""
-        print("\n[ステップ4] ログイン")
-        print("-" * 60)
+        """ステップ4: ログイン（チケット選択後。iframe内のフォームにも対応）"""
+        log.info("[ステップ4] ログイン", extra=SECTION)
+        log.info("-" * 60)
         
         try:
-            await self.helper.save_screenshot(self.page, "step4_before_login.png")
-
-            # 対象フレーム群（ページ本体＋全iframe）で探索
-            frames = [self.page, *self.page.frames]
-
-            # メール/パスワード入力
-            print("📧 メールアドレスとパスワードを入力中...")
-            email_filled = False
-            password_filled = False
-            target_frame = None
-
-            email_selectors = [
-                "input[name='login_id']",
-                "input[type='email']",
-                "input[name='email']",
-                "#login_id",
-                "input[autocomplete='username']",
-                "input[placeholder*='メール']",
-                "input[placeholder*='email' i]",
-                "input[name*='id']"
-            ]
-            password_selectors = [
-                "input[name='login_pw']",
-                "input[type='password']",
-                "input[name='password']",
-                "#login_pw",
-                "input[autocomplete='current-password']",
-                "input[placeholder*='パスワード']"
-            ]
-
-            for fr in frames:
-                try:
-                    # Email
-                    for sel in email_selectors:
-                        el = await fr.query_selector(sel)
-                        if el:
-                            await el.fill(self.config.eplus_email)
-                            email_filled = True
-                            target_frame = fr
-                            print("✅ メールアドレス入力完了")
-                            break
-                    # Password（同じフレームで探す）
-                    if email_filled:
-                        for sel in password_selectors:
-                            el = await fr.query_selector(sel)
-                            if el:
-                                await el.fill(self.config.eplus_password)
-                                password_filled = True
-                                print("✅ パスワード入力完了")
-                                break
-                    if email_filled and password_filled:
-                        break
-                except:
-                    continue
-
-            if not email_filled:
-                print("❌ メールアドレス入力欄が見つかりません")
-                return False
-            if not password_filled:
-                print("❌ パスワード入力欄が見つかりません")
-                return False
-
-            await self.helper.safe_wait(500)
-
-            # ログインボタンクリック（見つけたフレーム内を優先）
-            print("🖱️  ログインボタンをクリック中...")
-            login_button_selectors = [
-                "button.button--primary.button--block:has-text('ログイン')",
-                "button:has-text('ログイン')",
-                "button[type='submit']",
-                "input[type='submit']",
-                "a:has-text('ログイン')"
-            ]
-            click_success = False
-            search_frames = [target_frame] if target_frame else frames
-            for fr in search_frames:
-                for sel in login_button_selectors:
-                    try:
-                        btn = await fr.query_selector(sel)
-                        if not btn:
-                            continue
-                        try:
-                            await btn.click(timeout=3000)
-                            click_success = True
-                        except:
-                            try:
-                                await fr.evaluate("(el) => el.click()", btn)
-                                click_success = True
-                            except:
-                                try:
-                                    await btn.click(force=True, timeout=3000)
-                                    click_success = True
-                                except:
-                                    pass
-                        if click_success:
-                            break
-                    except:
-                        continue
-                if click_success:
-                    break
-
-            if not click_success:
-                print("❌ ログインボタンのクリックに失敗しました")
-                return False
-
-            await self.helper.safe_wait(3000)
-            await self.helper.save_screenshot(self.page, "step4_after_login.png")
-            print("✅ ステップ4完了: ログイン成功")
-            return True
+            engine = LoginEngine(self.page, self.helper, self.config, screenshot_prefix="step4_login")
+            result = await engine.login()
+            if result.skipped:
+                log.info("✅ ステップ4省略: ログイン済み")
+            elif result.success:
+                log.info("✅ ステップ4完了: ログイン成功")
+            return result.success
             
         except Exception as e:
-            print(f"❌ ステップ4でエラー: {e}")
-            await self.helper.save_screenshot(self.page, "step4_error.png")
+            log.error(f"❌ ステップ4でエラー: {e}")
+            await self.helper.save_screenshot(self.page, "step4_error.png", error=True)
             return False
     
     async def _step5_select_payment_delivery(self) -> bool:
         """ステップ5: 支払方法・受取方法選択"""
-        print("\n[ステップ5] 支払方法・受取方法選択")
-        print("-" * 60)
+        log.info("[ステップ5] 支払方法・受取方法選択", extra=SECTION)
+        log.info("-" * 60)
         
         try:
             await self.helper.save_screenshot(self.page, "step5_before_payment_delivery.png")
-            
-            import unicodedata
-            def _normalize(text: str) -> str:
-                t = unicodedata.normalize('NFKC', (text or "")).replace("\xa0", " ").replace("\u3000", " ").strip()
-                return t.lower()
 
             # 受取方法（コンビニ）: ラジオ name="vuketoriHohoSentaku" を優先的に選択
             # 優先順: ファミリーマート -> セブン-イレブン（configにキーワードがあれば尊重）
-            print("📦 受取方法を選択中（コンビニ優先）...")
+            log.info("📦 受取方法を選択中（コンビニ優先）...")
             receive_selected = False
-            preferred_receive = []
-            dm_norm = _normalize(self.config.delivery_method)
-            if 'ファミ' in dm_norm or 'family' in dm_norm:
-                preferred_receive = ['ファミリーマート', 'セブン-イレブン']
-            elif 'セブン' in dm_norm or 'seven' in dm_norm:
-                preferred_receive = ['セブン-イレブン', 'ファミリーマート']
+            receive_candidates = await self._radio_group(RECEIVE_RADIO_NAME)
+            chosen_receive = None
+            if receive_candidates:
+                chosen_receive, reason = self._choose_receive(receive_candidates, self.keywords.delivery_method)
+                if await self._click_radio(RECEIVE_RADIO_NAME, chosen_receive):
+                    receive_selected = True
+                    label = chosen_receive["label"].strip()
+                    if reason:
+                        log.info(f"✅ 受取方法: '{reason}' を選択（label='{label}')")
+                    else:
+                        log.warning(f"⚠️  受取方法: 既定の先頭を選択（label='{label}')")
             else:
-                preferred_receive = ['ファミリーマート', 'セブン-イレブン']
-
-            try:
-                receive_radios = await self.page.query_selector_all("input[type='radio'][name='vuketoriHohoSentaku']")
-                if receive_radios:
-                    # それぞれのラジオに対応するラベル文言を取得
-                    candidates = []
-                    for el in receive_radios:
-                        try:
-                            label_text = await self.page.evaluate("(el) => { const id=el.id; const byFor=id?document.querySelector(`label[for=\"${id}\"]`):null; if(byFor){return byFor.innerText;} const wrap=el.closest('label'); return wrap?wrap.innerText:''; }", el)
-                        except:
-                            label_text = ""
-                        candidates.append((el, label_text or ""))
-
-                    # 優先順でマッチ
-                    for pref in preferred_receive:
-                        pref_n = _normalize(pref)
-                        for el, label in candidates:
-                            if pref_n in _normalize(label):
-                                try:
-                                    await el.click()
-                                except:
-                                    try:
-                                        await self.page.evaluate("(el)=>el.click()", el)
-                                    except:
-                                        await el.click(force=True)
-                                receive_selected = True
-                                print(f"✅ 受取方法: '{pref}' を選択（label='{label.strip()}')")
-                                await self.helper.safe_wait(800)
-                                break
-                        if receive_selected:
-                            break
-
-                    # どれも一致しなければ最初の選択肢
-                    if not receive_selected and candidates:
-                        try:
-                            await candidates[0][0].click()
-                            receive_selected = True
-                            print(f"⚠️  受取方法: 既定の先頭を選択（label='{(candidates[0][1] or '').strip()}')")
-                            await self.helper.safe_wait(800)
-                        except:
-                            pass
-                else:
-                    print("⚠️  受取方法のラジオが見つかりませんでした（name='vuketoriHohoSentaku'）")
-            except Exception as _:
-                print("⚠️  受取方法の選択時に一時的なエラー")
+                log.warning(f"⚠️  受取方法のラジオが見つかりませんでした（name='{RECEIVE_RADIO_NAME}'）")
 
             if not receive_selected:
-                print("⚠️  受取方法の選択をスキップ（要素未検出）")
+                log.warning("⚠️  受取方法の選択をスキップ（要素未検出）")
 
             # 支払方法（コンビニ/ATM）: ラジオ name="vsiharaiHohoSentaku"
             # 優先は『コンビニ／ＡＴＭ』『ファミリーマート』『セブン-イレブン』等を含むもの（value=3 が目安）
-            print("💳 支払方法を選択中（コンビニ優先）...")
+            log.info("💳 支払方法を選択中（コンビニ優先）...")
             pay_selected = False
 
             # 受取方法で選んだ店舗名（あれば揃える）
             chosen_store = None
-            try:
-                if receive_selected:
-                    # 直近でcheckedになっている受取ラジオのラベルから推定
-                    checked_receive = await self.page.query_selector("input[type='radio'][name='vuketoriHohoSentaku']:checked")
-                    if checked_receive:
-                        label_text = await self.page.evaluate("(el) => { const id=el.id; const byFor=id?document.querySelector(`label[for=\"${id}\"]`):null; if(byFor){return byFor.innerText;} const wrap=el.closest('label'); return wrap?wrap.innerText:''; }", checked_receive)
-                        lt = _normalize(label_text or "")
-                        if 'ファミ' in lt or 'family' in lt:
-                            chosen_store = 'ファミリーマート'
-                        elif 'セブン' in lt or 'seven' in lt:
-                            chosen_store = 'セブン-イレブン'
-            except:
-                pass
-
-            try:
-                pay_radios = await self.page.query_selector_all("input[type='radio'][name='vsiharaiHohoSentaku']")
-                if pay_radios:
-                    candidates = []
-                    for el in pay_radios:
-                        try:
-                            value = await el.get_attribute('value')
-                        except:
-                            value = None
-                        try:
-                            label_text = await self.page.evaluate("(el) => { const id=el.id; const byFor=id?document.querySelector(`label[for=\"${id}\"]`):null; if(byFor){return byFor.innerText;} const wrap=el.closest('label'); return wrap?wrap.innerText:''; }", el)
-                        except:
-                            label_text = ""
-                        candidates.append((el, value, label_text or ""))
-
-                    # 1) value=3（コンビニ/ATM）を最優先
-                    for el, value, label in candidates:
-                        if (value or "").strip() == '3':
-                            try:
-                                await el.click()
-                            except:
-                                try:
-                                    await self.page.evaluate("(el)=>el.click()", el)
-                                except:
-                                    await el.click(force=True)
-                            pay_selected = True
-                            print(f"✅ 支払方法: コンビニ/ATM を選択（label='{label.strip()}')")
-                            await self.helper.safe_wait(800)
-                            break
-
-                    # 2) ラベル一致（店舗名が表示されている場合、受取と合わせる）
-                    if not pay_selected and chosen_store:
-                        for el, _value, label in candidates:
-                            if _normalize(chosen_store) in _normalize(label):
-                                try:
-                                    await el.click()
-                                except:
-                                    try:
-                                        await self.page.evaluate("(el)=>el.click()", el)
-                                    except:
-                                        await el.click(force=True)
-                                pay_selected = True
-                                print(f"✅ 支払方法: '{chosen_store}' を選択（label='{label.strip()}')")
-                                await self.helper.safe_wait(800)
-                                break
-
-                    # 3) クレジットカード指定がconfigにあれば最後に尊重
-                    if not pay_selected and 'クレジット' in _normalize(self.config.payment_method):
-                        for el, value, label in candidates:
-                            if (value or "").strip() == '1' or 'クレジット' in _normalize(label):
-                                try:
-                                    await el.click()
-                                except:
-                                    try:
-                                        await self.page.evaluate("(el)=>el.click()", el)
-                                    except:
-                                        await el.click(force=True)
-                                pay_selected = True
-                                print(f"✅ 支払方法: クレジットカードを選択（label='{label.strip()}')")
-                                await self.helper.safe_wait(800)
-                                break
-
-                    # 4) どれも無ければ先頭
-                    if not pay_selected and candidates:
-                        try:
-                            await candidates[0][0].click()
-                            pay_selected = True
-                            print(f"⚠️  支払方法: 既定の先頭を選択（label='{(candidates[0][2] or '').strip()}')")
-                            await self.helper.safe_wait(800)
-                        except:
-                            pass
-                else:
-                    print("⚠️  支払方法のラジオが見つかりませんでした（name='vsiharaiHohoSentaku'）")
-            except Exception as _:
-                print("⚠️  支払方法の選択時に一時的なエラー")
+            if receive_selected:
+                lt = normalize(chosen_receive["label"])
+                if 'ファミ' in lt or 'family' in lt:
+                    chosen_store = 'ファミリーマート'
+                elif 'セブン' in lt or 'seven' in lt:
+                    chosen_store = 'セブン-イレブン'
+
+            # 受取方法の変更で支払方法が描き直される・選択が外れることがあるため、クリック後に取り直す
+            pay_candidates = await self._radio_group(PAY_RADIO_NAME)
+            if pay_candidates:
+                chosen_pay, reason = self._choose_payment(pay_candidates, chosen_store, self.keywords.payment_method)
+                if await self._click_radio(PAY_RADIO_NAME, chosen_pay):
+                    pay_selected = True
+                    label = chosen_pay["label"].strip()
+                    if reason:
+                        log.info(f"✅ 支払方法: {reason} を選択（label='{label}')")
+                    else:
+                        log.warning(f"⚠️  支払方法: 既定の先頭を選択（label='{label}')")
+            else:
+                log.warning(f"⚠️  支払方法のラジオが見つかりませんでした（name='{PAY_RADIO_NAME}'）")
 
             if not pay_selected:
-                print("⚠️  支払方法の選択をスキップ（要素未検出）")
+                log.warning("⚠️  支払方法の選択をスキップ（要素未検出）")
 
             await self.helper.save_screenshot(self.page, "step5_after_payment_delivery.png")
 
             # 次へボタンをクリック（確認画面へ進む）
-            print("➡️  最後に『次へ』をクリックして確認画面へ進みます...")
-            await self.helper.safe_wait(600)
+            log.info("➡️  最後に『次へ』をクリックして確認画面へ進みます...")
             next_clicked = False
+            before_url = self.page.url
             next_button_selectors = [
                 "button:has-text('次へ')",
                 "button.button--primary:has-text('次へ')",
@@ -677,64 +591,99 @@ class FirstComeFlow(BaseFlow):
                 "input[type='submit'][value*='次へ']",
                 "a:has-text('次へ')",
             ]
-            for sel in next_button_selectors:
-                if await self._safe_click(sel):
-                    next_clicked = True
-                    break
+            if await self._safe_click(next_button_selectors, cache_key="first_come.step5.next"):
+                next_clicked = True
 
             if next_clicked:
-                print("✅ 『次へ』クリック成功。確認画面に遷移中...")
-                await self.helper.safe_wait(2000)
+                log.info("✅ 『次へ』クリック成功。確認画面に遷移中...")
+                await self.helper.wait_until(self.page, url_change=before_url, load_state="domcontentloaded", timeout=2000)
                 await self.helper.save_screenshot(self.page, "step5_after_next_click.png")
             else:
-                print("⚠️  『次へ』ボタンが見つかりません。ページ構造が異なる可能性があります。")
-                await self.helper.save_screenshot(self.page, "step5_next_button_not_found.png")
+                log.warning("⚠️  『次へ』ボタンが見つかりません。ページ構造が異なる可能性があります。")
+                await self.helper.save_screenshot(self.page, "step5_next_button_not_found.png", error=True)
 
-            print("\n⚠️  ここから先（最終確認・送信）は手動で行ってください")
-            print("   （誤発注防止のため、自動送信は実装していません）")
+            log.warning("⚠️  ここから先（最終確認・送信）は手動で行ってください", extra=SECTION)
+            log.warning("   （誤発注防止のため、自動送信は実装していません）")
             
-            # 指定分ブラウザを開いたまま待機（0なら待機なし）
+            # 指定分ブラウザを開いたまま待機（0なら待機なし。ページを閉じれば即終了）
             if self.config.keep_open_minutes and self.config.keep_open_minutes > 0:
-                wait_ms = int(self.config.keep_open_minutes * 60 * 1000)
-                print(f"\n⏳ {self.config.keep_open_minutes}分間ブラウザを開いたままにします...")
-                await self.helper.safe_wait(wait_ms)
+                log.info(f"⏳ {self.config.keep_open_minutes}分間ブラウザを開いたままにします（ページを閉じると終了）...", extra=SECTION)
+                await self.helper.keep_alive(self.page, self.config.keep_open_minutes)
             
             return True
             
         except Exception as e:
-            print(f"❌ ステップ5でエラー: {e}")
-            await self.helper.save_screenshot(self.page, "step5_error.png")
+            log.error(f"❌ ステップ5でエラー: {e}")
+            await self.helper.save_screenshot(self.page, "step5_error.png", error=True)
             return False
     
-    async def _safe_click(self, selector: str) -> bool:
-        """安全なクリック処理（複数の方法を試行）"""
+    @staticmethod
+    def _choose_receive(
+        candidates: list[dict], delivery_method: Keyword | str
+    ) -> tuple[dict, str | None]:
+        """受取方法のラジオを決める（戻り値: 候補, 一致した優先店舗名 or None=先頭）"""
+        if as_keyword(delivery_method).mentions('セブン', 'seven'):
+            preferred = (SEVEN_ELEVEN, FAMILYMART)
+        else:
+            preferred = (FAMILYMART, SEVEN_ELEVEN)
+        labels = [cand["label"] for cand in candidates]
+        for pref in preferred:
+            match = pref.best(labels)
+            if match:
+                return candidates[match.index], pref.raw
+        return candidates[0], None
+
+    @staticmethod
+    def _choose_payment(
+        candidates: list[dict], chosen_store: str | None, payment_method: Keyword | str
+    ) -> tuple[dict, str | None]:
+        """支払方法のラジオを決める（戻り値: 候補, 選択理由 or None=先頭）"""
+        # 1) value=3（コンビニ/ATM）を最優先
+        for cand in candidates:
+            if (cand["value"] or "").strip() == '3':
+                return cand, "コンビニ/ATM"
+        # 2) ラベル一致（店舗名が表示されている場合、受取と合わせる）
+        if chosen_store:
+            match = compile_keyword(chosen_store).best([cand["label"] for cand in candidates])
+            if match:
+                return candidates[match.index], f"'{chosen_store}'"
+        # 3) クレジットカード指定がconfigにあれば最後に尊重
+        if as_keyword(payment_method).mentions('クレジット'):
+            for cand in candidates:
+                if (cand["value"] or "").strip() == '1' or 'クレジット' in normalize(cand["label"]):
+                    return cand, "クレジットカード"
+        # 4) どれも無ければ先頭
+        return candidates[0], None
+
+    async def _radio_group(self, name: str) -> list[dict]:
+        """ラジオ群を1回の evaluate で取得（index/id/value/checked/ラベル文言。取れなければ空）"""
         try:
-            element = await self.page.query_selector(selector)
-            if not element:
+            groups = await self.page.evaluate(RADIO_GROUPS_JS, [name])
+        except Exception:
+            log.warning(f"⚠️  ラジオ取得時に一時的なエラー（name='{name}'）")
+            return []
+        return groups.get(name) or []
+
+    async def _click_radio(self, name: str, candidate: dict) -> bool:
+        """ラジオ群のうち指定候補を（未選択なら1回だけ）クリックし、同じ value のラジオが checked になったかを確かめる"""
+        if not candidate["checked"]:
+            radio = self.page.locator(f"input[type='radio'][name='{name}']").nth(candidate["index"])
+            if not await self.helper.click_element(radio):
                 return False
-            
-            # 方法1: 通常のクリック
-            try:
-                await element.click(timeout=3000)
-                return True
-            except:
-                pass
-            
-            # 方法2: JavaScriptでクリック
-            try:
-                await self.page.evaluate("(el) => el.click()", element)
-                return True
-            except:
-                pass
-            
-            # 方法3: forceオプション付きクリック
-            try:
-                await element.click(force=True, timeout=3000)
-                return True
-            except:
-                pass
-            
-            return False
-            
-        except Exception as e:
+        return await self.helper.wait_until(
+            self.page,
+            RADIO_CHECKED_JS,
+            arg=[name, candidate["index"], candidate["value"]],
+            timeout=800,
+        )
+
+    async def _safe_click(self, selectors: str | list[str], cache_key: str | None = None) -> bool:
+        """安全なクリック処理（候補セレクタを一斉に探索し、見つかった要素をクリック）"""
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        element, _ = await self.helper.find_first(
+            self.page, selectors, timeout=0, state="attached", cache_key=cache_key
+        )
+        if not element:
             return False
+        return await self.helper.click_element(element)
@@ -4,6 +4,9 @@ from playwright.async_api import Page
 from .base import BaseFlow
 from ..browser import BrowserHelper
 from ..config import Settings
+from ..log import SECTION, get_logger
+
+log = get_logger(__name__)
 
 
 class LotteryEntryFlow(BaseFlow):
@@ -15,13 +18,13 @@ class LotteryEntryFlow(BaseFlow):
     
     async def execute(self):
         """抽選応募フローを実行"""
-        print("\n🎫 抽選応募フロー開始")
-        print("=" * 60)
+        log.info("🎫 抽選応募フロー開始", extra=SECTION)
+        log.info("=" * 60)
         
         # イベントページにアクセス
-        print(f"\n🌐 {self.event_url} にアクセス中...")
-        await self.page.goto(self.event_url, wait_until="domcontentloaded", timeout=30000)
-        await self.helper.safe_wait(2000)
+        log.info(f"🌐 {self.event_url} にアクセス中...", extra=SECTION)
+        await self.helper.goto(self.page, self.event_url, wait_until="domcontentloaded", timeout=30000)
+        await self.helper.wait_until(self.page, load_state="load", timeout=2000)
         await self.helper.save_screenshot(self.page, "lottery_01_event_page.png")
         
         # 応募ボタンを探す
@@ -34,29 +37,25 @@ class LotteryEntryFlow(BaseFlow):
             '[class*="apply"]'
         ]
         
-        entry_button = None
-        for selector in entry_selectors:
-            try:
-                entry_button = await self.page.wait_for_selector(
-                    selector,
-                    timeout=5000,
-                    state="visible"
-                )
-                if entry_button:
-                    print(f"✓ 応募ボタン検出: {selector}")
-                    break
-            except:
-                continue
+        entry_button, selector = await self.helper.find_first(
+            self.page, entry_selectors, timeout=5000, cache_key="lottery.entry"
+        )
+        if entry_button:
+            log.info(f"✓ 応募ボタン検出: {selector}")
         
+        before_url = self.page.url
         if entry_button:
             await entry_button.click()
-            print("✓ 応募ボタンクリック")
-            await self.helper.safe_wait(3000)
+            log.info("✓ 応募ボタンクリック")
+            await self.helper.wait_until(
+                self.page, url_change=before_url, load_state="domcontentloaded", timeout=3000
+            )
             await self.helper.save_screenshot(self.page, "lottery_02_after_click.png")
         else:
-            print("\n⚠️  応募ボタンが自動検出できませんでした")
-            print("🖱️  手動で応募ボタンをクリックしてください（60秒待機）")
-            await self.helper.safe_wait(60000)
+            log.warning("⚠️  応募ボタンが自動検出できませんでした", extra=SECTION)
+            log.warning("🖱️  手動で応募ボタンをクリックしてください（60秒待機）")
+            # 手動クリックによる遷移を検知したら即続行
+            await self.helper.wait_until(self.page, url_change=before_url, timeout=60000)
         
         # 枚数選択
         quantity_selectors = [
@@ -66,15 +65,11 @@ class LotteryEntryFlow(BaseFlow):
             '[class*="quantity"]'
         ]
         
-        quantity_input = None
-        for selector in quantity_selectors:
-            try:
-                quantity_input = await self.page.wait_for_selector(selector, timeout=5000)
-                if quantity_input:
-                    print(f"✓ 枚数選択要素検出: {selector}")
-                    break
-            except:
-                continue
+        quantity_input, selector = await self.helper.find_first(
+            self.page, quantity_selectors, timeout=5000, cache_key="lottery.quantity"
+        )
+        if quantity_input:
+            log.info(f"✓ 枚数選択要素検出: {selector}")
         
         if quantity_input:
             # デフォルトで1枚選択
@@ -83,7 +78,7 @@ class LotteryEntryFlow(BaseFlow):
                 await quantity_input.select_option(value="1")
             else:
                 await quantity_input.fill("1")
-            print("✓ 枚数選択完了（1枚）")
+            log.info("✓ 枚数選択完了（1枚）")
             await self.helper.save_screenshot(self.page, "lottery_03_quantity_selected.png")
         
         # 確認・次へボタン
@@ -95,30 +90,26 @@ class LotteryEntryFlow(BaseFlow):
             'input[type="submit"]'
         ]
         
-        confirm_button = None
-        for selector in confirm_selectors:
-            try:
-                confirm_button = await self.page.wait_for_selector(selector, timeout=5000)
-                if confirm_button:
-                    print(f"✓ 確認ボタン検出: {selector}")
-                    break
-            except:
-                continue
+        confirm_button, selector = await self.helper.find_first(
+            self.page, confirm_selectors, timeout=5000, cache_key="lottery.confirm"
+        )
+        if confirm_button:
+            log.info(f"✓ 確認ボタン検出: {selector}")
         
         if confirm_button:
-            print("\n⚠️  確認ボタンが見つかりました")
-            print("   手動で内容を確認して進めてください（60秒待機）")
-            await self.helper.safe_wait(60000)
+            log.warning("⚠️  確認ボタンが見つかりました", extra=SECTION)
+            log.warning("   手動で内容を確認して進めてください（60秒待機）")
+            await self.helper.wait_until(self.page, url_change=self.page.url, timeout=60000)
         
         # 最終確認
         current_url = self.page.url
-        print(f"\n📍 現在のURL: {current_url}")
+        log.info(f"📍 現在のURL: {current_url}", extra=SECTION)
         
         page_title = await self.page.title()
-        print(f"📄 ページタイトル: {page_title}")
+        log.info(f"📄 ページタイトル: {page_title}")
         
         await self.helper.save_screenshot(self.page, "lottery_04_final_state.png")
         
-        print("\n" + "=" * 60)
-        print("✅ 抽選応募フロー完了")
-        print("⚠️  最終的な応募確定は手動で行ってください")
+        log.info("=" * 60, extra=SECTION)
+        log.info("✅ 抽選応募フロー完了")
+        log.warning("⚠️  最終的な応募確定は手動で行ってください")
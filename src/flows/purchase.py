@@ -4,6 +4,9 @@ from playwright.async_api import Page
 from .base import BaseFlow
 from ..browser import BrowserHelper
 from ..config import Settings
+from ..log import SECTION, get_logger
+
+log = get_logger(__name__)
 
 
 class QuickPurchaseFlow(BaseFlow):
@@ -15,13 +18,13 @@ class QuickPurchaseFlow(BaseFlow):
     
     async def execute(self):
         """即購入フローを実行"""
-        print("\n⚡ 即購入フロー開始")
-        print("=" * 60)
+        log.info("⚡ 即購入フロー開始", extra=SECTION)
+        log.info("=" * 60)
         
         # イベントページにアクセス
-        print(f"\n🌐 {self.event_url} にアクセス中...")
-        await self.page.goto(self.event_url, wait_until="domcontentloaded", timeout=30000)
-        await self.helper.safe_wait(1000)
+        log.info(f"🌐 {self.event_url} にアクセス中...", extra=SECTION)
+        await self.helper.goto(self.page, self.event_url, wait_until="domcontentloaded", timeout=30000)
+        await self.helper.wait_until(self.page, load_state="load", timeout=1000)
         await self.helper.save_screenshot(self.page, "purchase_01_event_page.png")
         
         # 購入ボタンを探す（高速クリック重視）
@@ -34,29 +37,28 @@ class QuickPurchaseFlow(BaseFlow):
             '[class*="buy"]'
         ]
         
-        purchase_button = None
-        for selector in purchase_selectors:
+        before_url = self.page.url
+        purchase_button, selector = await self.helper.find_first(
+            self.page, purchase_selectors, timeout=3000, cache_key="purchase.purchase"
+        )
+        if purchase_button:
+            log.info(f"✓ 購入ボタン検出: {selector}")
             try:
-                purchase_button = await self.page.wait_for_selector(
-                    selector,
-                    timeout=3000,
-                    state="visible"
-                )
-                if purchase_button:
-                    print(f"✓ 購入ボタン検出: {selector}")
-                    # 即座にクリック
-                    await purchase_button.click()
-                    print("✓ 購入ボタンクリック")
-                    break
-            except:
-                continue
+                # 即座にクリック
+                await purchase_button.click()
+                log.info("✓ 購入ボタンクリック")
+            except Exception:
+                purchase_button = None
         
         if not purchase_button:
-            print("\n⚠️  購入ボタンが自動検出できませんでした")
-            print("🖱️  手動で購入ボタンをクリックしてください（30秒待機）")
-            await self.helper.safe_wait(30000)
+            log.warning("⚠️  購入ボタンが自動検出できませんでした", extra=SECTION)
+            log.warning("🖱️  手動で購入ボタンをクリックしてください（30秒待機）")
+            # 手動クリックによる遷移を検知したら即続行
+            await self.helper.wait_until(self.page, url_change=before_url, timeout=30000)
         else:
-            await self.helper.safe_wait(2000)
+            await self.helper.wait_until(
+                self.page, url_change=before_url, load_state="domcontentloaded", timeout=2000
+            )
             await self.helper.save_screenshot(self.page, "purchase_02_after_click.png")
         
         # 座席選択
@@ -66,20 +68,22 @@ class QuickPurchaseFlow(BaseFlow):
             'button:has-text("選択")'
         ]
         
-        seat_button = None
-        for selector in seat_selectors:
+        before_url = self.page.url
+        seat_button, selector = await self.helper.find_first(
+            self.page, seat_selectors, timeout=5000, cache_key="purchase.seat"
+        )
+        if seat_button:
+            log.info(f"✓ 座席選択ボタン検出: {selector}")
             try:
-                seat_button = await self.page.wait_for_selector(selector, timeout=5000)
-                if seat_button:
-                    print(f"✓ 座席選択ボタン検出: {selector}")
-                    await seat_button.click()
-                    print("✓ 座席選択ボタンクリック")
-                    break
-            except:
-                continue
+                await seat_button.click()
+                log.info("✓ 座席選択ボタンクリック")
+            except Exception:
+                seat_button = None
         
         if seat_button:
-            await self.helper.safe_wait(2000)
+            await self.helper.wait_until(
+                self.page, url_change=before_url, load_state="domcontentloaded", timeout=2000
+            )
             await self.helper.save_screenshot(self.page, "purchase_03_seat_selection.png")
         
         # 枚数選択
@@ -89,21 +93,20 @@ class QuickPurchaseFlow(BaseFlow):
             'input[name*="quantity"]'
         ]
         
-        quantity_input = None
-        for selector in quantity_selectors:
+        quantity_input, selector = await self.helper.find_first(
+            self.page, quantity_selectors, timeout=5000, cache_key="purchase.quantity"
+        )
+        if quantity_input:
+            log.info(f"✓ 枚数選択要素検出: {selector}")
             try:
-                quantity_input = await self.page.wait_for_selector(selector, timeout=5000)
-                if quantity_input:
-                    print(f"✓ 枚数選択要素検出: {selector}")
-                    tag_name = await quantity_input.evaluate("el => el.tagName")
-                    if tag_name.lower() == "select":
-                        await quantity_input.select_option(value="1")
-                    else:
-                        await quantity_input.fill("1")
-                    print("✓ 枚数選択完了（1枚）")
-                    break
-            except:
-                continue
+                tag_name = await quantity_input.evaluate("el => el.tagName")
+                if tag_name.lower() == "select":
+                    await quantity_input.select_option(value="1")
+                else:
+                    await quantity_input.fill("1")
+                log.info("✓ 枚数選択完了（1枚）")
+            except Exception:
+                quantity_input = None
         
         if quantity_input:
             await self.helper.save_screenshot(self.page, "purchase_04_quantity_selected.png")
@@ -116,36 +119,38 @@ class QuickPurchaseFlow(BaseFlow):
             'button[type="submit"]'
         ]
         
-        next_button = None
-        for selector in next_selectors:
+        before_url = self.page.url
+        next_button, selector = await self.helper.find_first(
+            self.page, next_selectors, timeout=5000, cache_key="purchase.next"
+        )
+        if next_button:
+            log.info(f"✓ 次へボタン検出: {selector}")
             try:
-                next_button = await self.page.wait_for_selector(selector, timeout=5000)
-                if next_button:
-                    print(f"✓ 次へボタン検出: {selector}")
-                    await next_button.click()
-                    print("✓ 次へボタンクリック")
-                    break
-            except:
-                continue
+                await next_button.click()
+                log.info("✓ 次へボタンクリック")
+            except Exception:
+                next_button = None
         
         if next_button:
-            await self.helper.safe_wait(3000)
+            await self.helper.wait_until(
+                self.page, url_change=before_url, load_state="domcontentloaded", timeout=3000
+            )
             await self.helper.save_screenshot(self.page, "purchase_05_after_next.png")
         
         # 支払い方法選択ページ
-        print("\n💳 支払い方法選択ページに到達した可能性があります")
-        print("   ここから先は手動で進めてください（60秒待機）")
+        log.info("💳 支払い方法選択ページに到達した可能性があります", extra=SECTION)
+        log.warning("   ここから先は手動で進めてください（60秒待機）")
         await self.helper.safe_wait(60000)
         
         # 最終確認
         current_url = self.page.url
-        print(f"\n📍 現在のURL: {current_url}")
+        log.info(f"📍 現在のURL: {current_url}", extra=SECTION)
         
         page_title = await self.page.title()
-        print(f"📄 ページタイトル: {page_title}")
+        log.info(f"📄 ページタイトル: {page_title}")
         
         await self.helper.save_screenshot(self.page, "purchase_06_final_state.png")
         
-        print("\n" + "=" * 60)
-        print("✅ 即購入フロー完了")
-        print("⚠️  最終的な購入確定は手動で行ってください")
+        log.info("=" * 60, extra=SECTION)
+        log.info("✅ 即購入フロー完了")
+        log.warning("⚠️  最終的な購入確定は手動で行ってください")
@@ -0,0 +1,178 @@
+"""HAR のリクエスト別集計レポート
+
+RECORD_HAR で保存した HAR を読み、フローのステップごとにリクエスト数・転送バイト数・所要時間と、
+遅い/大きいリクエストを一覧表示する。スパンJSONL（traces/trace_*.jsonl）の _step* スパンの時間帯で
+リクエストをステップに振り分ける。--spans を省略した場合は、trace_dir のうち HAR の最初のリクエストを
+時間帯に含むものを使う（無ければ全体を1区間として扱う）。
+
+使用例:
+    python -m src.har_report hars/first_come_20251101_100000.har
+    python -m src.har_report hars/first_come.har --spans traces/trace_20251101_100000.jsonl --top 5 --json
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .trace_report import WHOLE_RUN, assign_steps, load_step_windows, parse_iso
+
+
+@dataclass
+class HarRequest:
+    """HAR のリクエスト1件分（start はエポック秒、時間はミリ秒、bytes は転送サイズ）"""
+
+    name: str
+    status: int
+    duration_ms: float
+    wait_ms: float
+    receive_ms: float
+    bytes: int
+    mime: str
+    start: Optional[float] = None
+    step: str = WHOLE_RUN
+
+
+def _ms(value) -> float:
+    # HAR では該当なしを -1 で表す
+    return float(value) if value is not None and value >= 0 else 0.0
+
+
+def _transfer_size(response: dict) -> int:
+    size = response.get("_transferSize")
+    if size is not None and size >= 0:
+        return int(size)
+    headers, body = response.get("headersSize", -1), response.get("bodySize", -1)
+    if body is not None and body >= 0:
+        return int(body) + max(0, int(headers or 0))
+    return int((response.get("content") or {}).get("size") or 0)
+
+
+def load_har(path: Path) -> list[HarRequest]:
+    """HAR（.har の JSON）からリクエストを取り出す"""
+    har = json.loads(path.read_text(encoding="utf-8"))
+    requests = []
+    for entry in (har.get("log") or {}).get("entries", []):
+        request = entry.get("request") or {}
+        response = entry.get("response") or {}
+        timings = entry.get("timings") or {}
+        mime = ((response.get("content") or {}).get("mimeType") or "").split(";")[0].strip()
+        requests.append(HarRequest(
+            name=f"{request.get('method', 'GET')} {request.get('url', '')}",
+            status=int(response.get("status") or 0),
+            duration_ms=_ms(entry.get("time")),
+            wait_ms=_ms(timings.get("wait")),
+            receive_ms=_ms(timings.get("receive")),
+            bytes=_transfer_size(response),
+            mime=mime,
+            start=parse_iso(entry.get("startedDateTime", "")),
+        ))
+    return sorted(requests, key=lambda r: r.start or 0)
+
+
+def find_spans(requests: list[HarRequest], trace_dir: Path) -> Optional[Path]:
+    """HAR の最初のリクエストを時間帯に含むスパンJSONL（新しい順に探す）"""
+    first = next((r.start for r in requests if r.start is not None), None)
+    if first is None or not trace_dir.is_dir():
+        return None
+    for candidate in sorted(trace_dir.glob("trace_*.jsonl"), reverse=True):
+        try:
+            windows = load_step_windows(candidate)
+        except OSError:
+            continue
+        if windows and windows[0].start - 1 <= first <= max(w.end for w in windows):
+            return candidate
+    return None
+
+
+def _entry(r: HarRequest) -> dict:
+    keys = ("name", "status", "duration_ms", "wait_ms", "receive_ms", "bytes", "mime")
+    return {k: v for k, v in asdict(r).items() if k in keys}
+
+
+def build_report(har: Path, spans: Optional[Path] = None, trace_dir: Path = Path("traces"), top: int = 10) -> dict:
+    """ステップ別のリクエスト数・バイト数・時間と、遅い順/大きい順の上位 N 件をまとめる"""
+    requests = load_har(har)
+    spans = spans or find_spans(requests, trace_dir)
+    windows = load_step_windows(spans) if spans else []
+    grouped = assign_steps(requests, windows)
+    durations = {w.name: round((w.end - w.start) * 1000, 1) for w in windows}
+
+    steps = {}
+    for step, step_requests in grouped.items():
+        if not step_requests:
+            continue
+        hosts: dict[str, dict] = {}
+        for r in step_requests:
+            host = hosts.setdefault(urlsplit(r.name.split(" ", 1)[-1]).hostname or "", {"count": 0, "bytes": 0})
+            host["count"] += 1
+            host["bytes"] += r.bytes
+        steps[step] = {
+            "duration_ms": durations.get(step),
+            "count": len(step_requests),
+            "bytes": sum(r.bytes for r in step_requests),
+            "total_ms": round(sum(r.duration_ms for r in step_requests), 1),
+            "wait_ms": round(sum(r.wait_ms for r in step_requests), 1),
+            "failed": sum(1 for r in step_requests if r.status == 0 or r.status >= 400),
+            "hosts": dict(sorted(hosts.items(), key=lambda kv: -kv[1]["bytes"])),
+            "slowest": [_entry(r) for r in sorted(step_requests, key=lambda r: -r.duration_ms)[:top]],
+            "largest": [_entry(r) for r in sorted(step_requests, key=lambda r: -r.bytes)[:top]],
+        }
+
+    return {
+        "har": str(har),
+        "spans": str(spans) if spans else None,
+        "requests": len(requests),
+        "bytes": sum(r.bytes for r in requests),
+        "steps": steps,
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"📼 {report['har']}  ({report['requests']}件 / {report['bytes'] / 1024:.0f}KB)"]
+    if report["spans"]:
+        lines.append(f"   ステップ区間: {report['spans']}")
+    for step, section in report["steps"].items():
+        duration = section["duration_ms"]
+        lines.append("")
+        lines.append(f"■ {step}" + (f"  ({duration:.0f}ms)" if duration is not None else ""))
+        failed = f" / 失敗 {section['failed']}件" if section["failed"] else ""
+        lines.append(
+            f"  {section['count']}件 / {section['bytes'] / 1024:.0f}KB / 合計 {section['total_ms']:.0f}ms"
+            f"（うち応答待ち {section['wait_ms']:.0f}ms）{failed}"
+        )
+        for label, key, fmt in (
+            ("遅い順", "slowest", lambda e: f"{e['duration_ms']:8.1f}ms"),
+            ("大きい順", "largest", lambda e: f"{e['bytes'] / 1024:8.1f}KB"),
+        ):
+            lines.append(f"  [{label}]")
+            for entry in section[key]:
+                lines.append(f"    {fmt(entry)}  {entry['status']}  {entry['name']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HAR のステップ別リクエスト集計（時間・転送バイト数）")
+    parser.add_argument("har", type=Path, help="RECORD_HAR で保存した .har")
+    parser.add_argument("--spans", type=Path, default=None, help="スパンJSONL（省略時は --trace-dir から時間帯で自動検出）")
+    parser.add_argument("--trace-dir", type=Path, default=Path("traces"), help="スパンJSONLの保存先")
+    parser.add_argument("--top", type=int, default=10, help="ステップごとに表示する件数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力")
+    args = parser.parse_args(argv)
+
+    if not args.har.exists():
+        print(f"❌ HAR が見つかりません: {args.har}", file=sys.stderr)
+        return 1
+    report = build_report(args.har, args.spans, args.trace_dir, args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
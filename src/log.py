@@ -0,0 +1,157 @@
+"""ログ出力（キュー経由・別スレッドで書き出し）
+
+print の代わりに使う。呼び出し側はレコードをキューに積むだけで、文字列の整形とコンソール・ファイルへの
+書き込みは別スレッド（QueueListener）で行う。Windows のコンソールのように書き込みが遅くても、
+クリックの直前・直後の出力で待たされない。
+
+- レベル: DEBUG / INFO / WARNING / ERROR（LOG_LEVEL。未指定なら DEBUG=true で DEBUG、それ以外は INFO）
+- 文脈: 各レコードに flow / step を付ける（BaseFlow が execute・_step* の実行中に設定する）
+- LOG_QUIET=true ならコンソールには WARNING 以上だけを出す
+- LOG_JSON_PATH を指定すると JSON Lines（ts, level, logger, flow, step, msg）でも書き出す
+- 見出しは extra=SECTION を付けて出す（コンソールでは前に空行が入る。メッセージ自体には改行を含めない）
+
+設定前（configure() を呼ぶ前）は INFO 以上をコンソールに出す。BrowserHelper.start() が設定を反映する。
+print と混在させる場合など、ここまでの出力を確実に済ませておきたいところでは flush() を呼ぶ。
+
+使用例:
+    from .log import get_logger
+    log = get_logger(__name__)
+    log.info("[ステップ1] イベント詳細ページへ移動", extra=SECTION)
+    log.info("✅ ステップ1完了")
+    log.warning("⚠️  ボタンが見つかりません")
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional, Union
+
+ROOT = "eplus"
+# 見出しの印（log.info("...", extra=SECTION)）
+SECTION = {"section": True}
+
+_context: ContextVar[dict] = ContextVar("log_context", default={})
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_listener: Optional[QueueListener] = None
+_configured: Optional[tuple] = None
+
+
+@contextmanager
+def log_context(**fields):
+    """この中で出したログに fields（flow / step など）を付ける"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """整形せずにキューへ積む（同じプロセス内のキューなので、整形はリスナーのスレッドに任せられる）"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 文脈はスレッドをまたぐと読めないため、ここで写しておく
+        fields = _context.get()
+        record.flow = fields.get("flow", "")
+        record.step = fields.get("step", "")
+        return record
+
+
+class ConsoleFormatter(logging.Formatter):
+    """メッセージのみ（見出しの前には空行）"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        return "\n" + text if getattr(record, "section", False) else text
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "flow": getattr(record, "flow", ""),
+            "step": getattr(record, "step", ""),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """モジュールごとのロガー（例: get_logger(__name__) → "eplus.flows.first_come"）"""
+    return logging.getLogger(f"{ROOT}.{name.removeprefix('src.')}")
+
+
+def configure(
+    level: Union[int, str] = logging.INFO,
+    quiet: bool = False,
+    json_path: Optional[Union[str, Path]] = None,
+):
+    """出力先とレベルを設定する（前の設定で溜まっていた分は書き出してから切り替える。同じ設定なら何もしない）"""
+    global _listener, _configured
+    args = (level, quiet, str(json_path) if json_path else None)
+    if _listener is not None and args == _configured:
+        return
+    shutdown()
+    _configured = args
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(ConsoleFormatter("%(message)s"))
+    console.setLevel(logging.WARNING if quiet else logging.NOTSET)
+    handlers: list[logging.Handler] = [console]
+    if json_path:
+        path = Path(json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    logger = logging.getLogger(ROOT)
+    logger.handlers = [_DeferredQueueHandler(_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+    _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def configure_from_settings(config):
+    """Settings（log_level / log_quiet / log_json_path / debug）から設定する
+
+    LOG_LEVEL を指定していればそれを使い、未指定なら DEBUG=true で DEBUG、それ以外は INFO にする。
+    """
+    level = config.log_level or (logging.DEBUG if config.debug else logging.INFO)
+    configure(
+        level,
+        quiet=config.log_quiet,
+        json_path=config.log_json_path or None,
+    )
+
+
+def flush():
+    """キューに積まれた分の書き出しが終わるまで待つ"""
+    if _listener is not None:
+        _queue.join()
+
+
+def shutdown():
+    """書き出しを終えてリスナーを止める（プロセス終了時にも呼ばれる）"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+configure()
+atexit.register(shutdown)
@@ -0,0 +1,277 @@
+"""ログイン処理の共通エンジン
+
+auto_login（トップページから）、先着フローのステップ4（チケット選択後のiframeログイン）、
+TEST/test_auto_login.py はすべて LoginEngine を使う。セレクタ候補・クリックの代替手段・
+ログイン済み判定をここに集約し、フェーズごとの所要時間を LoginResult とトレースに記録する。
+
+    result = await LoginEngine(page, helper, config).login(open_login_page=True)
+    if result.success: ...
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from playwright.async_api import ElementHandle, Frame, Page
+
+from .browser import BrowserHelper
+from .config import Settings
+from .log import get_logger
+from .trace import span
+
+log = get_logger(__name__)
+
+
+@dataclass
+class LoginResult:
+    """ログイン結果"""
+
+    success: bool
+    skipped: bool = False  # ログイン済みだったため操作を省略した
+    url: str = ""
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+class LoginEngine:
+    """e+ のログインフォームを探して入力・送信する
+
+    Args:
+        page: 対象ページ
+        helper: ブラウザヘルパー
+        config: 設定
+        screenshot_prefix: スクリーンショットのファイル名接頭辞
+        manual_fallback_ms: 送信ボタンを押せなかったときに手動クリックを待つ時間（0なら待たずに失敗）
+    """
+
+    # トップページのログインリンク
+    TOP_LOGIN_SELECTORS = [
+        'a:has-text("ログイン")',
+        'button:has-text("ログイン")',
+        'a[href*="login"]',
+        '.header-login',
+        '#login-link',
+    ]
+    EMAIL_SELECTORS = [
+        'input[name="login_id"]',  # e+の実際のセレクタ
+        'input[type="email"]',
+        'input[name="loginid"]',
+        '#loginid',
+        'input[name="email"]',
+        'input[autocomplete="username"]',
+        'input[placeholder*="メール"]',
+        'input[placeholder*="email" i]',
+        'input[placeholder*="ID"]',
+    ]
+    PASSWORD_SELECTORS = [
+        'input[name="login_pw"]',  # e+の実際のセレクタ
+        'input[type="password"]',
+        'input[name="password"]',
+        '#password',
+        'input[autocomplete="current-password"]',
+        'input[placeholder*="パスワード"]',
+    ]
+    SUBMIT_SELECTORS = [
+        'button.button--primary.button--block:has-text("ログイン")',  # e+の実際のセレクタ
+        'button:has-text("ログイン")',
+        'button[type="submit"]',
+        'input[type="submit"]',
+        'button:has-text("ログインする")',
+        '.login-btn',
+        '#loginBtn',
+        'a:has-text("ログイン")',
+    ]
+
+    def __init__(
+        self,
+        page: Page,
+        helper: BrowserHelper,
+        config: Settings,
+        screenshot_prefix: str = "login",
+        manual_fallback_ms: int = 0,
+    ):
+        self.page = page
+        self.helper = helper
+        self.config = config
+        self.screenshot_prefix = screenshot_prefix
+        self.manual_fallback_ms = manual_fallback_ms
+        self.timings_ms: dict[str, float] = {}
+
+    @contextmanager
+    def _phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings_ms[name] = round(self.timings_ms.get(name, 0) + (time.perf_counter() - started) * 1000, 1)
+
+    def _result(self, success: bool, skipped: bool = False) -> LoginResult:
+        result = LoginResult(success, skipped, self.page.url, dict(self.timings_ms))
+        phases = " / ".join(f"{k} {v:.0f}ms" for k, v in result.timings_ms.items())
+        log.info(f"⏱️  ログイン所要: {phases}")
+        return result
+
+    async def login(self, open_login_page: bool = False) -> LoginResult:
+        """ログインする（ログイン済みなら省略）
+
+        Args:
+            open_login_page: True ならトップページからログイン画面を開く。False なら現在のページのフォームを使う
+        """
+        self.timings_ms = {}
+        async with span("login", prefix=self.screenshot_prefix) as sp:
+            result = await self._login(open_login_page)
+            sp.set(success=result.success, skipped=result.skipped, **result.timings_ms)
+            return result
+
+    async def _login(self, open_login_page: bool) -> LoginResult:
+        # 1) ログイン済みならここで終わり（ログイン画面にいる場合はフォーム入力が必要なので確認しない）
+        with self._phase("session"):
+            logged_in = await self.is_logged_in()
+        if logged_in:
+            log.info("✅ ログイン済み（ログイン操作を省略）")
+            return self._result(True, skipped=True)
+
+        if not self.config.eplus_email or not self.config.eplus_password:
+            log.error("❌ エラー: .envファイルにEPLUS_EMAILとEPLUS_PASSWORDが設定されていません")
+            return self._result(False)
+
+        # 2) ログイン画面を開く
+        if open_login_page:
+            with self._phase("open"):
+                if not await self._open_login_page():
+                    return self._result(False)
+
+        # 3) メール・パスワード欄を全フレームで同時に探す
+        with self._phase("form"):
+            email_el, password_el, frame = await self._find_form()
+        if not email_el:
+            log.warning("⚠️  メール入力欄が見つかりません")
+            # フォームが無いのはログイン済みで遷移済みの可能性
+            with self._phase("confirm"):
+                success = await self.helper.is_logged_in()
+            if not success:
+                await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_no_form.png", error=True)
+            return self._result(success)
+        if not password_el:
+            log.error("❌ パスワード入力欄が見つかりません")
+            await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_no_password.png", error=True)
+            return self._result(False)
+
+        # 4) 入力
+        with self._phase("fill"):
+            try:
+                await email_el.fill(self.config.eplus_email)
+                await password_el.fill(self.config.eplus_password)
+                log.info("✓ メールアドレス・パスワード入力完了")
+            except Exception as e:
+                log.error(f"❌ 入力エラー: {e}")
+                await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_fill_failed.png", error=True)
+                return self._result(False)
+        await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_filled.png")
+
+        # 5) 送信して遷移を待つ
+        with self._phase("submit"):
+            before_url = self.page.url
+            submitted = await self._submit(frame, email_el)
+            if submitted:
+                await self.helper.wait_until(self.page, url_change=before_url, load_state="domcontentloaded")
+            elif self.manual_fallback_ms > 0:
+                await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_click_failed.png", error=True)
+                log.warning(f"⚠️  手動でログインボタンをクリックしてください（{self.manual_fallback_ms // 1000}秒待機）")
+                # 手動クリックによる遷移を検知したら即続行
+                await self.helper.wait_until(self.page, url_change=before_url, timeout=self.manual_fallback_ms)
+            else:
+                log.error("❌ ログインボタンのクリックに失敗しました")
+                await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_click_failed.png", error=True)
+                return self._result(False)
+
+        # 6) 成功判定（ログイン画面から離れたか、まだならマイページへの問い合わせで確認）
+        with self._phase("confirm"):
+            current_url = self.page.url.lower()
+            success = "login" not in current_url or "mypage" in current_url
+            if not success:
+                success = await self.helper.is_logged_in()
+        log.info(f"📍 現在のURL: {self.page.url}")
+        if success:
+            log.info("✅ ログイン成功！")
+            await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_success.png")
+            await self.helper.save_session()
+        else:
+            log.error("❌ ログイン失敗")
+            await self.helper.save_screenshot(self.page, f"{self.screenshot_prefix}_failed.png", error=True)
+        return self._result(success)
+
+    async def is_logged_in(self) -> bool:
+        """ログイン済みか（ログイン画面にいる、またはCookieが無い場合は問い合わせずに False）"""
+        if "login" in self.page.url.lower():
+            return False
+        if not self.helper.session_restored and not await self.helper.context.cookies(self.config.base_url):
+            return False
+        if await self.helper.is_logged_in():
+            return True
+        if self.helper.session_restored:
+            log.warning("⚠️  保存済みのログイン状態は無効でした（再ログインします）")
+            self.helper.clear_session()
+        return False
+
+    async def _open_login_page(self) -> bool:
+        """トップページからログイン画面へ"""
+        try:
+            await self.helper.goto(self.page, self.config.eplus_url("/"), wait_until="domcontentloaded", timeout=30000)
+            await self.helper.wait_until(self.page, load_state="load", timeout=2000)
+            log.info("✓ e+トップページアクセス完了")
+        except Exception as e:
+            log.error(f"❌ ページアクセスエラー: {e}")
+            return False
+
+        button, selector = await self.helper.find_first(
+            self.page, self.TOP_LOGIN_SELECTORS, timeout=3000, cache_key="login.top_login"
+        )
+        if not button:
+            log.warning("⚠️  ログインボタンが見つかりません（フォームを直接探します）")
+            return True
+        before_url = self.page.url
+        if await self.helper.click_element(button):
+            log.info(f"✓ ログインボタンクリック: {selector}")
+            # ログインページへの遷移を待つ（モーダル表示で遷移しない場合は上限まで）
+            await self.helper.wait_until(self.page, url_change=before_url, load_state="domcontentloaded", timeout=2000)
+        return True
+
+    async def _find_form(self) -> tuple[Optional[ElementHandle], Optional[ElementHandle], Optional[Frame]]:
+        """メール欄・パスワード欄と、それらがあるフレームを返す（iframe内も探索）"""
+        frames = list(self.page.frames)
+        (email_el, _), (password_el, _) = await asyncio.gather(
+            self.helper.find_first(frames, self.EMAIL_SELECTORS, timeout=5000, cache_key="login.email"),
+            self.helper.find_first(
+                frames, self.PASSWORD_SELECTORS, timeout=5000, state="attached", cache_key="login.password"
+            ),
+        )
+        if not email_el:
+            return None, None, None
+        frame = await email_el.owner_frame()
+        if password_el and frame and await password_el.owner_frame() is not frame:
+            # 別フレームのパスワード欄を拾った場合はメール欄と同じフレームで探し直す
+            password_el, _ = await self.helper.find_first(frame, self.PASSWORD_SELECTORS, timeout=0, state="attached")
+        return email_el, password_el, frame
+
+    async def _submit(self, frame: Optional[Frame], email_el: ElementHandle) -> bool:
+        """ログインボタンをクリック（押せなければフォームを直接送信）"""
+        button, selector = await self.helper.find_first(
+            frame or list(self.page.frames),
+            self.SUBMIT_SELECTORS,
+            timeout=3000,
+            state="attached",
+            cache_key="login.submit",
+        )
+        if button:
+            log.info(f"🖱️  ログイン実行中... ({selector})")
+            if await self.helper.click_element(button):
+                return True
+        try:
+            return await email_el.evaluate(
+                "(el) => { if (!el.form) return false;"
+                " el.form.requestSubmit ? el.form.requestSubmit() : el.form.submit(); return true; }"
+            )
+        except Exception:
+            return False
@@ -0,0 +1,9 @@
+"""ローカル検証用 e+ モックサイト
+
+ライブの eplus.jp に触れずにフローの動作・所要時間を計測するためのスタブ。
+Settings.base_url にサーバーのURLを設定すると、各フローはこちらを参照する。
+"""
+
+from .server import MockEplusServer
+
+__all__ = ["MockEplusServer"]
@@ -0,0 +1,40 @@
+"""モックサーバーの起動
+
+使用例:
+    python -m src.mock_site --port 8765
+    # .env に BASE_URL=http://127.0.0.1:8765 を設定してフローを実行
+"""
+
+import argparse
+
+from .server import MockEplusServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="e+ モックサーバー")
+    parser.add_argument("--host", default="127.0.0.1", help="待ち受けホスト")
+    parser.add_argument("--port", type=int, default=8765, help="待ち受けポート")
+    parser.add_argument("--release-delay-ms", type=int, default=0, help="「受付中」が出現するまでの遅延")
+    parser.add_argument("--latency-ms", type=int, default=0, help="全レスポンスに加える遅延")
+    parser.add_argument("--performance-count", type=int, default=30, help="公演日時の選択肢数")
+    parser.add_argument("--assets", action="store_true", help="CSS/JS/フォント/画像と解析タグを読み込ませる")
+    args = parser.parse_args()
+
+    server = MockEplusServer(
+        host=args.host,
+        port=args.port,
+        release_delay_ms=args.release_delay_ms,
+        latency_ms=args.latency_ms,
+        performance_count=args.performance_count,
+        assets=args.assets,
+    )
+    print(f"🧪 モックサーバー起動: http://{args.host}:{args.port}")
+    print(f"   .env に BASE_URL=http://{args.host}:{args.port} を設定してください（Ctrl+Cで停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 モックサーバー停止")
+
+
+if __name__ == "__main__":
+    main()
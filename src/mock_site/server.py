@@ -0,0 +1,344 @@
+"""e+ モックサーバー本体
+
+http.server ベースの軽量スタブで、フローが参照するページ（トップ、ログイン、
+イベント詳細、チケット選択、iframeログイン、支払・受取選択、確認）を返す。
+/bench/churn は個人情報マスクの負荷計測用に DOM を大量に書き換えるページ。
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from typing import Optional
+from urllib.parse import parse_qs, quote, urlsplit
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+SESSION_COOKIE = "mock_session"
+
+# assets=True のときに配信する静的ファイル（名前 → (Content-Type, バイト数)）。
+# 中身はダミーだが、ブラウザは実サイト同様にダウンロードする
+FIXTURE_ASSETS = {
+    "site.css": ("text/css", 24_000),
+    "app.js": ("application/javascript", 48_000),
+    "webfont.woff2": ("font/woff2", 120_000),
+    **{f"banner_{i}.jpg": ("image/jpeg", 80_000) for i in range(1, 7)},
+}
+# 広告・解析タグ相当を配信する「別ホスト」（同じサーバーを localhost 名義で参照する）
+THIRD_PARTY_HOST = "localhost"
+
+
+def _load_page(name: str) -> Template:
+    return Template((PAGES_DIR / name).read_text(encoding="utf-8"))
+
+
+def _padded(head: str, size: int) -> bytes:
+    """先頭に有効なコードを置き、コメントで指定サイズまで埋める"""
+    data = head.encode("utf-8")
+    return data + b"/*" + b"x" * max(size - len(data) - 4, 0) + b"*/"
+
+
+def _fixture_body(name: str, content_type: str, size: int) -> bytes:
+    if name == "site.css":
+        return _padded(
+            '@font-face { font-family: "MockSans"; src: url("/static/webfont.woff2") format("woff2"); }\n'
+            'body { font-family: "MockSans", sans-serif; }\n',
+            size,
+        )
+    if content_type.endswith("javascript"):
+        return _padded("window.mockApp = { ready: true };\n", size)
+    return bytes((i * 131 + len(name)) % 251 for i in range(size))
+
+
+def _options(items: list[tuple[str, str]], placeholder: bool = True) -> str:
+    """(value, text) の並びから <option> 群を生成"""
+    html = ['<option value="">選択して下さい</option>'] if placeholder else []
+    html += [f'<option value="{value}">{text}</option>' for value, text in items]
+    return "".join(html)
+
+
+class MockEplusServer:
+    """ローカルで e+ の画面遷移を再現するスタブサーバー
+
+    Args:
+        host: 待ち受けホスト
+        port: 待ち受けポート（0なら空きポートを自動割り当て）
+        release_delay_ms: イベント詳細で「受付中」「次へ」が出現するまでの遅延（0なら最初から表示）
+        latency_ms: 全レスポンスに加える人工的な遅延
+        performance_count: 公演日時 <select> の選択肢数
+        assets: 全ページに CSS/JS/フォント/画像と、別ホスト（localhost）の解析タグを読み込ませる
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        release_delay_ms: int = 0,
+        latency_ms: int = 0,
+        performance_count: int = 30,
+        assets: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.release_delay_ms = release_delay_ms
+        self.latency_ms = latency_ms
+        self.performance_count = performance_count
+        self.assets = assets
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._asset_cache: dict[str, bytes] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._layout = _load_page("_layout.html")
+        self._routes = [
+            ("GET", re.compile(r"^/$"), self._top),
+            ("GET", re.compile(r"^/sf/top$"), self._top),
+            ("GET", re.compile(r"^/sf/login$"), self._login_form),
+            ("POST", re.compile(r"^/sf/login$"), self._login_submit),
+            ("GET", re.compile(r"^/sf/mypage$"), self._mypage),
+            ("GET", re.compile(r"^/sf/detail/(?P<event_id>[^/]+)$"), self._detail),
+            ("GET", re.compile(r"^/sf/ticket/(?P<event_id>[^/]+)$"), self._ticket),
+            ("GET", re.compile(r"^/sf/ticket/(?P<event_id>[^/]+)/login$"), self._ticket_login),
+            ("GET", re.compile(r"^/sf/payment/(?P<event_id>[^/]+)$"), self._payment),
+            ("GET", re.compile(r"^/sf/confirm/(?P<event_id>[^/]+)$"), self._confirm),
+            ("GET", re.compile(r"^/event/(?P<event_id>[^/]+)$"), self._event),
+            ("GET", re.compile(r"^/event/(?P<event_id>[^/]+)/entry$"), self._entry),
+            ("GET", re.compile(r"^/static/(?P<name>[\w.\-]+)$"), self._static),
+            ("GET", re.compile(r"^/tag/analytics\.js$"), self._analytics_tag),
+            ("GET", re.compile(r"^/collect$"), self._collect),
+            ("GET", re.compile(r"^/bench/churn$"), self._churn),
+        ]
+
+    # ------------------------------------------------------------------
+    # ライフサイクル
+    # ------------------------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        """Settings.base_url に設定するURL"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockEplusServer":
+        """バックグラウンドスレッドで待ち受けを開始"""
+        handler = type("MockEplusHandler", (_Handler,), {"mock": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """待ち受けを停止"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def serve_forever(self):
+        """フォアグラウンドで待ち受け（CLI用）"""
+        self.start()
+        try:
+            while self._thread and self._thread.is_alive():
+                self._thread.join(timeout=1)
+        finally:
+            self.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # ルーティング
+    # ------------------------------------------------------------------
+    def dispatch(self, method: str, path: str, query: dict, form: dict, cookies: dict):
+        """(status, headers, body) を返す"""
+        self.request_count += 1
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+        for route_method, pattern, view in self._routes:
+            if route_method != method:
+                continue
+            m = pattern.match(path)
+            if m:
+                return view(query=query, form=form, cookies=cookies, **m.groupdict())
+        return 404, {}, self._render("Not Found", "<h1>404 Not Found</h1>")
+
+    def _render(self, title: str, body: str) -> str:
+        head_assets = body_assets = ""
+        if self.assets:
+            head_assets = (
+                '<link rel="stylesheet" href="/static/site.css">\n'
+                '<script src="/static/app.js" defer></script>\n'
+                f'<script src="http://{THIRD_PARTY_HOST}:{self.port}/tag/analytics.js" async></script>\n'
+            )
+            body_assets = "".join(
+                f'<img src="/static/{name}" alt="" width="320" height="100">\n'
+                for name in FIXTURE_ASSETS
+                if name.endswith(".jpg")
+            )
+        return self._layout.substitute(title=title, body=body, head_assets=head_assets, body_assets=body_assets)
+
+    def _page(self, name: str, title: str, **params) -> tuple[int, dict, str]:
+        body = _load_page(name).substitute(**params)
+        return 200, {}, self._render(title, body)
+
+    # ------------------------------------------------------------------
+    # 各ページ
+    # ------------------------------------------------------------------
+    def _top(self, query, **_):
+        return self._page("top.html", "トップ", event_id=query.get("event_id", "mock-event"))
+
+    def _login_form(self, query, **_):
+        return self._page("login.html", "ログイン", next=quote(query.get("next", ""), safe="/"))
+
+    def _login_submit(self, query, form, **_):
+        if not form.get("login_id") or not form.get("login_pw"):
+            return self._login_form(query=query)
+        location = query.get("next") or "/sf/mypage"
+        headers = {
+            "Location": location,
+            "Set-Cookie": f"{SESSION_COOKIE}=1; Path=/",
+        }
+        return 302, headers, ""
+
+    def _mypage(self, cookies, **_):
+        if cookies.get(SESSION_COOKIE) != "1":
+            return 302, {"Location": "/sf/login?next=/sf/mypage"}, ""
+        return self._page("mypage.html", "マイページ")
+
+    def _detail(self, event_id, **_):
+        released = self.release_delay_ms <= 0
+        return self._page(
+            "detail.html",
+            "イベント詳細",
+            event_id=event_id,
+            release_status="一般発売 受付中" if released else "一般発売 受付前",
+            release_hidden="" if released else "hidden",
+            release_delay_ms=self.release_delay_ms,
+        )
+
+    def _ticket(self, event_id, **_):
+        performances = [
+            (f"P{i:03d}", f"2025/11/{(i % 28) + 1:02d}({'月火水木金土日'[i % 7]}) {'13:00' if i % 2 else '18:00'} 開演")
+            for i in range(1, self.performance_count + 1)
+        ]
+        seats = [("S1", "SS席"), ("S2", "S席"), ("S3", "A席"), ("S4", "スタンドＢ席")]
+        return self._page(
+            "ticket.html",
+            "チケット選択",
+            event_id=event_id,
+            performance_options=_options(performances),
+            seat_options=_options(seats),
+            count_options=self._count_options(),
+        )
+
+    def _ticket_login(self, event_id, cookies, **_):
+        # ログイン済みならログイン画面を出さずに次へ進む
+        if cookies.get(SESSION_COOKIE) == "1":
+            return 302, {"Location": f"/sf/payment/{event_id}"}, ""
+        return self._page("ticket_login.html", "ログイン", event_id=event_id)
+
+    def _payment(self, event_id, cookies, **_):
+        if cookies.get(SESSION_COOKIE) != "1":
+            return 302, {"Location": f"/sf/ticket/{event_id}/login"}, ""
+        return self._page("payment.html", "支払・受取方法", event_id=event_id)
+
+    def _confirm(self, event_id, **_):
+        return self._page("confirm.html", "確認", event_id=event_id)
+
+    def _event(self, event_id, **_):
+        return self._page("event.html", "イベント", event_id=event_id)
+
+    def _entry(self, event_id, **_):
+        return self._page("entry.html", "申し込み", event_id=event_id, count_options=self._count_options())
+
+    def _static(self, name, **_):
+        if name not in FIXTURE_ASSETS:
+            return 404, {"Content-Type": "text/plain"}, "not found"
+        content_type, size = FIXTURE_ASSETS[name]
+        if name not in self._asset_cache:
+            self._asset_cache[name] = _fixture_body(name, content_type, size)
+        headers = {"Content-Type": content_type, "Cache-Control": "public, max-age=86400"}
+        return 200, headers, self._asset_cache[name]
+
+    def _analytics_tag(self, **_):
+        script = _padded(
+            f'new Image().src = "http://{THIRD_PARTY_HOST}:{self.port}/collect?t=" + Date.now();\n',
+            40_000,
+        )
+        return 200, {"Content-Type": "application/javascript"}, script
+
+    def _collect(self, **_):
+        return 204, {"Content-Type": "image/gif"}, b""
+
+    def _churn(self, query, **_):
+        """DOM を毎フレーム大量に書き換えるページ（個人情報マスクの負荷計測用。iframe 内でも同じ処理）
+
+        クエリ: frames（フレーム数）/ nodes（1フレームの追加要素数）/ needle（伏字対象の文字列）
+        """
+        frames = int(query.get("frames", 300))
+        nodes = int(query.get("nodes", 50))
+        needle = query.get("needle", "user@example.com")
+        return self._page(
+            "churn.html",
+            "DOM更新負荷",
+            frames=frames,
+            nodes=nodes,
+            needle_q=quote(needle),
+            needle_js=json.dumps(needle),
+            # iframe は1段だけ
+            frame_hidden="hidden" if query.get("framed") else "",
+        )
+
+    @staticmethod
+    def _count_options() -> str:
+        return _options([(f"T01/{n}", f"{n}枚") for n in range(1, 5)])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """MockEplusServer.dispatch へ委譲するだけのハンドラ"""
+
+    mock: MockEplusServer
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        form = {}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length).decode("utf-8") if length else ""
+            form = {k: v[0] for k, v in parse_qs(raw).items()}
+        cookies = {}
+        for chunk in (self.headers.get("Cookie") or "").split(";"):
+            if "=" in chunk:
+                key, value = chunk.strip().split("=", 1)
+                cookies[key] = value
+
+        status, headers, body = self.mock.dispatch(method, parts.path, query, form, cookies)
+        payload = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        headers.setdefault("Content-Type", "text/html; charset=utf-8")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.mock.bytes_sent += len(payload)
+
+    def log_message(self, format, *args):
+        # アクセスログは出さない（ベンチマーク出力を汚さないため）
+        pass
@@ -0,0 +1,129 @@
+"""録画・スクリーンショット用の個人情報マスク
+
+BrowserContext の init script として1回だけ登録し、すべてのページ・iframe の各ドキュメントで
+読み込み直後に1度だけ動く（window.__eplusMasker で二重登録を防ぐ）。
+
+- 入力欄（ログインID・パスワード・カード番号など）は CSS でぼかす。
+  構築可能スタイルシート（adoptedStyleSheets）を使うため、<head> の生成前から効き、DOM の書き換えでも外れない
+- 画面上のメールアドレス文字列はテキストノード単位で伏字にする。
+  MutationObserver では変化したノードを集めるだけにして、走査は次の描画直前（requestAnimationFrame）に
+  まとめて1回行う。非表示のドキュメントでは rAF が止まるためタイマーで代用する
+
+ページ内の集計は window.__eplusMasker.stats（BrowserHelper.mask_stats() で全フレーム分を合計）:
+    batches: 走査の回数 / mutations: 受け取った MutationRecord 数 / scanned: 調べたテキストノード数 /
+    masked: 伏字にしたテキストノード数 / time_ms: 走査に使った時間
+"""
+
+import json
+
+MASK_CSS = """
+input[type="password"],
+input[name="login_id"],
+input[name="login_pw"],
+#login_id,
+#login_pw,
+input[autocomplete="username"],
+input[autocomplete="current-password"],
+#securityCode,
+input[name*="security" i],
+.GB1112MainFormCreditCardNo,
+[id^="creditCardId_"],
+#sm-menu-card,
+.sm-menu
+{ filter: blur(8px) !important; -webkit-filter: blur(8px) !important; }
+"""
+
+MASKER_JS = """
+(target, css) => {
+  if (window.__eplusMasker) return;
+  const stats = { batches: 0, mutations: 0, scanned: 0, masked: 0, time_ms: 0 };
+  window.__eplusMasker = { stats };
+
+  // 1) 入力欄をぼかす
+  try {
+    const sheet = new CSSStyleSheet();
+    sheet.replaceSync(css);
+    document.adoptedStyleSheets = [...document.adoptedStyleSheets, sheet];
+  } catch (e) {
+    const addStyle = () => {
+      const style = document.createElement('style');
+      style.textContent = css;
+      (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) addStyle();
+    else document.addEventListener('DOMContentLoaded', addStyle, { once: true });
+  }
+  if (!target) return;
+
+  // 2) メールアドレスを伏字にする
+  const stars = '*'.repeat(8);
+  const maskText = (node) => {
+    stats.scanned++;
+    const value = node.nodeValue;
+    if (value && value.includes(target)) {
+      node.nodeValue = value.split(target).join(stars);
+      stats.masked++;
+    }
+  };
+  const scan = (root) => {
+    if (root.nodeType === Node.TEXT_NODE) return maskText(root);
+    if (root.nodeType === Node.DOCUMENT_NODE) root = root.documentElement;
+    if (!root || root.nodeType !== Node.ELEMENT_NODE) return;
+    // 部分木に対象文字列が無ければテキストノードを辿らない
+    if (!(root.textContent || '').includes(target)) {
+      stats.scanned++;
+      return;
+    }
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+    let node;
+    while ((node = walker.nextNode())) maskText(node);
+  };
+
+  const pending = new Set();
+  let scheduled = false;
+  const flush = () => {
+    scheduled = false;
+    const started = performance.now();
+    for (const node of pending) {
+      if (!node.isConnected) continue;
+      // 祖先も待ち行列にあればそちらの走査に含まれる
+      let parent = node.parentNode, covered = false;
+      while (parent) {
+        if (pending.has(parent)) { covered = true; break; }
+        parent = parent.parentNode;
+      }
+      if (!covered) scan(node);
+    }
+    pending.clear();
+    stats.batches++;
+    stats.time_ms += performance.now() - started;
+  };
+  const schedule = () => {
+    if (scheduled) return;
+    scheduled = true;
+    if (document.visibilityState === 'visible') requestAnimationFrame(flush);
+    else setTimeout(flush, 50);
+  };
+
+  const observer = new MutationObserver((records) => {
+    stats.mutations += records.length;
+    for (const record of records) {
+      if (record.type === 'characterData') pending.add(record.target);
+      else for (const node of record.addedNodes) pending.add(node);
+    }
+    if (pending.size) schedule();
+  });
+  observer.observe(document, { childList: true, subtree: true, characterData: true });
+  // 監視開始前にパース済みの分
+  pending.add(document);
+  schedule();
+}
+"""
+
+# 全フレームで集計を読むためのスクリプト（未導入なら null）
+MASK_STATS_JS = "() => window.__eplusMasker ? window.__eplusMasker.stats : null"
+
+
+def masker_script(email: str) -> str:
+    """add_init_script に渡すスクリプト（email が空ならCSSのみ）"""
+    return f"({MASKER_JS.strip()})({json.dumps(email)}, {json.dumps(MASK_CSS)});"
@@ -0,0 +1,214 @@
+"""リクエスト遮断（画像・フォント・広告/解析タグなど）
+
+context.route で全リクエストを受け、リソース種別とホストのパターンで
+遮断（abort）するか通すか（fallback）を決める。判定の優先順は
+
+    1. ページ遷移（document）は常に通す
+    2. allow_hosts に一致 → 通す
+    3. deny_hosts に一致 → 遮断
+    4. block_types に含まれる種別 → 遮断
+
+ホストのパターンは "example.com"（サブドメインも一致）か "*.example.com" 形式。
+遮断したバイト数はリクエストしない限り分からないため、過去に観測した
+Content-Length（response イベント）を URL ごとに記録しておき、その合計を推定値とする。
+
+注意: Playwright は route を登録したコンテキストでブラウザのHTTPキャッシュを使わない。
+"""
+
+import json
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Request, Response, Route
+
+# 広告・解析・計測タグの代表的な配信ホスト
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.com",
+    "ads-twitter.com",
+    "analytics.twitter.com",
+    "analytics.tiktok.com",
+    "yjtag.jp",
+    "criteo.com",
+    "criteo.net",
+    "adnxs.com",
+    "clarity.ms",
+    "hotjar.com",
+    "nr-data.net",
+)
+
+# reCAPTCHA などログインに必要な外部ホスト（lean/strict でも通す）
+CAPTCHA_HOSTS = ("www.google.com", "www.gstatic.com", "recaptcha.net")
+
+# サイズ推定テーブルの上限（古いものから捨てる）
+MAX_SIZE_HINTS = 5000
+
+
+@dataclass
+class ResourceProfile:
+    """遮断ルール一式"""
+
+    name: str
+    block_types: frozenset[str] = frozenset()
+    deny_hosts: tuple[str, ...] = ()
+    allow_hosts: tuple[str, ...] = ()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.deny_hosts)
+
+    def extended(self, block_types=(), deny_hosts=(), allow_hosts=()) -> "ResourceProfile":
+        """追加ルールを合成した新しいプロファイル"""
+        return ResourceProfile(
+            name=self.name,
+            block_types=self.block_types | frozenset(block_types),
+            deny_hosts=self.deny_hosts + tuple(deny_hosts),
+            allow_hosts=self.allow_hosts + tuple(allow_hosts),
+        )
+
+
+_LEAN_TYPES = frozenset({"image", "media", "font", "manifest", "texttrack"})
+
+PROFILES = {
+    "off": ResourceProfile("off"),
+    "lean": ResourceProfile("lean", _LEAN_TYPES, TRACKER_HOSTS, CAPTCHA_HOSTS),
+    "strict": ResourceProfile("strict", _LEAN_TYPES | {"stylesheet", "other"}, TRACKER_HOSTS, CAPTCHA_HOSTS),
+}
+
+
+def split_csv(value: str) -> list[str]:
+    """カンマ区切りの設定値をリスト化"""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def host_matches(host: str, pattern: str) -> bool:
+    """ホストがパターンに一致するか（ワイルドカード無しはサブドメインも一致）"""
+    host, pattern = host.lower(), pattern.lower()
+    if any(ch in pattern for ch in "*?["):
+        return fnmatch(host, pattern)
+    return host == pattern or host.endswith("." + pattern)
+
+
+def _strip_query(url: str) -> str:
+    return url.split("#", 1)[0].split("?", 1)[0]
+
+
+@dataclass
+class FilterStats:
+    """遮断カウンタ"""
+
+    allowed: int = 0
+    blocked: int = 0
+    blocked_bytes: int = 0  # 推定値（サイズ未観測のものは blocked_unknown_size に数える）
+    blocked_unknown_size: int = 0
+    by_type: dict[str, int] = field(default_factory=dict)
+    by_host: dict[str, int] = field(default_factory=dict)
+
+
+class ResourceFilter:
+    """context.route 用のリクエスト遮断ハンドラ
+
+    Args:
+        profile: 遮断ルール
+        sizes_path: 観測したレスポンスサイズの保存先（None なら保存しない）
+    """
+
+    def __init__(self, profile: ResourceProfile, sizes_path: Optional[Path] = None):
+        self.profile = profile
+        self.sizes_path = Path(sizes_path) if sizes_path else None
+        self.stats = FilterStats()
+        self._sizes: dict[str, int] = {}
+        self._dirty = False
+        if self.sizes_path:
+            try:
+                self._sizes = json.loads(self.sizes_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._sizes = {}
+
+    @classmethod
+    def from_settings(cls, config) -> "ResourceFilter":
+        profile = PROFILES[config.resource_profile].extended(
+            block_types=split_csv(config.block_resource_types),
+            deny_hosts=split_csv(config.block_hosts),
+            allow_hosts=split_csv(config.allow_hosts),
+        )
+        return cls(profile, config.resource_sizes_path)
+
+    def decide(self, url: str, resource_type: str, is_navigation: bool = False) -> Optional[str]:
+        """遮断理由（"host" / "type"）を返す。通す場合は None"""
+        if is_navigation or resource_type == "document":
+            return None
+        host = urlsplit(url).hostname or ""
+        if any(host_matches(host, p) for p in self.profile.allow_hosts):
+            return None
+        if any(host_matches(host, p) for p in self.profile.deny_hosts):
+            return "host"
+        if resource_type in self.profile.block_types:
+            return "type"
+        return None
+
+    async def handle(self, route: Route, request: Request):
+        """context.route("**/*", ...) に渡すハンドラ"""
+        reason = self.decide(request.url, request.resource_type, request.is_navigation_request())
+        if reason is None:
+            self.stats.allowed += 1
+            # 後から登録された別ハンドラ（キャッシュ等）にも回せるよう continue_ ではなく fallback
+            await route.fallback()
+            return
+
+        stats = self.stats
+        stats.blocked += 1
+        stats.by_type[request.resource_type] = stats.by_type.get(request.resource_type, 0) + 1
+        host = urlsplit(request.url).hostname or ""
+        stats.by_host[host] = stats.by_host.get(host, 0) + 1
+        size = self._sizes.get(_strip_query(request.url))
+        if size is None:
+            stats.blocked_unknown_size += 1
+        else:
+            stats.blocked_bytes += size
+        await route.abort("blockedbyclient")
+
+    def observe(self, response: Response):
+        """context.on("response") 用。Content-Length をサイズ推定テーブルに記録"""
+        length = response.headers.get("content-length")
+        if not length or not length.isdigit():
+            return
+        key = _strip_query(response.url)
+        if self._sizes.get(key) == int(length):
+            return
+        self._sizes.pop(key, None)
+        self._sizes[key] = int(length)
+        while len(self._sizes) > MAX_SIZE_HINTS:
+            self._sizes.pop(next(iter(self._sizes)))
+        self._dirty = True
+
+    def summary(self) -> dict:
+        """ログ・ベンチマーク出力用の集計"""
+        stats = self.stats
+        return {
+            "profile": self.profile.name,
+            "allowed": stats.allowed,
+            "blocked": stats.blocked,
+            "blocked_bytes": stats.blocked_bytes,
+            "blocked_unknown_size": stats.blocked_unknown_size,
+            "by_type": dict(sorted(stats.by_type.items(), key=lambda kv: -kv[1])),
+            "by_host": dict(sorted(stats.by_host.items(), key=lambda kv: -kv[1])[:10]),
+        }
+
+    def save(self):
+        """サイズ推定テーブルに変更があれば書き出す"""
+        if not self._dirty or not self.sizes_path:
+            return
+        self.sizes_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.sizes_path.with_suffix(self.sizes_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._sizes, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.sizes_path)
+        self._dirty = False
@@ -0,0 +1,217 @@
+"""一時的な失敗のリトライ（tenacity）
+
+ページ遷移・クリック・セレクタ待機で起きる一時的なエラー（通信断・タイムアウト・
+遷移中の実行コンテキスト破棄・オーバーレイによるクリック阻害など）だけを、
+指数バックオフ＋ジッターで再試行する。ページやブラウザが閉じた・要素が DOM から外れた・
+リクエスト遮断など、やり直しても結果が変わらないエラーは即座に呼び出し元へ返す。
+
+回数は操作ごとの RetryPolicy、合計時間はステップごとの予算（retry_budget）で制限する。
+BaseFlow.run_steps() は各ステップを retry_budget で囲むため、1ステップ内でリトライに費やす時間
+（最初の失敗から成功・断念まで）は合計 retry_step_budget_ms を超えない。再試行回数・待機時間はトレースのカウンタに記録する:
+    retries / retries.<操作> / retry_wait_ms / retry_giveups
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+from .trace import record
+
+T = TypeVar("T")
+
+# やり直しても変わらない（優先して判定する）
+FATAL_MARKERS = (
+    "Target closed",
+    "Target page, context or browser has been closed",
+    "Browser has been closed",
+    "Element is not attached to the DOM",
+    "Navigation failed because page crashed",
+    "net::ERR_BLOCKED_BY_CLIENT",  # リクエスト遮断（resource_filter）
+    "net::ERR_ABORTED",  # 別の遷移で中断された
+)
+
+# 一時的（時間をおけば通る可能性がある）
+RETRYABLE_MARKERS = (
+    "net::ERR_CONNECTION_RESET",
+    "net::ERR_CONNECTION_CLOSED",
+    "net::ERR_CONNECTION_REFUSED",
+    "net::ERR_CONNECTION_TIMED_OUT",
+    "net::ERR_TIMED_OUT",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_NETWORK_CHANGED",
+    "net::ERR_INTERNET_DISCONNECTED",
+    "net::ERR_HTTP2_PROTOCOL_ERROR",
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+    "intercepts pointer events",
+    "Element is not visible",
+    "Element is not stable",
+    "Element is not enabled",
+    "Element is outside of the viewport",
+)
+
+
+def _has_marker(exc: BaseException, markers: tuple[str, ...]) -> bool:
+    message = str(exc).lower()
+    return any(marker.lower() in message for marker in markers)
+
+
+def is_fatal(exc: BaseException) -> bool:
+    """やり直しても変わらないエラーか（Playwright 以外の例外も含む）"""
+    return not isinstance(exc, PlaywrightError) or _has_marker(exc, FATAL_MARKERS)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Playwright のエラーが再試行で解消しうるか（タイムアウトを含む）"""
+    if is_fatal(exc):
+        return False
+    return isinstance(exc, PlaywrightTimeoutError) or _has_marker(exc, RETRYABLE_MARKERS)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """タイムアウト以外の一時的なエラーか（待機の上限を使い切ったタイムアウトは再試行しない）"""
+    return is_retryable(exc) and not isinstance(exc, PlaywrightTimeoutError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """操作ごとの再試行方針
+
+    Args:
+        attempts: 最大試行回数（1なら再試行しない）
+        initial_ms: 1回目の再試行前の待機（以降は倍々）
+        max_ms: 待機の上限
+        jitter_ms: 待機に加える乱数幅（同時に失敗した操作の再試行をずらす）
+    """
+
+    attempts: int = 3
+    initial_ms: int = 200
+    max_ms: int = 2000
+    jitter_ms: int = 200
+
+
+# 操作ごとの既定値（回数は retry_max_attempts で上書き）
+POLICIES = {
+    "goto": RetryPolicy(initial_ms=500, max_ms=4000, jitter_ms=500),
+    "click": RetryPolicy(initial_ms=100, max_ms=1000, jitter_ms=100),
+    "selector": RetryPolicy(initial_ms=100, max_ms=1000, jitter_ms=100),
+}
+
+class RetryBudget:
+    """ステップ内のリトライに使える合計時間
+
+    最初の失敗から成功（または断念）までの時間を消費として数える。
+    発売待ちのように正常な待機が長いステップでも、リトライの分だけが予算から引かれる。
+    """
+
+    def __init__(self, ms: int):
+        self.total = ms / 1000
+        self.spent = 0.0
+
+    def left(self, since: Optional[float] = None) -> float:
+        """残り秒数（since: 進行中のリトライが始まった time.monotonic()）"""
+        running = time.monotonic() - since if since is not None else 0.0
+        return self.total - self.spent - running
+
+
+_budget: ContextVar[Optional[RetryBudget]] = ContextVar("retry_budget", default=None)
+
+
+@contextmanager
+def retry_budget(ms: Optional[int]):
+    """この中で行うリトライの合計時間を ms に制限する（0/None は無制限）"""
+    token = _budget.set(RetryBudget(ms) if ms else None)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+class Retrier:
+    """設定に従って操作を再試行する
+
+    Args:
+        enabled: False なら1回だけ実行する
+        max_attempts: 全操作の最大試行回数（0なら POLICIES の値）
+    """
+
+    def __init__(self, enabled: bool = True, max_attempts: int = 0):
+        self.enabled = enabled
+        self.max_attempts = max_attempts
+
+    @classmethod
+    def from_settings(cls, config) -> "Retrier":
+        return cls(config.retry_enabled, config.retry_max_attempts)
+
+    def policy(self, op: str) -> RetryPolicy:
+        policy = POLICIES.get(op, RetryPolicy())
+        if not self.enabled:
+            return RetryPolicy(attempts=1)
+        if self.max_attempts > 0:
+            return RetryPolicy(self.max_attempts, policy.initial_ms, policy.max_ms, policy.jitter_ms)
+        return policy
+
+    async def call(
+        self,
+        op: str,
+        fn: Callable[[int], Awaitable[T]],
+        retryable: Callable[[BaseException], bool] = is_retryable,
+    ) -> T:
+        """fn(試行番号) を実行し、retryable なエラーなら方針に従って再試行する
+
+        再試行し尽くした・再試行できないエラーはそのまま送出する。
+        """
+        policy = self.policy(op)
+        budget = _budget.get()
+        first_failure: Optional[float] = None
+        backoff = wait_exponential_jitter(
+            initial=policy.initial_ms / 1000, max=policy.max_ms / 1000, jitter=policy.jitter_ms / 1000
+        )
+
+        def after(retry_state):
+            nonlocal first_failure
+            if first_failure is None:
+                first_failure = time.monotonic()
+
+        def budget_spent(retry_state) -> bool:
+            return budget is not None and budget.left(first_failure) <= 0
+
+        def wait(retry_state) -> float:
+            # 待機はステップ予算の残りまでに切り詰める
+            seconds = backoff(retry_state)
+            if budget is not None:
+                seconds = min(seconds, max(0.0, budget.left(first_failure)))
+            return seconds
+
+        def before_sleep(retry_state):
+            wait_ms = (retry_state.next_action.sleep if retry_state.next_action else 0) * 1000
+            record("retries")
+            record(f"retries.{op}")
+            record("retry_wait_ms", wait_ms)
+
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(policy.attempts) | budget_spent,
+            wait=wait,
+            retry=retry_if_exception(retryable),
+            after=after,
+            before_sleep=before_sleep,
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    result = await fn(attempt.retry_state.attempt_number)
+            return result
+        except BaseException as e:
+            if retryable(e):
+                record("retry_giveups")
+            raise
+        finally:
+            if budget is not None and first_failure is not None:
+                budget.spent += time.monotonic() - first_failure
@@ -0,0 +1,103 @@
+"""セレクタ的中キャッシュ
+
+候補セレクタのうち実際にヒットしたものを「フロー.ステップ@URLパターン」単位で
+JSON に記録し、次回以降はそのセレクタだけを先に照会する。
+ページ構造が変わって当たらなくなったエントリは連続ミス回数で破棄する。
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+def url_pattern(url: str) -> str:
+    """URLをパターン化（クエリを除き、数字を含むパス要素を * に置換）
+
+    例: https://eplus.jp/sf/detail/0424600001-P0030270?x=1 → eplus.jp/sf/detail/*
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    segments = ["*" if re.search(r"\d", seg) else seg for seg in parts.path.split("/")]
+    return f"{parts.netloc}{'/'.join(segments)}"
+
+
+class SelectorCache:
+    """セレクタ的中キャッシュ（JSONファイル）
+
+    Args:
+        path: 保存先のJSONファイル
+        max_misses: 連続でこの回数当たらなかったエントリを破棄する
+    """
+
+    def __init__(self, path: Path, max_misses: int = 3):
+        self.path = Path(path)
+        self.max_misses = max_misses
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._entries: dict[str, dict] = {}
+        try:
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def make_key(name: str, url: str) -> str:
+        """キャッシュキー（例: "first_come.step4.email@eplus.jp/sf/detail/*"）"""
+        return f"{name}@{url_pattern(url)}"
+
+    def winner(self, key: str, selectors: list[str]) -> Optional[str]:
+        """前回ヒットしたセレクタ（現在の候補に含まれる場合のみ）"""
+        entry = self._entries.get(key)
+        if entry and entry.get("selector") in selectors:
+            return entry["selector"]
+        return None
+
+    def record(self, key: str, selector: Optional[str]):
+        """探索結果を記録（selector=None は全候補ミス）"""
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is None:
+            if selector:
+                self._entries[key] = {"selector": selector, "hits": 0, "misses": 0, "updated": now}
+                self._dirty = True
+            return
+
+        if selector == entry.get("selector"):
+            self.hits += 1
+            entry.update(hits=entry.get("hits", 0) + 1, misses=0, updated=now)
+        elif selector:
+            # 別の候補がヒットした → 勝者を置き換え
+            self.misses += 1
+            self._entries[key] = {"selector": selector, "hits": 0, "misses": 0, "updated": now}
+        else:
+            self.misses += 1
+            entry.update(misses=entry.get("misses", 0) + 1, updated=now)
+            if entry["misses"] >= self.max_misses:
+                del self._entries[key]
+                self.evictions += 1
+        self._dirty = True
+
+    def stats(self) -> dict:
+        """今回の実行でのヒット/ミス/破棄数とエントリ数"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+    def save(self):
+        """変更があればJSONに書き出す"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
@@ -0,0 +1,95 @@
+"""ログイン状態（storage_state）の暗号化保存
+
+Playwright の storage_state（Cookie と localStorage）を Fernet（AES-128-CBC + HMAC-SHA256）で
+暗号化してファイルに保存し、次回の BrowserHelper.start() で読み込む。
+鍵は SESSION_KEY、未設定ならログイン情報（メール＋パスワード）とファイルごとの salt から PBKDF2 で導出する。
+
+読み込み時は次の場合に破棄する（None を返す）:
+- 保存から session_max_age_minutes を過ぎた（Fernet のタイムスタンプで判定）
+- 改ざん・鍵違いで復号できない
+- 有効期限内の Cookie が1つも残っていない
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+_PBKDF2_ITERATIONS = 200_000
+
+
+class SessionStore:
+    """storage_state の暗号化ファイル
+
+    Args:
+        path: 保存先
+        secret: 鍵の元になる文字列（SESSION_KEY またはログイン情報）
+        max_age_seconds: 保存からの有効秒数
+    """
+
+    def __init__(self, path: Path, secret: str, max_age_seconds: int):
+        self.path = Path(path)
+        self.secret = secret
+        self.max_age_seconds = max_age_seconds
+        # 鍵導出（PBKDF2）は重いので、読み込んだ salt の鍵を保存時にも使い回す
+        self._salt: Optional[bytes] = None
+        self._cipher = None
+
+    @classmethod
+    def from_settings(cls, config) -> "SessionStore":
+        secret = config.session_key or f"{config.eplus_email}\n{config.eplus_password}"
+        return cls(config.session_state_path, secret, config.session_max_age_minutes * 60)
+
+    def _fernet(self, salt: bytes):
+        # cryptography はこの機能を使うときだけ読み込む
+        from cryptography.fernet import Fernet
+
+        if self._salt != salt:
+            key = hashlib.pbkdf2_hmac("sha256", self.secret.encode("utf-8"), salt, _PBKDF2_ITERATIONS)
+            self._salt, self._cipher = salt, Fernet(base64.urlsafe_b64encode(key))
+        return self._cipher
+
+    def load(self) -> Optional[dict]:
+        """有効な storage_state を返す（無い・期限切れ・復号不可なら None）"""
+        from cryptography.fernet import InvalidToken
+
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            salt = base64.b64decode(payload["salt"])
+            token = payload["token"].encode("ascii")
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        try:
+            state = json.loads(self._fernet(salt).decrypt(token, ttl=self.max_age_seconds))
+        except (InvalidToken, ValueError):
+            # 期限切れ・鍵違い（ログイン情報の変更を含む）・改ざん
+            self.clear()
+            return None
+
+        now = time.time()
+        cookies = [c for c in state.get("cookies", []) if c.get("expires", -1) <= 0 or c["expires"] > now]
+        if not cookies:
+            self.clear()
+            return None
+        state["cookies"] = cookies
+        return state
+
+    def save(self, state: dict):
+        """storage_state を暗号化して保存（所有者のみ読み書き可）"""
+        salt = self._salt or os.urandom(16)
+        token = self._fernet(salt).encrypt(json.dumps(state, ensure_ascii=False).encode("utf-8"))
+        payload = {"v": 1, "salt": base64.b64encode(salt).decode("ascii"), "token": token.decode("ascii")}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        tmp.replace(self.path)
+
+    def clear(self):
+        """保存済みのログイン状態を削除"""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,184 @@
+"""選択肢の文言とキーワードの照合
+
+ページ上のラベル（<option> やラジオのラベル）と設定のキーワードを、全角/半角・NBSP・大文字小文字の
+違いを吸収して比べる。正規化（NFKC）の結果はメモ化し、設定のキーワードは Keywords.from_settings() で
+1回だけ前処理する。
+
+一致の強さ（best() はこの順に探し、rank() はこの順に並べる。同じ強さなら元の並び順）:
+    exact   : 正規化後の文言が完全に一致
+    partial : キーワードがラベルに含まれる
+    fuzzy   : 区切り（空白・記号）で分けた語がすべてラベルに含まれ、日付を含む場合は年/月/日も一致する
+              （例: "11月15日 S席" → "2025/11/15(土) S席（大人）"）
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Sequence, Union
+
+EXACT = "exact"
+PARTIAL = "partial"
+FUZZY = "fuzzy"
+_TIER_RANK = {EXACT: 3, PARTIAL: 2, FUZZY: 1}
+
+# 年/月/日（2025/11/15, 2025年11月15日, 2025-11-15）
+_FULL_DATE = re.compile(r"(\d{4})\s*[/年.\-]\s*(\d{1,2})\s*[/月.\-]\s*(\d{1,2})日?")
+# 月/日（11/15, 11月15日）
+_MONTH_DAY = re.compile(r"(?<![\d/])(\d{1,2})\s*[/月]\s*(\d{1,2})(?![\d/])日?")
+# 日のみ（15日）
+_DAY_ONLY = re.compile(r"(?<![\d/月])(\d{1,2})日")
+_SEPARATORS = re.compile(r"[\s,、・/()（）\[\]【】「」]+")
+
+Date = tuple[Optional[int], Optional[int], Optional[int]]
+
+
+@lru_cache(maxsize=8192)
+def normalize(text: Optional[str]) -> str:
+    """全角→半角（NFKC）、NBSP・全角空白→空白、前後空白除去、lower"""
+    t = unicodedata.normalize("NFKC", text or "").replace("\xa0", " ").replace("\u3000", " ").strip()
+    return t.lower()
+
+
+def _dates(text: str) -> tuple[tuple[Date, ...], str]:
+    """正規化済みの文言から日付を取り出す（戻り値: 日付の一覧, 日付部分を除いた残り）"""
+    found: list[Date] = []
+
+    def take(pattern: re.Pattern, build, s: str) -> str:
+        def repl(m: re.Match) -> str:
+            found.append(build(m))
+            return " "
+        return pattern.sub(repl, s)
+
+    rest = take(_FULL_DATE, lambda m: (int(m[1]), int(m[2]), int(m[3])), text)
+    rest = take(_MONTH_DAY, lambda m: (None, int(m[1]), int(m[2])), rest)
+    rest = take(_DAY_ONLY, lambda m: (None, None, int(m[1])), rest)
+    return tuple(found), rest
+
+
+@lru_cache(maxsize=8192)
+def _label_dates(label: str) -> tuple[Date, ...]:
+    return _dates(label)[0]
+
+
+def _same_date(wanted: Date, dates: tuple[Date, ...]) -> bool:
+    """キーワード側で指定された部分（年/月/日）がすべて一致する日付がラベルにあるか"""
+    return any(
+        all(w is None or w == d for w, d in zip(wanted, date))
+        for date in dates
+    )
+
+
+@dataclass(frozen=True)
+class Match:
+    """照合結果（index は候補一覧での位置、text は正規化済みの文言）"""
+
+    index: int
+    text: str
+    tier: str
+
+
+class Keyword:
+    """前処理済みのキーワード（compile_keyword() で作る）"""
+
+    def __init__(self, raw: str):
+        self.raw = raw or ""
+        self.text = normalize(self.raw)
+        dates, rest = _dates(self.text)
+        self.dates = dates
+        self.tokens = tuple(t for t in _SEPARATORS.split(rest) if t)
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    def __repr__(self) -> str:
+        return f"Keyword({self.raw!r})"
+
+    def _fuzzy(self, label: str) -> bool:
+        if not (self.dates or len(self.tokens) > 1):
+            return False
+        if any(token not in label for token in self.tokens):
+            return False
+        if self.dates:
+            dates = _label_dates(label)
+            return all(_same_date(wanted, dates) for wanted in self.dates)
+        return True
+
+    def tier(self, label: str) -> Optional[str]:
+        """正規化済みのラベルとの一致の強さ（一致しなければ None）"""
+        if not self.text:
+            return None
+        if label == self.text:
+            return EXACT
+        if self.text in label:
+            return PARTIAL
+        return FUZZY if self._fuzzy(label) else None
+
+    def rank(self, labels: Sequence[Optional[str]]) -> list[Match]:
+        """一致した候補を強い順に返す（同じ強さなら元の並び順）"""
+        matches = []
+        for index, raw in enumerate(labels):
+            text = normalize(raw)
+            tier = self.tier(text)
+            if tier:
+                matches.append(Match(index, text, tier))
+        matches.sort(key=lambda m: -_TIER_RANK[m.tier])
+        return matches
+
+    def best(
+        self, labels: Sequence[Optional[str]], eligible: Optional[Callable[[int], bool]] = None
+    ) -> Optional[Match]:
+        """一番強く一致した候補（eligible(index) が False の候補は除く）
+
+        完全一致が見つかればそこで打ち切り、語・日付の照合は完全一致・部分一致が無いときだけ行う。
+        """
+        if not self.text:
+            return None
+        texts = [normalize(raw) for raw in labels]
+        partial: Optional[Match] = None
+        for index, text in enumerate(texts):
+            if eligible and not eligible(index):
+                continue
+            if text == self.text:
+                return Match(index, text, EXACT)
+            if partial is None and self.text in text:
+                partial = Match(index, text, PARTIAL)
+        if partial:
+            return partial
+        for index, text in enumerate(texts):
+            if (not eligible or eligible(index)) and self._fuzzy(text):
+                return Match(index, text, FUZZY)
+        return None
+
+    def mentions(self, *needles: str) -> bool:
+        """キーワードにいずれかの語が含まれるか（例: 支払方法の指定に「クレジット」が入っているか）"""
+        return any(normalize(n) in self.text for n in needles)
+
+
+@lru_cache(maxsize=1024)
+def compile_keyword(text: Optional[str]) -> Keyword:
+    """キーワードを前処理する（同じ文字列は使い回す）"""
+    return Keyword(text or "")
+
+
+def as_keyword(keyword: Union[Keyword, str, None]) -> Keyword:
+    return keyword if isinstance(keyword, Keyword) else compile_keyword(keyword)
+
+
+@dataclass(frozen=True)
+class Keywords:
+    """設定のキーワード（公演日時・席種・支払方法・受取方法）を前処理したもの"""
+
+    performance: Keyword
+    seat_type: Keyword
+    payment_method: Keyword
+    delivery_method: Keyword
+
+    @classmethod
+    def from_settings(cls, config) -> "Keywords":
+        return cls(
+            performance=compile_keyword(config.performance_keyword),
+            seat_type=compile_keyword(config.seat_type_keyword),
+            payment_method=compile_keyword(config.payment_method),
+            delivery_method=compile_keyword(config.delivery_method),
+        )
@@ -0,0 +1,149 @@
+"""ステップ単位の軽量トレース
+
+    async with span("step3.select_perf") as sp:
+        ...
+        record("selector_attempts", 6)
+
+スパンごとに開始/終了時刻・所要時間・カウンタ（セレクタ照会数、リトライ数、
+スクリーンショット/遷移にかかった時間など）を記録し、JSONL に1行ずつ書き出す。
+子スパンのカウンタは終了時に親スパンへ合算される。
+トレーサーは BrowserHelper.start() で有効化され、BaseFlow の execute() と
+_step* メソッドは自動的にスパンで囲まれる。
+"""
+
+import itertools
+import json
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+_ids = itertools.count(1)
+
+
+class Span:
+    """1区間の計測値"""
+
+    __slots__ = ("id", "name", "parent", "attrs", "counters", "start", "end", "error", "_t0", "duration_ms")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: dict):
+        self.id = next(_ids)
+        self.name = name
+        self.parent = parent
+        self.attrs = dict(attrs)
+        self.counters: dict[str, float] = {}
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._t0 = time.perf_counter()
+        self.duration_ms = 0.0
+
+    def add(self, key: str, amount: float = 1):
+        """カウンタを加算"""
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, **attrs):
+        """属性を追加"""
+        self.attrs.update(attrs)
+
+    def finish(self):
+        self.end = time.time()
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000
+        if self.parent is not None:
+            for key, value in self.counters.items():
+                self.parent.add(key, value)
+
+    def to_dict(self) -> dict:
+        return {
+            "span_id": self.id,
+            "parent_id": self.parent.id if self.parent else None,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "end": round(self.end or self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "attrs": self.attrs,
+            "counters": {k: round(v, 3) for k, v in self.counters.items()},
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """スパンを JSONL ファイルに書き出す（path=None ならファイルには書かない）
+
+    ステップ（_step* のスパンと最上位のスパン）の時間帯と成否は windows にも残す（録画の切り出しに使う）。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.windows: list[dict] = []
+        self._file = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def emit(self, span: Span):
+        is_step = "._step" in span.name
+        if is_step or span.parent is None:
+            failed = (
+                span.error is not None
+                or span.attrs.get("ok") is False
+                or span.attrs.get("success") is False
+            )
+            self.windows.append({
+                "name": span.name,
+                "start": span.start,
+                "end": span.end or span.start,
+                "step": is_step,
+                "failed": failed,
+            })
+        if self._file:
+            self._file.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """現在のコンテキストで使うトレーサーを設定（None で無効化）"""
+    _tracer.set(tracer)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@asynccontextmanager
+async def span(name: str, **attrs):
+    """区間を計測するスパン（トレーサー未設定でも動作し、書き出しのみ省略）"""
+    parent = _current.get()
+    sp = Span(name, parent, attrs)
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        sp.finish()
+        try:
+            _current.reset(token)
+        except ValueError:
+            # 別コンテキストで閉じられた場合は復元できないため無視
+            pass
+        tracer = _tracer.get()
+        if tracer:
+            tracer.emit(sp)
+
+
+def record(key: str, amount: float = 1):
+    """現在のスパンのカウンタを加算（スパン外では何もしない）"""
+    sp = _current.get()
+    if sp is not None:
+        sp.add(key, amount)
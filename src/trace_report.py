@@ -0,0 +1,259 @@
+"""Playwright トレースの集計レポート
+
+TRACE_ENABLED=true で保存した traces/playwright_*.zip を読み、フローのステップごとに
+遅い操作・待機・ネットワークリクエストを一覧表示する。
+同じ時刻印のスパンJSONL（traces/trace_*.jsonl）があれば、その _step* スパンの
+時間帯で各操作をステップに振り分ける（無ければ全体を1区間として扱う）。
+
+使用例:
+    python -m src.trace_report traces/playwright_20251101_100000.zip
+    python -m src.trace_report traces/playwright_20251101_100000.zip --top 5 --json
+"""
+
+import argparse
+import json
+import sys
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# 「待機」として扱う API 名の一部
+WAIT_KEYWORDS = ("wait", "expect")
+WHOLE_RUN = "(全体)"
+
+
+@dataclass
+class TraceItem:
+    """操作・待機・リクエスト1件分（start はエポック秒。対応付け不能なら None）"""
+
+    kind: str  # action / wait / network
+    name: str
+    duration_ms: float
+    start: Optional[float] = None
+    detail: str = ""
+    error: str = ""
+    step: str = WHOLE_RUN
+
+
+@dataclass
+class StepWindow:
+    """スパンJSONLから得たステップの時間帯"""
+
+    name: str
+    start: float
+    end: float
+    items: list[TraceItem] = field(default_factory=list)
+
+
+def _json_lines(raw: bytes):
+    for line in raw.decode("utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def _describe_params(params: dict) -> str:
+    """操作の対象（セレクタやURL）を短く表す"""
+    for key in ("selector", "url", "expression", "state", "name"):
+        value = params.get(key)
+        if value:
+            text = str(value).replace("\n", " ")
+            return text if len(text) <= 80 else text[:77] + "..."
+    return ""
+
+
+def parse_iso(value: str) -> Optional[float]:
+    """ISO 8601 の日時（HAR の startedDateTime など）をエポック秒に変換する（解釈できなければ None）"""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return None
+
+
+def load_playwright_trace(path: Path) -> list[TraceItem]:
+    """トレース zip から操作・待機・リクエストを取り出す"""
+    items: list[TraceItem] = []
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        # 単調時刻(ms) → エポック秒 の換算オフセット（context-options の wallTime/monotonicTime）
+        offset: Optional[float] = None
+        calls: dict[str, dict] = {}
+        for name in (n for n in names if n.endswith(".trace")):
+            for event in _json_lines(zf.read(name)):
+                etype = event.get("type")
+                if etype == "context-options":
+                    wall, mono = event.get("wallTime"), event.get("monotonicTime")
+                    if wall is not None and mono is not None:
+                        offset = wall - mono
+                elif etype == "before":
+                    calls[event.get("callId", "")] = {
+                        "api": event.get("apiName") or f"{event.get('class', '')}.{event.get('method', '')}",
+                        "start": event.get("startTime"),
+                        "params": event.get("params") or {},
+                    }
+                elif etype == "after":
+                    call = calls.get(event.get("callId", ""))
+                    if call is not None:
+                        call["end"] = event.get("endTime")
+                        error = event.get("error") or {}
+                        call["error"] = (error.get("error") or error).get("message", "") if error else ""
+                elif etype == "action":
+                    # 旧形式（before/after に分かれていないもの）
+                    meta = event.get("metadata") or {}
+                    calls[meta.get("id", str(len(calls)))] = {
+                        "api": meta.get("apiName") or f"{meta.get('type', '')}.{meta.get('method', '')}",
+                        "start": meta.get("startTime"),
+                        "end": meta.get("endTime"),
+                        "params": meta.get("params") or {},
+                        "error": ((meta.get("error") or {}).get("error") or {}).get("message", ""),
+                    }
+
+        for call in calls.values():
+            start, end = call.get("start"), call.get("end")
+            if start is None or end is None:
+                continue
+            api = call["api"]
+            items.append(TraceItem(
+                kind="wait" if any(k in api.lower() for k in WAIT_KEYWORDS) else "action",
+                name=api,
+                duration_ms=float(end) - float(start),
+                start=(offset + float(start)) / 1000 if offset is not None else None,
+                detail=_describe_params(call["params"]),
+                error=call.get("error", ""),
+            ))
+
+        for name in (n for n in names if n.endswith(".network")):
+            for event in _json_lines(zf.read(name)):
+                if event.get("type") != "resource-snapshot":
+                    continue
+                snap = event.get("snapshot") or {}
+                request = snap.get("request") or {}
+                response = snap.get("response") or {}
+                size = response.get("_transferSize")
+                if size is None or size < 0:
+                    size = (response.get("content") or {}).get("size", 0)
+                status = response.get("status", "")
+                items.append(TraceItem(
+                    kind="network",
+                    name=f"{request.get('method', 'GET')} {request.get('url', '')}",
+                    duration_ms=float(snap.get("time") or 0),
+                    start=parse_iso(snap.get("startedDateTime", "")),
+                    detail=f"status={status} size={size}",
+                ))
+    return items
+
+
+def load_step_windows(path: Path) -> list[StepWindow]:
+    """スパンJSONLからステップ（_step* のスパン、無ければ最上位スパン）の時間帯を取り出す"""
+    spans = list(_json_lines(path.read_bytes()))
+    steps = [s for s in spans if "._step" in s.get("name", "")]
+    if not steps:
+        steps = [s for s in spans if s.get("parent_id") is None]
+    windows = [StepWindow(s["name"], s["start"], s["end"]) for s in steps if "start" in s and "end" in s]
+    return sorted(windows, key=lambda w: w.start)
+
+
+def companion_spans(trace_zip: Path) -> Optional[Path]:
+    """playwright_<時刻印>.zip に対応する trace_<時刻印>.jsonl"""
+    stem = trace_zip.stem
+    if not stem.startswith("playwright_"):
+        return None
+    candidate = trace_zip.with_name(f"trace_{stem[len('playwright_'):]}.jsonl")
+    return candidate if candidate.exists() else None
+
+
+def assign_steps(items: list[TraceItem], windows: list[StepWindow]) -> dict[str, list[TraceItem]]:
+    """開始時刻が含まれるステップに振り分ける（どれにも入らないものは「(全体)」）"""
+    grouped: dict[str, list[TraceItem]] = {w.name: [] for w in windows}
+    for item in items:
+        step = WHOLE_RUN
+        if item.start is not None:
+            # 入れ子の場合に備え、最後に始まった（最も内側の）区間を採用
+            for w in windows:
+                if w.start <= item.start <= w.end:
+                    step = w.name
+        item.step = step
+        grouped.setdefault(step, []).append(item)
+    return grouped
+
+
+def build_report(trace_zip: Path, spans: Optional[Path] = None, top: int = 10) -> dict:
+    """ステップ別に遅い順の上位 N 件をまとめる"""
+    items = load_playwright_trace(trace_zip)
+    spans = spans or companion_spans(trace_zip)
+    windows = load_step_windows(spans) if spans else []
+    grouped = assign_steps(items, windows)
+    durations = {w.name: round((w.end - w.start) * 1000, 1) for w in windows}
+
+    steps = {}
+    for step, step_items in grouped.items():
+        if not step_items:
+            continue
+        section = {"duration_ms": durations.get(step)}
+        for kind in ("action", "wait", "network"):
+            of_kind = sorted((i for i in step_items if i.kind == kind), key=lambda i: -i.duration_ms)
+            section[kind] = {
+                "count": len(of_kind),
+                "total_ms": round(sum(i.duration_ms for i in of_kind), 1),
+                "slowest": [
+                    {k: v for k, v in asdict(i).items() if k in ("name", "duration_ms", "detail", "error")}
+                    for i in of_kind[:top]
+                ],
+            }
+        steps[step] = section
+
+    return {
+        "trace": str(trace_zip),
+        "spans": str(spans) if spans else None,
+        "steps": steps,
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"🧵 {report['trace']}"]
+    if report["spans"]:
+        lines.append(f"   ステップ区間: {report['spans']}")
+    labels = {"action": "操作", "wait": "待機", "network": "通信"}
+    for step, section in report["steps"].items():
+        duration = section["duration_ms"]
+        lines.append("")
+        lines.append(f"■ {step}" + (f"  ({duration:.0f}ms)" if duration is not None else ""))
+        for kind, label in labels.items():
+            data = section[kind]
+            if not data["count"]:
+                continue
+            lines.append(f"  [{label}] {data['count']}件 / 合計 {data['total_ms']:.0f}ms")
+            for entry in data["slowest"]:
+                detail = f"  {entry['detail']}" if entry["detail"] else ""
+                error = f"  ❌ {entry['error']}" if entry["error"] else ""
+                lines.append(f"    {entry['duration_ms']:8.1f}ms  {entry['name']}{detail}{error}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Playwright トレースのステップ別ホットパス集計")
+    parser.add_argument("trace", type=Path, help="playwright_*.zip")
+    parser.add_argument("--spans", type=Path, default=None, help="スパンJSONL（省略時は同じ時刻印のものを自動検出）")
+    parser.add_argument("--top", type=int, default=10, help="種類ごとに表示する件数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力")
+    args = parser.parse_args(argv)
+
+    if not args.trace.exists():
+        print(f"❌ トレースが見つかりません: {args.trace}", file=sys.stderr)
+        return 1
+    report = build_report(args.trace, args.spans, args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""録画の保持（実行後の切り出し・削除）
+
+VIDEO_RETENTION に応じて、BrowserHelper.stop() が書き出したジョブ（録画ファイルと各ステップの時間帯）を
+別プロセスで処理する。stop() は起動するだけで待たない。
+
+    always          : そのまま残す（ジョブを作らない）
+    on-failure      : 失敗したステップの区間（前後 video_clip_padding_seconds 秒を含む）だけを切り出して残し、
+                      元の録画は削除する。失敗が無ければ録画ごと削除する
+    last-n-minutes  : 各録画の最後の video_last_minutes 分だけを残す
+
+切り出しは ffmpeg のストリームコピー（再エンコードなし）で行うため、区間の境界はキーフレーム単位になる。
+ffmpeg が見つからない場合は切り出さずに元の録画を残す（on-failure で失敗が無い場合の削除は行う）。
+
+使用例（通常は BrowserHelper が自動で起動する）:
+    python -m src.video_retention videos/.retention_20250101_120000.json
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def spawn(job: dict, job_path: Path) -> Optional[subprocess.Popen]:
+    """ジョブを書き出し、処理プロセスをバックグラウンドで起動する（終了は待たない）"""
+    job_path.parent.mkdir(parents=True, exist_ok=True)
+    job_path.write_text(json.dumps(job, ensure_ascii=False, indent=2), encoding="utf-8")
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW}
+    else:
+        detach = {"start_new_session": True}
+    # 結果は同じフォルダの retention.log に追記する
+    log = open(job_path.parent / "retention.log", "a", encoding="utf-8")
+    try:
+        return subprocess.Popen(
+            [sys.executable, "-m", "src.video_retention", str(job_path)],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            **detach,
+        )
+    finally:
+        log.close()
+
+
+def failed_windows(video: dict, windows: list[dict]) -> list[dict]:
+    """録画の時間帯と重なる失敗区間（失敗したステップがあればそれだけ、無ければ失敗した最上位スパン）"""
+    overlapping = [
+        w for w in windows
+        if w.get("failed") and w["end"] >= video["started"] and w["start"] <= video["ended"]
+    ]
+    steps = [w for w in overlapping if w.get("step")]
+    return steps or overlapping
+
+
+def clip_name(video_path: Path, index: int, window: dict) -> Path:
+    step = re.sub(r"[^\w.-]+", "_", window["name"].rsplit(".", 1)[-1]).strip("_") or "step"
+    return video_path.with_name(f"{video_path.stem}_{index:02d}_{step}{video_path.suffix}")
+
+
+def cut(ffmpeg: str, src: Path, dst: Path, start: float, duration: Optional[float] = None) -> bool:
+    """src の start 秒から duration 秒（省略時は最後まで）を再エンコードせずに書き出す"""
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-ss", f"{max(0.0, start):.3f}", "-i", str(src)]
+    if duration is not None:
+        cmd += ["-t", f"{max(0.1, duration):.3f}"]
+    cmd += ["-c", "copy", str(dst)]
+    try:
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL, timeout=600)
+        return dst.exists() and dst.stat().st_size > 0
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"⚠️ 切り出しに失敗: {src.name} ({e})")
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def process(job: dict) -> dict:
+    """ジョブを処理し、{kept, removed, clips, bytes_before, bytes_after} を返す"""
+    mode = job["mode"]
+    ffmpeg = shutil.which(job.get("ffmpeg") or "ffmpeg")
+    pad = float(job.get("padding_seconds", 3))
+    summary = {"kept": 0, "removed": 0, "clips": 0, "bytes_before": 0, "bytes_after": 0}
+
+    for video in job["videos"]:
+        src = Path(video["path"])
+        # 録画の書き出しが終わるまで少し待つ（stop() の直後に起動されるため）
+        for _ in range(50):
+            if src.exists():
+                break
+            time.sleep(0.1)
+        if not src.exists():
+            continue
+        size = src.stat().st_size
+        summary["bytes_before"] += size
+
+        if mode == "on-failure":
+            windows = failed_windows(video, job.get("windows", []))
+            if not windows:
+                src.unlink()
+                summary["removed"] += 1
+                continue
+            if not ffmpeg:
+                print(f"⚠️ ffmpeg が無いため切り出さずに残します: {src.name}")
+                summary["kept"] += 1
+                summary["bytes_after"] += size
+                continue
+            clips = []
+            for index, w in enumerate(windows, 1):
+                start = w["start"] - video["started"] - pad
+                end = w["end"] - video["started"] + pad
+                dst = clip_name(src, index, w)
+                if cut(ffmpeg, src, dst, start, end - max(0.0, start)):
+                    clips.append(dst)
+            if len(clips) == len(windows):
+                src.unlink()
+                summary["removed"] += 1
+            else:
+                summary["kept"] += 1
+                summary["bytes_after"] += size
+            summary["clips"] += len(clips)
+            summary["bytes_after"] += sum(c.stat().st_size for c in clips)
+
+        elif mode == "last-n-minutes":
+            keep_seconds = float(job.get("last_minutes", 5)) * 60
+            length = video["ended"] - video["started"]
+            if length <= keep_seconds or not ffmpeg:
+                if not ffmpeg and length > keep_seconds:
+                    print(f"⚠️ ffmpeg が無いため切り詰めずに残します: {src.name}")
+                summary["kept"] += 1
+                summary["bytes_after"] += size
+                continue
+            tmp = src.with_name(f"{src.stem}.tail{src.suffix}")
+            if cut(ffmpeg, src, tmp, length - keep_seconds):
+                tmp.replace(src)
+            summary["kept"] += 1
+            summary["bytes_after"] += src.stat().st_size
+
+        else:
+            summary["kept"] += 1
+            summary["bytes_after"] += size
+
+    return summary
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("usage: python -m src.video_retention <job.json>")
+        sys.exit(2)
+    job_path = Path(sys.argv[1])
+    job = json.loads(job_path.read_text(encoding="utf-8"))
+    summary = process(job)
+    print(
+        f"🎞️  録画の保持（{job['mode']}）: 残す {summary['kept']} / 削除 {summary['removed']} / "
+        f"切り出し {summary['clips']} / {summary['bytes_before'] / 1e6:.1f}MB → {summary['bytes_after'] / 1e6:.1f}MB"
+    )
+    job_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
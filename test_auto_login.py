@@ -33,7 +33,7 @@ class AutoLoginFlow(BaseFlow):
         print(f"  パスワード: {'*' * len(self.config.eplus_password)}")
         
         # e+ トップページにアクセスしてからログインボタンをクリック
-        top_url = "https://eplus.jp/"
+        top_url = self.config.eplus_url("/")
         print(f"\n🌐 {top_url} にアクセス中...")
         
         try:
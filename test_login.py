@@ -24,7 +24,7 @@ class LoginTestFlow(BaseFlow):
         print("=" * 60)
         
         # e+ ログインページにアクセス
-        login_url = "https://eplus.jp/sf/top"
+        login_url = self.config.eplus_url("/sf/top")
         print(f"\n🌐 {login_url} にアクセス中...")
         
         await self.page.goto(login_url, wait_until="domcontentloaded", timeout=30000)